@@ -0,0 +1,61 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Measures the speed-up of parallel record validation.
+
+Run with ``python benchmarks/bench_ingest.py [records]``. Validates generated
+records, passed as dicts and read from a JSON lines dump, with 1, 2, 4, ...
+worker processes up to the number of CPUs, and reports the speed-up over one
+process.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rorclient.ingest import ingest_dump, validate_records
+from rorclient.testing import generate_records
+
+
+def rate(results, count: int) -> float:
+    """Consumes the results and returns the records per second."""
+    start = time.perf_counter()
+    for _ in results:
+        pass
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int = 100_000) -> None:
+    records = generate_records(count)
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, cpus, *(2**i for i in range(cpus.bit_length()) if 2**i < cpus)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dump.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records))
+
+        inputs = {
+            "dicts": lambda workers: validate_records(records, workers=workers),
+            "jsonl": lambda workers: ingest_dump(path, workers=workers),
+        }
+        for label, run in inputs.items():
+            single = None
+            for workers in counts:
+                result = rate(run(workers), count)
+                single = single or result
+                print(
+                    f"{label:<6} {workers:>3} workers {result:>10,.0f} records/s "
+                    f"{result / single:>6.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Throughput benchmark for batch ROR ID normalisation.
+
+Run with ``python benchmarks/bench_ror_ids.py [count]``.
+"""
+
+import random
+import sys
+import time
+
+from rorclient.base import BaseRORClient
+from rorclient.ror_id import CROCKFORD_ALPHABET, normalize_ror_ids, ror_id_checksum
+
+
+def generate_inputs(count: int, seed: int = 42) -> list:
+    """Generates a realistic mix of IDs, URLs, upper-case IDs, repeats and typos."""
+    rng = random.Random(seed)
+    unique = []
+    for _ in range(max(count // 4, 1)):
+        body = "0" + "".join(rng.choice(CROCKFORD_ALPHABET) for _ in range(6))
+        unique.append(body + ror_id_checksum(body))
+
+    inputs = []
+    for _ in range(count):
+        ror_id = rng.choice(unique)
+        roll = rng.random()
+        if roll < 0.3:
+            ror_id = f"https://ror.org/{ror_id}"
+        elif roll < 0.4:
+            ror_id = ror_id.upper()
+        elif roll < 0.45:
+            ror_id = ror_id[:-1] + str((int(ror_id[-1]) + 1) % 10)
+        inputs.append(ror_id)
+    return inputs
+
+
+def main(count: int = 1_000_000) -> None:
+    inputs = generate_inputs(count)
+
+    start = time.perf_counter()
+    result = normalize_ror_ids(inputs)
+    elapsed = time.perf_counter() - start
+    print(
+        f"normalize_ror_ids: {count:,} inputs in {elapsed:.3f}s "
+        f"({count / elapsed:,.0f} IDs/s), {len(result.ids):,} unique, "
+        f"{len(result.invalid):,} invalid"
+    )
+
+    client = BaseRORClient()
+    lower = [value.lower() for value in inputs]
+    start = time.perf_counter()
+    for value in lower:
+        try:
+            client._validate_ror_id(value)
+        except ValueError:
+            pass
+    elapsed = time.perf_counter() - start
+    print(
+        f"_validate_ror_id loop: {count:,} inputs in {elapsed:.3f}s "
+        f"({count / elapsed:,.0f} IDs/s, format only)"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,99 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Compares transport configurations against a local stand-in server.
+
+Run with ``python benchmarks/bench_transport.py [requests]``. Each configuration
+fetches the same IDs from many RORClient instances spread over a thread pool,
+as a service creating a client per request would.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from standin import StandInServer
+
+from rorclient.client import RORClient
+from rorclient.config import config
+
+
+def run(label: str, server: StandInServer, ror_ids: list, make_client) -> None:
+    """Fetches every ID with a fresh client per lookup and reports throughput."""
+    server.connections = 0
+
+    def fetch(ror_id: str) -> None:
+        client = make_client()
+        try:
+            client.get_institution(ror_id)
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(fetch, ror_ids))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<32} {len(ror_ids) / elapsed:>8,.0f} req/s  "
+        f"{server.connections:>5} connections"
+    )
+
+
+def main(count: int = 2000) -> None:
+    with StandInServer(latency=0.002) as server:
+        config.base_url = server.base_url
+        ror_ids = list(server.records)[:count]
+
+        run("client per call (default)", server, ror_ids, RORClient)
+
+        limits = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        shared = httpx.Client(
+            base_url=server.base_url, limits=limits, timeout=httpx.Timeout(5.0)
+        )
+        run(
+            "shared http_client",
+            server,
+            ror_ids,
+            lambda: RORClient(http_client=shared),
+        )
+        shared.close()
+
+        tight = httpx.Client(
+            base_url=server.base_url,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+            timeout=httpx.Timeout(5.0, pool=30.0),
+        )
+        run(
+            "shared http_client, 4 connections",
+            server,
+            ror_ids,
+            lambda: RORClient(http_client=tight),
+        )
+        tight.close()
+
+        single = RORClient(limits=limits)
+        run("one RORClient", server, ror_ids, lambda: _Unclosed(single))
+        single.close()
+
+
+class _Unclosed:
+    """Wraps a long-lived client so ``run`` does not close it between calls."""
+
+    def __init__(self, client: RORClient) -> None:
+        self._client = client
+
+    def get_institution(self, ror_id: str):
+        return self._client.get_institution(ror_id)
+
+    def close(self) -> None:
+        pass
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,341 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Throughput and latency benchmarks for both clients.
+
+Runs every scenario against a local stand-in server in this process and writes
+the results as JSON. With ``--baseline`` the results are compared to an earlier
+run, and the exit status is 1 if any scenario got slower than ``--threshold``.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --quick --baseline benchmarks/baseline.json
+
+Absolute numbers depend on the machine, so compare runs from the same machine.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from standin import StandInServer, make_records
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.client import RORClient
+from rorclient.config import config
+from rorclient.models import Institution
+
+RESULTS_VERSION = 1
+
+
+class Run:
+    """Collects per-operation latencies of one scenario run."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def time(self, func: Callable, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+    async def time_async(self, func: Callable, *args):
+        start = time.perf_counter()
+        result = await func(*args)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def stop(self, ops: Optional[int] = None) -> dict:
+        self.elapsed = time.perf_counter() - self.start
+        ops = len(self.latencies) if ops is None else ops
+        result = {"ops": ops, "seconds": self.elapsed, "ops_per_s": ops / self.elapsed}
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            for name, q in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                index = min(len(ordered) - 1, int(q * len(ordered)))
+                result[name] = ordered[index] * 1000
+        return result
+
+
+def sync_single(ror_ids: List[str]) -> dict:
+    with RORClient() as client:
+        run = Run()
+        for ror_id in ror_ids:
+            run.time(client.get_institution, ror_id)
+        return run.stop()
+
+
+def sync_bulk(ror_ids: List[str], concurrency: int) -> dict:
+    chunks = [ror_ids[i::concurrency] for i in range(concurrency)]
+    with RORClient(limits=httpx.Limits(max_connections=concurrency)) as client:
+        run = Run()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(client.get_multiple_institutions, chunks))
+        return run.stop(len(ror_ids))
+
+
+def sync_get_multiple(ror_ids: List[str], concurrency: int) -> dict:
+    with RORClient(limits=httpx.Limits(max_connections=concurrency)) as client:
+        run = Run()
+        client.get_multiple_institutions(ror_ids, concurrency)
+        return run.stop(len(ror_ids))
+
+
+def sync_prefetch(ror_ids: List[str], depth: int) -> dict:
+    with RORClient(prefetch_relationships=True, max_depth=depth) as client:
+        run = Run()
+        for ror_id in ror_ids:
+            run.time(client.get_institution, ror_id)
+        return run.stop()
+
+
+def sync_search(pages: int) -> dict:
+    with RORClient() as client:
+        run = Run()
+        for page in range(1, pages + 1):
+            run.time(client.search, "org", False, page)
+        return run.stop()
+
+
+async def async_single(ror_ids: List[str]) -> dict:
+    async with AsyncRORClient() as client:
+        run = Run()
+        for ror_id in ror_ids:
+            await run.time_async(client.get_institution, ror_id)
+        return run.stop()
+
+
+async def async_bulk(ror_ids: List[str], concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncRORClient(
+        limits=httpx.Limits(max_connections=concurrency)
+    ) as client:
+        run = Run()
+
+        async def fetch(ror_id: str) -> None:
+            async with semaphore:
+                await run.time_async(client.get_institution, ror_id)
+
+        await asyncio.gather(*(fetch(ror_id) for ror_id in ror_ids))
+        return run.stop()
+
+
+async def async_get_multiple(ror_ids: List[str]) -> dict:
+    async with AsyncRORClient() as client:
+        run = Run()
+        await client.get_multiple_institutions(ror_ids)
+        return run.stop(len(ror_ids))
+
+
+async def async_prefetch(ror_ids: List[str], depth: int) -> dict:
+    async with AsyncRORClient(prefetch_relationships=True, max_depth=depth) as client:
+        run = Run()
+        for ror_id in ror_ids:
+            await run.time_async(client.get_institution, ror_id)
+        return run.stop()
+
+
+async def async_search(pages: int) -> dict:
+    async with AsyncRORClient() as client:
+        run = Run()
+        for page in range(1, pages + 1):
+            await run.time_async(client.search, "org", False, page)
+        return run.stop()
+
+
+def parse_json(payloads: List[bytes]) -> dict:
+    run = Run()
+    for payload in payloads:
+        run.time(Institution.model_validate_json, payload)
+    return run.stop()
+
+
+def parse_dict(records: List[dict]) -> dict:
+    run = Run()
+    for record in records:
+        run.time(lambda r: Institution(**r), record)
+    return run.stop()
+
+
+# Statements timed in a fresh interpreter, to catch import time regressions
+IMPORT_STATEMENTS = {
+    "import.package": "import rorclient",
+    "import.sync_client": "from rorclient import RORClient",
+    "import.async_client": "from rorclient import AsyncRORClient",
+}
+
+
+def cold_import(statement: str, runs: int) -> dict:
+    """Times a statement in new interpreters, leaving out interpreter startup."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - start)"
+    )
+    run = Run()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        run.latencies.append(float(output))
+    result = run.stop()
+    # Imports per second of import time, not of wall time with startup
+    result["ops_per_s"] = runs / sum(run.latencies)
+    return result
+
+
+def scenarios(server: StandInServer, quick: bool) -> Dict[str, Callable[[], dict]]:
+    """Returns the scenarios by name, sized for a full or a quick run."""
+    scale = 1 if quick else 4
+    ror_ids = list(server.records)
+    lookups = ror_ids[: 100 * scale]
+    bulk = ror_ids[: 250 * scale]
+    prefetch = ror_ids[: 10 * scale]
+    records = list(server.records.values())[: 500 * scale]
+    payloads = [json.dumps(record).encode() for record in records]
+
+    suite: Dict[str, Callable[[], dict]] = {
+        "sync.single_lookup": lambda: sync_single(lookups),
+        "async.single_lookup": lambda: asyncio.run(async_single(lookups)),
+        "async.get_multiple_institutions": lambda: asyncio.run(
+            async_get_multiple(bulk)
+        ),
+        "sync.search_paging": lambda: sync_search(10 * scale),
+        "async.search_paging": lambda: asyncio.run(async_search(10 * scale)),
+        "parse.model_validate_json": lambda: parse_json(payloads),
+        "parse.from_dict": lambda: parse_dict(records),
+    }
+    for name, statement in IMPORT_STATEMENTS.items():
+        suite[name] = lambda s=statement: cold_import(s, 5 * scale)
+    for concurrency in (1, 4, 16):
+        suite[f"sync.bulk.concurrency_{concurrency}"] = lambda c=concurrency: sync_bulk(
+            bulk, c
+        )
+        suite[f"sync.get_multiple.concurrency_{concurrency}"] = lambda c=concurrency: (
+            sync_get_multiple(bulk, c)
+        )
+    for concurrency in (1, 8, 32, 128):
+        suite[f"async.bulk.concurrency_{concurrency}"] = lambda c=concurrency: (
+            asyncio.run(async_bulk(bulk, c))
+        )
+    for depth in (1, 2, 3):
+        suite[f"sync.prefetch.depth_{depth}"] = lambda d=depth: sync_prefetch(
+            prefetch, d
+        )
+        suite[f"async.prefetch.depth_{depth}"] = lambda d=depth: asyncio.run(
+            async_prefetch(prefetch, d)
+        )
+    return suite
+
+
+def run_suite(
+    quick: bool, latency: float, repeat: int, only: Optional[str]
+) -> Dict[str, dict]:
+    """Runs the scenarios and keeps the run with the median throughput of each."""
+    results = {}
+    base_url = config.base_url
+    with StandInServer(make_records(2000), latency=latency) as server:
+        config.base_url = server.base_url
+        try:
+            for name, scenario in scenarios(server, quick).items():
+                if only and only not in name:
+                    continue
+                runs = sorted(
+                    (scenario() for _ in range(repeat)), key=lambda r: r["ops_per_s"]
+                )
+                results[name] = runs[len(runs) // 2]
+                print(f"{name:<34} {results[name]['ops_per_s']:>10,.1f} ops/s")
+        finally:
+            config.base_url = base_url
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: dict, threshold: float) -> List[str]:
+    """Prints the change against a baseline and returns the regressed scenarios."""
+    regressions = []
+    print(f"\n{'scenario':<34} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        change = result["ops_per_s"] / previous["ops_per_s"] - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<34} {previous['ops_per_s']:>10,.1f} "
+            f"{result['ops_per_s']:>10,.1f} {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with the results in this file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative throughput loss counted as a regression (default 0.2)",
+    )
+    parser.add_argument("--quick", action="store_true", help="Run smaller scenarios")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.001,
+        help="Seconds the stand-in server waits before each response",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario")
+    parser.add_argument("--only", help="Only run scenarios containing this string")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.quick, args.latency, args.repeat, args.only)
+    document = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "httpx": httpx.__version__,
+            "quick": args.quick,
+            "latency": args.latency,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(document, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if baseline.get("version") != RESULTS_VERSION:
+            parser.error(f"Not a benchmark results file: {args.baseline}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} scenario(s) regressed: {', '.join(regressions)}"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
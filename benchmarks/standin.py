@@ -0,0 +1,129 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Local stand-in for the ROR API used by the benchmarks.
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from rorclient.testing import generate_records
+
+_ORGANIZATION_PATH = re.compile(r"^/v2/organizations/([0-9a-z]+)$")
+PAGE_SIZE = 20
+
+
+def make_records(count: int, fan_out: int = 2) -> Dict[str, dict]:
+    """Builds ``count`` records keyed by ROR ID, related to the next ``fan_out``."""
+    return {
+        str(record["id"]).replace("https://ror.org/", ""): record
+        for record in generate_records(count, fan_out)
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load
+    request_queue_size = 256
+
+
+class StandInServer:
+    """
+    A threaded HTTP server answering organization lookups and searches.
+
+    Every response is delayed by ``latency`` seconds to mimic the network.
+    """
+
+    def __init__(
+        self, records: Optional[Dict[str, dict]] = None, latency: float = 0.0
+    ) -> None:
+        self.records = records if records is not None else make_records(1000)
+        self.latency = latency
+        self._encoded = {
+            ror_id: json.dumps(record).encode()
+            for ror_id, record in self.records.items()
+        }
+        self._ordered = list(self.records.values())
+        self.requests = 0
+        self.connections = 0
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """The base URL to set as ``config.base_url``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v2/"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed
+            # ACKs add 40 ms to every keep-alive response.
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                url = urlsplit(self.path)
+                match = _ORGANIZATION_PATH.match(url.path)
+                if match:
+                    body = server._encoded.get(match.group(1))
+                    if body is None:
+                        return self._send(404, b'{"errors": ["not found"]}')
+                    return self._send(200, body)
+                if url.path == "/v2/organizations":
+                    query = parse_qs(url.query)
+                    page = int(query.get("page", ["1"])[0])
+                    start = (page - 1) * PAGE_SIZE
+                    result = {
+                        "number_of_results": len(server._ordered),
+                        "time_taken": 1,
+                        "items": server._ordered[start : start + PAGE_SIZE],
+                        "meta": {
+                            "types": [],
+                            "countries": [],
+                            "continents": [],
+                            "statuses": [],
+                        },
+                    }
+                    return self._send(200, json.dumps(result).encode())
+                self._send(404, b"{}")
+
+            def _send(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
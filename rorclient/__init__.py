@@ -9,7 +9,33 @@ Project: RORClient
 Description: Initialization file for the RORClient package.
 """
 
-from .async_client import AsyncRORClient
-from .client import RORClient
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .async_client import AsyncRORClient
+    from .client import RORClient
+
+# The clients are imported on first access, so that ``import rorclient`` does not
+# load httpx, pydantic and the models before they are needed.
+_LAZY_EXPORTS = {
+    "RORClient": ".client",
+    "AsyncRORClient": ".async_client",
+}
 
 __all__ = ["RORClient", "AsyncRORClient"]
+
+
+def __getattr__(name: str):
+    """Imports an exported class on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Lists the exports, including those not imported yet."""
+    return sorted({*globals(), *__all__})
@@ -11,16 +11,32 @@ Description: Asynchronous client for interacting with the ROR API.
 
 import asyncio
 import logging
-from typing import ClassVar, List, Optional
+import time
+from typing import List, Optional, Set
+from urllib.parse import quote_plus
 
-import backoff
 import httpx
-from pydantic import BaseModel, PrivateAttr
 
 from rorclient.base import BaseRORClient
-from rorclient.config import config
+from rorclient.bloom import BloomFilter
+from rorclient.breaker import CircuitBreaker
+from rorclient.cache import InstitutionCache
+from rorclient.hedging import HedgingPolicy
+from rorclient.metrics import ClientMetrics, Hook
 from rorclient.models import Institution
-from rorclient.utils import retry_with_backoff
+from rorclient.models.search import SearchResult
+from rorclient.profiling import (
+    DECODE,
+    PREFETCH,
+    TRANSFER,
+    VALIDATE,
+    RequestTrace,
+    profiled,
+    stage,
+)
+from rorclient.ratelimit import RateLimiter
+from rorclient.retry import RetryPolicy, retry_with_policy
+from rorclient.shared_cache import SharedInstitutionCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +50,55 @@ class AsyncRORClient(BaseRORClient):
     """
 
     def __init__(
-        self, prefetch_relationships: bool = False, max_depth: int = 2
+        self,
+        prefetch_relationships: bool = False,
+        max_depth: int = 2,
+        id_filter: Optional[BloomFilter] = None,
+        cache: Optional[InstitutionCache] = None,
+        shared_cache: Optional[SharedInstitutionCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        http2: Optional[bool] = None,
+        hooks: Optional[List[Hook]] = None,
+        metrics: Optional[ClientMetrics] = None,
+        profile: bool = False,
     ) -> None:
         """Initializes the HTTPX client for connection reuse."""
-        super().__init__(prefetch_relationships, max_depth)
-        self._client = httpx.AsyncClient()
-        self._initialize_client(self._client)
+        super().__init__(
+            prefetch_relationships,
+            max_depth,
+            id_filter=id_filter,
+            cache=cache,
+            shared_cache=shared_cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            hedging=hedging,
+            hooks=hooks,
+            metrics=metrics,
+            profile=profile,
+        )
+        if http_client is not None:
+            if transport is not None:
+                raise ValueError("Pass either http_client or transport, not both")
+            # A shared client is left configured as it is, apart from a missing
+            # base URL, and is not closed with this client.
+            self._client = http_client
+            self._owns_client = False
+            if not str(http_client.base_url):
+                self._initialize_client(http_client)
+        else:
+            self._client = httpx.AsyncClient(
+                **self._client_options(limits, timeout, http2, transport)
+            )
+            self._owns_client = True
+        self._refresh_tasks: Set[asyncio.Task] = set()
 
     async def __aenter__(self):
         """Allows the client to be used as an async context manager."""
@@ -47,9 +106,9 @@ class AsyncRORClient(BaseRORClient):
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Ensures the HTTPX async client is closed when exiting context."""
-        await self._client.aclose()
+        await self.close()
 
-    @retry_with_backoff()
+    @profiled
     async def get_institution(
         self, ror_id: str, depth: int = 0
     ) -> Optional[Institution]:
@@ -67,19 +126,164 @@ class AsyncRORClient(BaseRORClient):
         """
         self._validate_ror_id(ror_id)
 
+        if self._is_unknown_ror_id(ror_id):
+            return None
+
+        # While the API is down, expired entries are better than an error
+        circuit_open = self._circuit_open()
+        cached, institution, stale = self._get_cached(ror_id, circuit_open)
+        if cached:
+            if stale and not circuit_open:
+                self._schedule_refresh(ror_id)
+            return institution
+
+        # Shared records are decoded per lookup and not copied into the local
+        # cache, which keeps per-process memory flat.
+        institution_data = self._get_shared(ror_id)
+        if institution_data is not None:
+            institution_data = await self._process_institution_data_async(
+                institution_data, depth
+            )
+            with stage(self.profiler, VALIDATE):
+                return Institution(**institution_data)
+
+        return await self._fetch_institution(ror_id, depth)
+
+    @retry_with_policy
+    async def _fetch_institution(
+        self, ror_id: str, depth: int = 0
+    ) -> Optional[Institution]:
+        """Fetches a single institution from the API and caches the result."""
         logger.debug(f"Fetching institution with ROR ID: {ror_id}")
-        response = await self._client.get(f"organizations/{ror_id}")
+        response = await self._get(f"organizations/{ror_id}")
 
         if response.status_code == 200:
-            institution_data = await response.json()
-            institution_data = self._process_institution_data(institution_data, depth)
-            return Institution(**institution_data)
+            with stage(self.profiler, DECODE):
+                institution_data = response.json()
+            institution_data = await self._process_institution_data_async(
+                institution_data, depth
+            )
+            with stage(self.profiler, VALIDATE):
+                institution = Institution(**institution_data)
+            self._cache_result(ror_id, institution, depth)
+            return institution
         elif response.status_code == 404:
+            self._cache_result(ror_id, None, depth)
             return None
         else:
+            self.retry_policy.check_response(response)
             raise ValueError(f"Unexpected response: {response.status_code}")
 
-    @retry_with_backoff()
+    async def _get(self, url: str) -> httpx.Response:
+        """Sends a GET request through the breaker and rate limiter, and reports it."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        start = self._start_request(url)
+        response = None
+        error: Optional[BaseException] = None
+        try:
+            if self.hedging is not None:
+                with stage(self.profiler, TRANSFER):
+                    response = await self._hedged_get(url)
+            elif self.profiler is not None:
+                response = await self._traced_get(url)
+            else:
+                response = await self._client.get(url)
+            return response
+        except BaseException as e:
+            # Includes cancellation, which must end the request as well
+            error = e
+            raise
+        finally:
+            self._finish_request(url, start, response, error)
+
+    async def _traced_get(self, url: str) -> httpx.Response:
+        """Sends a GET request, timing connection setup and transfer separately."""
+        trace = RequestTrace()
+        start = time.perf_counter()
+        try:
+            return await self._client.get(
+                url, extensions={"trace": trace.async_callback}
+            )
+        finally:
+            self.profiler.add_request(time.perf_counter() - start, trace.connect)
+
+    async def _hedged_get(self, url: str) -> httpx.Response:
+        """Sends a GET request, duplicated if slower than the hedging delay."""
+        hedging = self.hedging
+        hedging.start_request()
+        start = time.monotonic()
+        primary = asyncio.ensure_future(self._client.get(url))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedging.delay())
+            if not done and hedging.try_hedge(self.rate_limiter):
+                logger.debug(f"Hedging slow request for {url}")
+                hedge = asyncio.ensure_future(self._client.get(url))
+                tasks.append(hedge)
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        if task.exception() is None:
+                            if task is hedge:
+                                hedging.record_hedge_win()
+                            hedging.record_latency(time.monotonic() - start)
+                            return task.result()
+                # Both failed, report the original error
+                return primary.result()
+
+            response = await primary
+            hedging.record_latency(time.monotonic() - start)
+            return response
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def _schedule_refresh(self, ror_id: str) -> None:
+        """Refreshes a stale cache entry in a background task."""
+        if not self.cache.start_refresh(ror_id):
+            return
+
+        task = asyncio.create_task(self._refresh(ror_id))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, ror_id: str) -> None:
+        """Refetches a stale cache entry, keeping the stale copy on failure."""
+        success = False
+        try:
+            await self._fetch_institution(ror_id)
+            success = True
+        except Exception as e:
+            logger.warning(f"Background refresh of {ror_id} failed: {e}")
+        finally:
+            self.cache.finish_refresh(ror_id, success)
+
+    async def _process_institution_data_async(
+        self, institution_data: dict, depth: int
+    ) -> dict:
+        """Processes institution data, prefetching related institutions concurrently."""
+        if self.prefetch_relationships and depth < self.max_depth:
+            relationships = institution_data["relationships"]
+            # Nested prefetches are part of the outermost one
+            with stage(self.profiler if depth == 0 else None, PREFETCH):
+                records = await asyncio.gather(
+                    *(
+                        self.get_institution(rel["id"].split("/")[-1], depth + 1)
+                        for rel in relationships
+                    )
+                )
+            institution_data["relationships"] = [
+                {**rel, "record": record} for rel, record in zip(relationships, records)
+            ]
+        return institution_data
+
     async def get_multiple_institutions(self, ror_ids: List[str]) -> List[Institution]:
         """
         Fetches multiple institutions by their ROR IDs asynchronously.
@@ -102,6 +306,84 @@ class AsyncRORClient(BaseRORClient):
 
         return [result for result in results if result is not None]
 
+    async def warm_cache(self, ror_ids: List[str], concurrency: int = 8) -> int:
+        """
+        Preloads the cache by fetching institutions concurrently.
+
+        IDs that are already cached are not fetched again, and failures are logged
+        rather than raised.
+
+        Args:
+            ror_ids (List[str]): The ROR IDs to preload.
+            concurrency (int): The maximum number of requests in flight.
+
+        Returns:
+            int: The number of institutions now cached.
+
+        Raises:
+            ValueError: If the client has no cache.
+        """
+        self._require_cache()
+        ror_ids = list(dict.fromkeys(ror_ids))
+        logger.debug(f"Warming cache with {len(ror_ids)} institutions")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm_one(ror_id: str) -> bool:
+            async with semaphore:
+                try:
+                    return await self.get_institution(ror_id) is not None
+                except Exception as e:
+                    logger.warning(f"Could not warm cache with {ror_id}: {e}")
+                    return False
+
+        return sum(await asyncio.gather(*(warm_one(ror_id) for ror_id in ror_ids)))
+
+    @profiled
+    @retry_with_policy
+    async def search(
+        self,
+        search_term: str,
+        advanced_search: bool = False,
+        page: Optional[int] = None,
+    ):
+        """
+        Searches the ROR API with a search_term asynchronously.
+
+        Args:
+            search_term (str): A search term
+            advanced_search (bool): Toggling the "query.advanced" parameter.
+            page (Optional[int]): The page of results to return, starting at 1.
+
+        Returns:
+            SearchResult: A search result object
+
+        Raises:
+            ValueError: If status code isn't 200 or 404
+        """
+        logger.debug(f"Searching the ROR API with search term {search_term}")
+
+        query_type = "query.advanced" if advanced_search else "query"
+
+        url = f"organizations?{query_type}={quote_plus(search_term)}"
+        if page is not None:
+            url += f"&page={page}"
+        response = await self._get(url)
+
+        if response.status_code == 200:
+            with stage(self.profiler, DECODE):
+                search_results = response.json()
+            with stage(self.profiler, VALIDATE):
+                return SearchResult(**search_results)
+        elif response.status_code == 404:
+            return None
+        else:
+            self.retry_policy.check_response(response)
+            raise ValueError(f"Got {response.status_code} from ROR")
+
     async def close(self):
-        """Closes the HTTPX async client."""
-        await self._client.aclose()
+        """Cancels background refreshes and closes the HTTPX client if it owns it."""
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        if self._owns_client:
+            await self._client.aclose()
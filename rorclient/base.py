@@ -11,13 +11,36 @@ Description: Base class for ROR API client.
 
 import logging
 import re
+import time
 from abc import ABC, abstractmethod
-from typing import Coroutine, Generic, List, Optional, TypeVar, Union
+from typing import Coroutine, Generic, List, Optional, Tuple, TypeVar, Union
 
 import httpx
 
+from rorclient.bloom import BloomFilter
+from rorclient.breaker import CircuitBreaker
+from rorclient.cache import InstitutionCache
 from rorclient.config import config
+from rorclient.hedging import HedgingPolicy
+from rorclient.metrics import (
+    CACHE_HIT,
+    CACHE_MISS,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    SHARED_CACHE_HIT,
+    ClientEvent,
+    ClientMetrics,
+    Hook,
+)
 from rorclient.models import Institution
+from rorclient.profiling import PREFETCH, Profiler, ProfileReport, stage
+from rorclient.ratelimit import RateLimiter
+from rorclient.retry import RetryPolicy, default_retry_policy
+from rorclient.ror_id import normalize_ror_id
+from rorclient.shared_cache import SharedInstitutionCache
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
@@ -29,13 +52,38 @@ class BaseRORClient:
 
     _ror_id_pattern = re.compile(r"^0[a-z|0-9]{6}[0-9]{2}$")
     _ror_id_pattern_strict = re.compile(r"^0[a-hj-km-np-tv-z|0-9]{6}[0-9]{2}$")
+    _ror_url_pattern = re.compile(r"^https?://ror\.org/([0-9a-z|]+)$")
 
     def __init__(
-        self, prefetch_relationships: bool = False, max_depth: int = 2
+        self,
+        prefetch_relationships: bool = False,
+        max_depth: int = 2,
+        id_filter: Optional[BloomFilter] = None,
+        cache: Optional[InstitutionCache] = None,
+        shared_cache: Optional[SharedInstitutionCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        hooks: Optional[List[Hook]] = None,
+        metrics: Optional[ClientMetrics] = None,
+        profile: bool = False,
     ) -> None:
         """Initializes the shared attributes."""
         self.prefetch_relationships = prefetch_relationships
         self.max_depth = max_depth
+        self.id_filter = id_filter
+        self.cache = cache
+        self.shared_cache = shared_cache
+        self.retry_policy = retry_policy or default_retry_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.metrics = metrics
+        self.hooks: List[Hook] = list(hooks or [])
+        if metrics is not None:
+            self.hooks.append(metrics)
+        self.profiler: Optional[Profiler] = Profiler() if profile else None
         self.headers = {
             "Accept": "application/json",
             "User-Agent": "RORClient https://github.com/ADernild/RORClient",
@@ -48,6 +96,36 @@ class BaseRORClient:
         client.base_url = str(config.base_url)
         client.headers.update(self.headers)
 
+    def _client_options(
+        self,
+        limits: Optional[httpx.Limits],
+        timeout: Optional[httpx.Timeout],
+        http2: Optional[bool],
+        transport: Union[httpx.BaseTransport, httpx.AsyncBaseTransport, None],
+    ) -> dict:
+        """Builds the arguments for a new HTTP client, filling gaps from the config."""
+        options = {
+            "base_url": str(config.base_url),
+            "headers": self.headers,
+            "limits": limits
+            or httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            "timeout": timeout
+            or httpx.Timeout(
+                connect=config.connect_timeout,
+                read=config.read_timeout,
+                write=config.write_timeout,
+                pool=config.pool_timeout,
+            ),
+            "http2": config.http2 if http2 is None else http2,
+        }
+        if transport is not None:
+            options["transport"] = transport
+        return options
+
     def _validate_ror_id(self, ror_id: str) -> None:
         """Validates a single ROR ID."""
         if not ror_id:
@@ -59,14 +137,22 @@ class BaseRORClient:
         if not self._ror_id_pattern.match(extracted_ror_id):
             raise ValueError(f"Invalid ROR ID format: {ror_id}")
 
+        self._validate_checksum(ror_id, extracted_ror_id)
+
     def _validate_ror_ids(self, ror_ids: List[str]) -> None:
         """Validates the list of ROR IDs."""
         if not ror_ids:
             raise ValueError("ror_ids cannot be empty")
 
-        for ror_id in ror_ids:
+        # Validate each distinct ID once
+        for ror_id in dict.fromkeys(ror_ids):
             self._validate_ror_id(ror_id)
 
+    def _validate_checksum(self, ror_id: str, extracted_ror_id: str) -> None:
+        """Validates the trailing checksum of a ROR ID if enabled in the config."""
+        if config.validate_checksum and normalize_ror_id(extracted_ror_id) is None:
+            raise ValueError(f"Invalid ROR ID checksum: {ror_id}")
+
     def _validate_ror_id_strict(self, ror_id: str) -> None:
         """Validates a single ROR ID with stricter rules."""
         if not ror_id:
@@ -78,19 +164,20 @@ class BaseRORClient:
         if not self._ror_id_pattern_strict.match(extracted_ror_id):
             raise ValueError(f"Invalid ROR ID format: {ror_id}")
 
+        self._validate_checksum(ror_id, extracted_ror_id)
+
     def _validate_ror_ids_strict(self, ror_ids: List[str]) -> None:
         """Validates a list of ROR IDs with stricter rules."""
         if not ror_ids:
             raise ValueError("ror_ids cannot be empty")
 
-        for ror_id in ror_ids:
+        for ror_id in dict.fromkeys(ror_ids):
             self._validate_ror_id_strict(ror_id)
 
     def _extract_ror_id(self, ror_id: str) -> str:
         """Extracts the unique portion of the ROR ID from a URL or returns the input if it's already a valid portion."""
         # Check if the input is a full URL
-        url_pattern = re.compile(r"^https?://ror\.org/([0-9a-z|]+)$")
-        match = url_pattern.match(ror_id)
+        match = self._ror_url_pattern.match(ror_id)
 
         if match:
             return match.group(1)
@@ -98,16 +185,148 @@ class BaseRORClient:
         # If it's not a URL, assume it's the unique portion
         return ror_id
 
+    def _is_unknown_ror_id(self, ror_id: str) -> bool:
+        """Checks whether the ID filter rules out a ROR ID, so no request is needed."""
+        if self.id_filter is None:
+            return False
+
+        if self._extract_ror_id(ror_id) in self.id_filter:
+            return False
+
+        logger.debug(f"ROR ID {ror_id} is not in the ID filter, skipping request")
+        return True
+
+    def _require_cache(self) -> InstitutionCache:
+        """Returns the configured cache, raising if there is none."""
+        if self.cache is None:
+            raise ValueError("This operation requires a client with a cache")
+        return self.cache
+
+    def _get_cached(
+        self, ror_id: str, allow_expired: bool = False
+    ) -> Tuple[bool, Optional[Institution], bool]:
+        """Looks up a ROR ID in the cache, if one is configured."""
+        if self.cache is None:
+            return False, None, False
+        found, institution, stale = self.cache.lookup(ror_id, allow_expired)
+        if found:
+            self._emit(CACHE_HIT, ror_id=ror_id, stale=stale)
+        else:
+            self._emit(CACHE_MISS, ror_id=ror_id)
+        return found, institution, stale
+
+    def _circuit_open(self) -> bool:
+        """Checks whether the circuit breaker currently rejects requests."""
+        return self.circuit_breaker is not None and self.circuit_breaker.is_open
+
+    def _record_status(self, status_code: Optional[int]) -> None:
+        """Reports the outcome of a request to the circuit breaker, if configured."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_status(status_code)
+
+    def _emit(self, name: str, **attributes) -> None:
+        """Passes an event to the hooks, logging hooks that fail."""
+        if not self.hooks:
+            return
+        event = ClientEvent(name, time.time(), attributes)
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception(f"Hook {hook!r} failed on {name}")
+
+    def _on_retry(self, exc: Exception, attempt: int, delay: float) -> None:
+        """Reports a retry to the hooks."""
+        self._emit(RETRY, attempt=attempt, delay=delay, error=type(exc).__name__)
+
+    def _start_request(self, url: str) -> float:
+        """Reports a request to the hooks, returning its start time."""
+        self._emit(REQUEST_START, url=url)
+        return time.perf_counter()
+
+    def _finish_request(
+        self,
+        url: str,
+        start: float,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Reports the outcome of a request to the circuit breaker and the hooks.
+
+        Every started request must be finished, also when it is cancelled, or the
+        ``in_flight`` gauge of the metrics drifts. Only responses and transport
+        errors count towards the circuit breaker.
+        """
+        status_code = None if response is None else response.status_code
+        if response is not None or isinstance(error, httpx.RequestError):
+            self._record_status(status_code)
+        if self.hooks:
+            self._emit(
+                REQUEST_END,
+                url=url,
+                status=status_code,
+                error=None if error is None else type(error).__name__,
+                duration=time.perf_counter() - start,
+                bytes=0 if response is None else len(response.content),
+            )
+
+    def profile_report(self, slowest: int = 5) -> ProfileReport:
+        """
+        Summarizes where this client spent its time, stage by stage.
+
+        Args:
+            slowest (int): The number of slowest recent calls to include.
+
+        Returns:
+            ProfileReport: The summary; ``str()`` renders it as a table that
+            names the stage to optimise.
+
+        Raises:
+            ValueError: If the client was created without ``profile=True``.
+        """
+        if self.profiler is None:
+            raise ValueError(
+                "Profiling is not enabled, create the client with profile=True"
+            )
+        return self.profiler.report(slowest)
+
+    def _get_shared(self, ror_id: str) -> Optional[dict]:
+        """Looks up the raw record for a ROR ID in the shared cache, if configured."""
+        if self.shared_cache is None:
+            return None
+        record = self.shared_cache.get_record(ror_id)
+        if record is not None:
+            self._emit(SHARED_CACHE_HIT, ror_id=ror_id)
+        return record
+
+    def _cache_result(
+        self, ror_id: str, institution: Optional[Institution], depth: int
+    ) -> None:
+        """Caches a fetched institution, or a 404 when institution is None."""
+        if self.cache is None:
+            return
+
+        if institution is None:
+            self.cache.set_missing(ror_id)
+        # Records fetched while prefetching are truncated at max_depth
+        elif depth == 0 or not self.prefetch_relationships:
+            self.cache.set(ror_id, institution)
+
     def _process_institution_data(self, institution_data: dict, depth: int) -> dict:
         """Processes institution data to prefetch relationships if needed."""
         if self.prefetch_relationships and depth < self.max_depth:
-            institution_data["relationships"] = [
-                {
-                    **rel,
-                    "record": self.get_institution(rel["id"].split("/")[-1], depth + 1),
-                }
-                for rel in institution_data["relationships"]
-            ]
+            # Nested prefetches are part of the outermost one
+            with stage(self.profiler if depth == 0 else None, PREFETCH):
+                institution_data["relationships"] = [
+                    {
+                        **rel,
+                        "record": self.get_institution(
+                            rel["id"].split("/")[-1], depth + 1
+                        ),
+                    }
+                    for rel in institution_data["relationships"]
+                ]
         return institution_data
 
     @abstractmethod
@@ -0,0 +1,211 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Bloom filter of known ROR IDs.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from rorclient.dump import PathLike, iter_dump_records
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"RORBLOOM"
+_VERSION = 1
+_HEADER = struct.Struct("<8sBQBQ")
+
+
+class BloomFilter:
+    """
+    A compact probabilistic set of ROR IDs.
+
+    Membership checks never give false negatives, so an ID that is not in the
+    filter is guaranteed not to exist in the data the filter was built from. IDs
+    are stored in their bare lower-case form.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001) -> None:
+        """
+        Initializes an empty filter sized for the given number of IDs.
+
+        Args:
+            capacity (int): The number of IDs the filter will hold.
+            false_positive_rate (float): The target false positive rate at capacity.
+
+        Raises:
+            ValueError: If the capacity or false positive rate is out of range.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+
+        num_bits = math.ceil(
+            -capacity * math.log(false_positive_rate) / math.log(2) ** 2
+        )
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self._set_state(num_bits, num_hashes, 0, bytearray((num_bits + 7) // 8))
+
+    def _set_state(
+        self, num_bits: int, num_hashes: int, count: int, bits: bytearray
+    ) -> None:
+        """Replaces the filter contents, swapping the bits and sizes together."""
+        self._state = (num_bits, num_hashes, bits)
+        self.count = count
+
+    @property
+    def num_bits(self) -> int:
+        """The size of the filter in bits."""
+        return self._state[0]
+
+    @property
+    def num_hashes(self) -> int:
+        """The number of bit positions per ID."""
+        return self._state[1]
+
+    @staticmethod
+    def _positions(ror_id: str, num_bits: int, num_hashes: int) -> Tuple[int, ...]:
+        """Returns the bit positions for an ID using double hashing."""
+        digest = hashlib.blake2b(ror_id.lower().encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return tuple((h1 + i * h2) % num_bits for i in range(num_hashes))
+
+    def add(self, ror_id: str) -> None:
+        """Adds a ROR ID to the filter."""
+        num_bits, num_hashes, bits = self._state
+        for position in self._positions(ror_id, num_bits, num_hashes):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, ror_ids: Iterable[str]) -> None:
+        """Adds several ROR IDs to the filter."""
+        for ror_id in ror_ids:
+            self.add(ror_id)
+
+    def __contains__(self, ror_id: str) -> bool:
+        """Checks whether a ROR ID may be in the filter."""
+        num_bits, num_hashes, bits = self._state
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(ror_id, num_bits, num_hashes)
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of IDs added to the filter."""
+        return self.count
+
+    @classmethod
+    def from_ids(
+        cls, ror_ids: Iterable[str], false_positive_rate: float = 0.001
+    ) -> "BloomFilter":
+        """
+        Builds a filter holding the given ROR IDs.
+
+        Args:
+            ror_ids (Iterable[str]): Bare ROR IDs.
+            false_positive_rate (float): The target false positive rate.
+
+        Returns:
+            BloomFilter: The populated filter.
+        """
+        ror_ids = list(ror_ids)
+        bloom = cls(max(len(ror_ids), 1), false_positive_rate)
+        bloom.update(ror_ids)
+        return bloom
+
+    @classmethod
+    def from_dump(
+        cls, path: PathLike, false_positive_rate: float = 0.001
+    ) -> "BloomFilter":
+        """
+        Builds a filter of every ROR ID in a data dump.
+
+        Args:
+            path (PathLike): Path to the dump file.
+            false_positive_rate (float): The target false positive rate.
+
+        Returns:
+            BloomFilter: The populated filter.
+        """
+        return cls.from_ids(
+            (
+                str(record["id"]).replace("https://ror.org/", "")
+                for record in iter_dump_records(path)
+            ),
+            false_positive_rate,
+        )
+
+    def save(self, path: PathLike) -> None:
+        """
+        Writes the filter to a file.
+
+        Args:
+            path (PathLike): Destination path.
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as fh:
+            fh.write(
+                _HEADER.pack(
+                    _MAGIC, _VERSION, self.num_bits, self.num_hashes, self.count
+                )
+            )
+            fh.write(self._state[2])
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: PathLike) -> Tuple[int, int, int, bytearray]:
+        """Reads the state of a saved filter."""
+        with open(path, "rb") as fh:
+            header = fh.read(_HEADER.size)
+            bits = bytearray(fh.read())
+
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Not a ROR ID filter: {path}")
+        magic, version, num_bits, num_hashes, count = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a ROR ID filter: {path}")
+        if len(bits) != (num_bits + 7) // 8:
+            raise ValueError(f"Truncated ROR ID filter: {path}")
+        return num_bits, num_hashes, count, bits
+
+    @classmethod
+    def load(cls, path: PathLike) -> "BloomFilter":
+        """
+        Loads a filter written with :meth:`save`.
+
+        Args:
+            path (PathLike): Path to the filter file.
+
+        Returns:
+            BloomFilter: The loaded filter.
+
+        Raises:
+            ValueError: If the file is not a valid filter.
+        """
+        bloom = cls.__new__(cls)
+        bloom._set_state(*cls._read(path))
+        return bloom
+
+    def reload(self, path: PathLike) -> None:
+        """
+        Replaces the contents of this filter with a saved filter, e.g. one built
+        from a newly published dump. Clients holding this filter pick up the change.
+
+        Args:
+            path (PathLike): Path to the filter file.
+        """
+        num_bits, num_hashes, count, bits = self._read(path)
+        logger.debug(f"Reloading ROR ID filter from {path} ({count} IDs)")
+        self._set_state(num_bits, num_hashes, count, bits)
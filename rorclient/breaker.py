@@ -0,0 +1,143 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Circuit breaker that stops calling the ROR API while it is failing.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive API failures and fails fast while the API is down.
+
+    The circuit starts closed. After ``failure_threshold`` consecutive failures it
+    opens, and requests fail immediately with CircuitOpenError for
+    ``reset_timeout`` seconds; the clients then serve cached or mirrored records
+    where they can. After the cool-down the circuit is half-open and lets one
+    probe request through: if it succeeds the circuit closes, otherwise it opens
+    again. One breaker can be shared by several clients.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes a closed circuit.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds to fail fast before probing the API.
+            clock (Callable[[], float]): Time source, in seconds.
+
+        Raises:
+            ValueError: If failure_threshold is lower than 1.
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        # When the circuit opened, or when the current probe was let through
+        self._since = 0.0
+
+    @property
+    def state(self) -> str:
+        """The current state: "closed", "open" or "half_open"."""
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently rejected without being sent."""
+        with self._lock:
+            return (
+                self._state != CLOSED
+                and self._clock() - self._since < self.reset_timeout
+            )
+
+    def allow_request(self) -> bool:
+        """
+        Checks whether a request may be sent, claiming the probe if one is due.
+
+        Returns:
+            bool: False if the request must fail fast.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            now = self._clock()
+            if now - self._since < self.reset_timeout:
+                return False
+            # A probe that never reported back is replaced after the same timeout
+            self._state = HALF_OPEN
+            self._since = now
+            return True
+
+    def record_success(self) -> None:
+        """Records a request that reached a healthy API."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("ROR API recovered, closing circuit")
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Records a failed request, opening the circuit if needed."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        "ROR API failing, opening circuit for "
+                        f"{self.reset_timeout} seconds"
+                    )
+                self._state = OPEN
+                self._since = self._clock()
+
+    def check(self) -> None:
+        """
+        Raises if a request may not be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        if not self.allow_request():
+            raise CircuitOpenError("Circuit open, not calling ROR")
+
+    def record_status(self, status_code: Optional[int]) -> None:
+        """
+        Records the outcome of a request by its status code.
+
+        Args:
+            status_code (Optional[int]): The response status, or None if the request
+                failed without a response. 429 and 5xx responses count as failures.
+        """
+        if status_code is None or status_code == 429 or status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
@@ -0,0 +1,396 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: In-memory cache of institutions for the ROR clients.
+"""
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Set, Tuple
+
+from rorclient.dump import PathLike, iter_dump_records
+from rorclient.models import Institution
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters describing the use of an InstitutionCache.
+
+    Attributes:
+        hits (int): Lookups answered with a fresh cached institution.
+        stale_hits (int): Lookups answered with a stale institution while it is
+            refreshed.
+        negative_hits (int): Lookups answered with a cached "not found".
+        misses (int): Lookups that found nothing usable in the cache.
+        evictions (int): Entries dropped to stay within the size limits.
+        expirations (int): Lookups that found an entry past its TTL, which is
+            kept until evicted.
+        refreshes (int): Background refreshes of stale entries that completed.
+        refresh_failures (int): Background refreshes of stale entries that failed.
+        size (int): The number of cached institutions, including expired ones.
+        negative_size (int): The number of cached "not found" entries, including
+            expired ones.
+    """
+
+    hits: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+    size: int = 0
+    negative_size: int = 0
+
+
+class InstitutionCache:
+    """
+    A thread-safe, size-bounded LRU cache of institutions keyed by ROR ID.
+
+    Besides institutions, the cache remembers IDs the API answered with 404. These
+    negative entries have their own, usually much shorter, TTL and size limit so
+    that IDs created after a miss are picked up quickly. Entries past their TTL
+    are looked up as misses but stay in the cache until they are evicted, so a
+    client whose circuit breaker is open can still serve them.
+
+    Setting ``hard_ttl`` above ``ttl`` enables stale-while-revalidate: once an
+    institution is older than ``ttl`` it is still returned until ``hard_ttl``, and
+    the clients refresh it in the background.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float = 3600.0,
+        negative_maxsize: int = 10_000,
+        negative_ttl: float = 300.0,
+        hard_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of cached institutions.
+            ttl (float): Seconds an institution stays fresh.
+            negative_maxsize (int): Maximum number of cached "not found" entries.
+            negative_ttl (float): Seconds a "not found" entry stays valid.
+            hard_ttl (Optional[float]): Seconds a stale institution may still be
+                served while it is refreshed. Defaults to ``ttl``, which disables
+                stale-while-revalidate.
+            clock (Callable[[], float]): Time source, in seconds.
+
+        Raises:
+            ValueError: If hard_ttl is lower than ttl.
+        """
+        if hard_ttl is not None and hard_ttl < ttl:
+            raise ValueError("hard_ttl cannot be lower than ttl")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hard_ttl = ttl if hard_ttl is None else hard_ttl
+        self.negative_maxsize = negative_maxsize
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._lock = threading.RLock()
+        # Institutions are stored with the time they were cached, "not found"
+        # entries with the time they expire.
+        self._entries: "OrderedDict[str, Tuple[float, Institution]]" = OrderedDict()
+        self._negative: "OrderedDict[str, float]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._stats = CacheStats()
+
+    @property
+    def stale_while_revalidate(self) -> bool:
+        """Whether stale institutions are served while they are refreshed."""
+        return self.hard_ttl > self.ttl
+
+    @staticmethod
+    def _key(ror_id: str) -> str:
+        """Normalizes a ROR ID or URL to a cache key."""
+        return ror_id.replace("https://ror.org/", "").lower()
+
+    def lookup(
+        self, ror_id: str, allow_expired: bool = False
+    ) -> Tuple[bool, Optional[Institution], bool]:
+        """
+        Looks up a ROR ID, reporting whether the answer is stale.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+            allow_expired (bool): Also return entries past their TTL, as stale,
+                e.g. while the API is unavailable. Otherwise expired entries are
+                reported as a miss, but kept until they are evicted.
+
+        Returns:
+            Tuple[bool, Optional[Institution], bool]: Whether the cache had an
+            answer, the institution (None for a cached "not found") and whether the
+            institution is past its soft TTL and should be refreshed.
+        """
+        key = self._key(ror_id)
+        with self._lock:
+            now = self._clock()
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, institution = entry
+                age = now - stored_at
+                if age < self.hard_ttl or allow_expired:
+                    self._entries.move_to_end(key)
+                    if age < self.ttl:
+                        self._stats.hits += 1
+                        return True, institution, False
+                    self._stats.stale_hits += 1
+                    return True, institution, True
+                # Expired entries are kept until they are evicted, so they are
+                # still there to serve while the API is unavailable
+                self._stats.expirations += 1
+
+            expires_at = self._negative.get(key)
+            if expires_at is not None:
+                if expires_at > now or allow_expired:
+                    self._negative.move_to_end(key)
+                    self._stats.negative_hits += 1
+                    return True, None, False
+                self._stats.expirations += 1
+
+            self._stats.misses += 1
+            return False, None, False
+
+    def get(self, ror_id: str) -> Tuple[bool, Optional[Institution]]:
+        """
+        Looks up a ROR ID.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+
+        Returns:
+            Tuple[bool, Optional[Institution]]: Whether the cache had an answer, and
+            the institution, which is None for a cached "not found".
+        """
+        found, institution, _ = self.lookup(ror_id)
+        return found, institution
+
+    def set(self, ror_id: str, institution: Institution) -> None:
+        """
+        Caches an institution.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+            institution (Institution): The institution to cache.
+        """
+        key = self._key(ror_id)
+        with self._lock:
+            self._negative.pop(key, None)
+            self._entries[key] = (self._clock(), institution)
+            self._entries.move_to_end(key)
+            self._evict(self._entries, self.maxsize)
+
+    def set_missing(self, ror_id: str) -> None:
+        """
+        Remembers that a ROR ID does not exist.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+        """
+        key = self._key(ror_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._negative[key] = self._clock() + self.negative_ttl
+            self._negative.move_to_end(key)
+            self._evict(self._negative, self.negative_maxsize)
+
+    def _evict(self, entries: OrderedDict, maxsize: int) -> None:
+        """Drops the least recently used entries beyond the size limit."""
+        while len(entries) > maxsize:
+            entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def start_refresh(self, ror_id: str) -> bool:
+        """
+        Claims the background refresh of a stale entry.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+
+        Returns:
+            bool: False if a refresh of the entry is already in progress.
+        """
+        key = self._key(ror_id)
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def finish_refresh(self, ror_id: str, success: bool) -> None:
+        """
+        Releases a refresh claimed with :meth:`start_refresh`.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+            success (bool): Whether the refresh succeeded.
+        """
+        with self._lock:
+            self._refreshing.discard(self._key(ror_id))
+            if success:
+                self._stats.refreshes += 1
+            else:
+                self._stats.refresh_failures += 1
+
+    def invalidate(self, ror_id: str) -> None:
+        """Removes any cached answer for a ROR ID."""
+        key = self._key(ror_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._negative.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._negative.clear()
+
+    def values(self) -> Iterator[Institution]:
+        """Iterates over the cached institutions, e.g. to build an index from them."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return (institution for _, institution in entries)
+
+    def load_dump(self, path: PathLike, ror_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Fills the cache from a ROR data dump without making any requests.
+
+        Args:
+            path (PathLike): Path to the dump file.
+            ror_ids (Optional[Iterable[str]]): Only load these IDs. Loads every
+                record if omitted, as far as ``maxsize`` allows.
+
+        Returns:
+            int: The number of institutions loaded.
+        """
+        wanted = None if ror_ids is None else {self._key(i) for i in ror_ids}
+        loaded = 0
+        for record in iter_dump_records(path):
+            key = self._key(str(record["id"]))
+            if wanted is not None and key not in wanted:
+                continue
+            self.set(key, Institution(**record))
+            loaded += 1
+        logger.debug(f"Loaded {loaded} institutions into the cache from {path}")
+        return loaded
+
+    def save_snapshot(self, path: PathLike) -> int:
+        """
+        Writes the cache contents to a gzip-compressed JSON lines file.
+
+        The age of every entry is kept, so restored entries expire on schedule.
+
+        Args:
+            path (PathLike): Destination path.
+
+        Returns:
+            int: The number of entries written.
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+            negative = list(self._negative.items())
+            now = self._clock()
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=1) as fh:
+            fh.write(json.dumps({"version": _SNAPSHOT_VERSION}) + "\n")
+            for key, expires_at in negative:
+                fh.write(json.dumps({"id": key, "ttl": expires_at - now}) + "\n")
+            for key, (stored_at, institution) in entries:
+                fh.write(
+                    f'{{"id": {json.dumps(key)}, "age": {now - stored_at}, "record": '
+                    f"{institution.model_dump_json()}}}\n"
+                )
+        os.replace(tmp_path, path)
+        return len(entries) + len(negative)
+
+    def load_snapshot(self, path: PathLike) -> int:
+        """
+        Restores entries written with :meth:`save_snapshot`.
+
+        Entries that expired in the meantime are skipped.
+
+        Args:
+            path (PathLike): Path to the snapshot file.
+
+        Returns:
+            int: The number of entries restored.
+
+        Raises:
+            ValueError: If the file is not a cache snapshot.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            header = json.loads(fh.readline() or "{}")
+            if header.get("version") != _SNAPSHOT_VERSION:
+                raise ValueError(f"Not a cache snapshot: {path}")
+
+            entries = []
+            negative = []
+            for line in fh:
+                entry = json.loads(line)
+                if "record" in entry:
+                    if entry["age"] < self.hard_ttl:
+                        entries.append(
+                            (
+                                entry["id"],
+                                entry["age"],
+                                Institution.model_validate(entry["record"]),
+                            )
+                        )
+                elif entry["ttl"] > 0:
+                    negative.append((entry["id"], entry["ttl"]))
+
+        with self._lock:
+            now = self._clock()
+            for key, ttl in negative:
+                self._negative[key] = now + min(ttl, self.negative_ttl)
+            self._evict(self._negative, self.negative_maxsize)
+            for key, age, institution in entries:
+                self._entries[key] = (now - age, institution)
+            self._evict(self._entries, self.maxsize)
+
+        logger.debug(
+            f"Restored {len(entries) + len(negative)} cache entries from {path}"
+        )
+        return len(entries) + len(negative)
+
+    def stats(self) -> CacheStats:
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            CacheStats: The current counters and sizes.
+        """
+        with self._lock:
+            return replace(
+                self._stats, size=len(self._entries), negative_size=len(self._negative)
+            )
+
+    def __len__(self) -> int:
+        """Returns the number of entries, including "not found" entries."""
+        return len(self._entries) + len(self._negative)
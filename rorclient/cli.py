@@ -0,0 +1,429 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Command-line tool resolving ROR IDs and names in bulk.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import IO, Deque, Iterable, Optional, Sequence, Tuple
+
+import httpx
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.cache import InstitutionCache
+from rorclient.export import CSVExporter, Exporter, JSONLExporter
+from rorclient.metrics import ClientMetrics
+from rorclient.models import Institution
+from rorclient.ratelimit import RateLimiter
+from rorclient.retry import RetryPolicy
+from rorclient.ror_id import normalize_ror_ids
+from rorclient.shared_cache import SharedInstitutionCache
+
+logger = logging.getLogger(__name__)
+
+# Lookups started per slot of concurrency, so that one slow lookup at the head
+# of the output does not leave the other slots idle
+_WINDOW_PER_SLOT = 4
+
+# Institutions written per chunk, small enough for output to appear promptly
+_CHUNK_SIZE = 100
+
+EXPORTERS = {"jsonl": JSONLExporter, "csv": CSVExporter}
+
+# Put on the line queue once the input is exhausted
+_END = object()
+
+
+@dataclass
+class ResolveStats:
+    """
+    Counts of a bulk resolution.
+
+    Attributes:
+        lines (int): Non-empty input lines.
+        found (int): Lines resolved to an institution.
+        not_found (int): Unknown IDs and names without search results.
+        errors (Counter): Failed lines by exception type.
+        elapsed (float): Seconds spent resolving.
+    """
+
+    lines: int = 0
+    found: int = 0
+    not_found: int = 0
+    errors: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Lines resolved per second."""
+        return self.lines / self.elapsed if self.elapsed else 0.0
+
+    def summary(self, metrics: Optional[ClientMetrics] = None) -> str:
+        """
+        Formats the counts for the end of a run.
+
+        Args:
+            metrics (Optional[ClientMetrics]): The client's metrics, adding the
+                requests made, retries and cache hits.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        failed = sum(self.errors.values())
+        lines = [
+            f"Resolved {self.found:,} of {self.lines:,} lines in "
+            f"{self.elapsed:.2f}s ({self.throughput:,.1f} lines/s)",
+            f"Not found: {self.not_found:,}, errors: {failed:,}",
+        ]
+        lines.extend(
+            f"  {name}: {count:,}" for name, count in self.errors.most_common()
+        )
+        if metrics is not None:
+            statuses = ", ".join(
+                f"{status}: {count:,}"
+                for status, count in sorted(metrics.requests.items())
+            )
+            requests = sum(metrics.requests.values()) + sum(metrics.errors.values())
+            lines.append(
+                f"Requests: {requests:,} ({statuses or 'none'}), "
+                f"retries: {metrics.retries:,}, cache hits: {metrics.cache_hits:,}"
+            )
+        return "\n".join(lines)
+
+
+async def lookup(client: AsyncRORClient, query: str) -> Optional[Institution]:
+    """
+    Resolves a ROR ID, or a name to its top search result.
+
+    A value shaped like a ROR ID whose checksum does not match is most likely a
+    mistyped ID, so it is rejected rather than searched for as a name.
+
+    Args:
+        client (AsyncRORClient): The client to resolve with.
+        query (str): A ROR ID or URL, or an institution name.
+
+    Returns:
+        Optional[Institution]: The institution, or None if there is none.
+
+    Raises:
+        ValueError: If the query is a ROR ID with an invalid checksum.
+    """
+    normalized = normalize_ror_ids([query])
+    if normalized.ids:
+        return await client.get_institution(normalized.ids[0])
+    if normalized.invalid[0].reason == "checksum mismatch":
+        raise ValueError(f"Invalid ROR ID checksum: {query}")
+    result = await client.search(query)
+    if result is None or not result.items:
+        return None
+    return result.items[0]
+
+
+async def resolve(
+    client: AsyncRORClient,
+    lines: Iterable[str],
+    exporter: Exporter,
+    concurrency: int = 16,
+) -> ResolveStats:
+    """
+    Resolves lines concurrently and writes the institutions in input order.
+
+    Lines are read on a separate thread as room in the window of lookups frees
+    up, so input of any length is streamed, and each institution is written as
+    soon as the lookups before it are done. Blank lines are skipped; lines that
+    are not found or fail are counted and logged, and do not stop the run.
+
+    Args:
+        client (AsyncRORClient): The client to resolve with.
+        lines (Iterable[str]): ROR IDs or names, one per line.
+        exporter (Exporter): Receives the institutions found.
+        concurrency (int): The maximum number of lookups in flight.
+
+    Returns:
+        ResolveStats: The counts of the run.
+
+    Raises:
+        ValueError: If concurrency is below 1.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    stats = ResolveStats()
+    max_window = concurrency * _WINDOW_PER_SLOT
+    semaphore = asyncio.Semaphore(concurrency)
+    window: Deque[Tuple[str, asyncio.Task]] = deque()
+
+    async def limited(query: str) -> Optional[Institution]:
+        async with semaphore:
+            return await lookup(client, query)
+
+    async def write_next() -> None:
+        query, task = window.popleft()
+        try:
+            institution = await task
+        except Exception as e:
+            stats.errors[type(e).__name__] += 1
+            logger.warning(f"Could not resolve {query}: {e}")
+            return
+        if institution is None:
+            stats.not_found += 1
+            logger.info(f"Not found: {query}")
+        else:
+            stats.found += 1
+            exporter.write(institution)
+
+    # Lines are read on a thread, so a slow producer on stdin does not hold up
+    # the event loop, and finished lookups are written while waiting for input
+    queue: asyncio.Queue = asyncio.Queue()
+    space = threading.Semaphore(max_window)
+    threading.Thread(
+        target=_read_lines,
+        args=(lines, asyncio.get_running_loop(), queue, space),
+        name="rorclient-input",
+        daemon=True,
+    ).start()
+
+    start = time.perf_counter()
+    reading: Optional[asyncio.Future] = None
+    done_reading = False
+    try:
+        while True:
+            if reading is None and not done_reading and len(window) < max_window:
+                reading = asyncio.ensure_future(queue.get())
+            waiting = set() if reading is None else {reading}
+            if window:
+                waiting.add(window[0][1])
+            if not waiting:
+                break
+            if queue.empty():
+                # Show what is done before waiting for more input
+                exporter.flush()
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            while window and window[0][1].done():
+                await write_next()
+            if reading is not None and reading.done():
+                line = reading.result()
+                reading = None
+                if line is _END:
+                    done_reading = True
+                    continue
+                if isinstance(line, BaseException):
+                    raise line
+                space.release()
+                if query := line.strip():
+                    stats.lines += 1
+                    window.append((query, asyncio.ensure_future(limited(query))))
+    finally:
+        pending = [task for _, task in window]
+        if reading is not None:
+            pending.append(reading)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def _read_lines(
+    lines: Iterable[str],
+    loop: asyncio.AbstractEventLoop,
+    queue: asyncio.Queue,
+    space: threading.Semaphore,
+) -> None:
+    """
+    Feeds lines to the event loop, at most as many as ``space`` allows ahead.
+
+    Ends with ``_END``, or with the exception raised while reading.
+    """
+    item: object = _END
+    try:
+        for line in lines:
+            space.acquire()
+            loop.call_soon_threadsafe(queue.put_nowait, line)
+    except Exception as e:
+        item = e
+    try:
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+    except RuntimeError:
+        # The loop is closed, nobody is waiting for the input any more
+        pass
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser of the ``rorclient`` command."""
+    parser = argparse.ArgumentParser(
+        prog="rorclient",
+        description=(
+            "Resolve ROR IDs or institution names, one per line, and write the "
+            "institutions found to stdout. Names resolve to their top search result."
+        ),
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="file with one ROR ID or name per line (default: stdin)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=sorted(EXPORTERS),
+        default="jsonl",
+        help="output format (default: jsonl)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=lambda value: [name.strip() for name in value.split(",")],
+        help="comma-separated fields to write (default: all)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=16,
+        help="maximum lookups in flight (default: 16)",
+    )
+    parser.add_argument(
+        "--rate", type=float, help="maximum requests per second (default: no limit)"
+    )
+    parser.add_argument(
+        "--burst", type=int, help="requests allowed at once with --rate"
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=10_000,
+        help="institutions cached in memory, 0 to disable (default: 10000)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600.0,
+        help="seconds a cached institution stays fresh (default: 3600)",
+    )
+    parser.add_argument(
+        "--shared-cache", help="shared cache file to look institutions up in first"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        help="maximum attempts per request, including the first; 0 or 1 disables "
+        "retries",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not print statistics"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="log lines that are not found"
+    )
+    return parser
+
+
+def make_client(
+    args: argparse.Namespace, metrics: Optional[ClientMetrics] = None
+) -> AsyncRORClient:
+    """
+    Creates the client configured by the command-line arguments.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        metrics (Optional[ClientMetrics]): Metrics for the client to update.
+
+    Returns:
+        AsyncRORClient: The client.
+    """
+    # A connection per lookup in flight, so lookups do not wait for the pool
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    return AsyncRORClient(
+        cache=(
+            InstitutionCache(maxsize=args.cache_size, ttl=args.cache_ttl)
+            if args.cache_size > 0
+            else None
+        ),
+        shared_cache=(
+            SharedInstitutionCache(args.shared_cache) if args.shared_cache else None
+        ),
+        retry_policy=RetryPolicy(max_retries=args.max_retries),
+        rate_limiter=(
+            RateLimiter(args.rate, args.burst) if args.rate is not None else None
+        ),
+        limits=limits,
+        metrics=metrics,
+    )
+
+
+async def _run(args: argparse.Namespace, lines: Iterable[str], output: IO) -> int:
+    """Resolves the input and prints the statistics."""
+    metrics = ClientMetrics()
+    with EXPORTERS[args.format](
+        output, fields=args.fields, chunk_size=_CHUNK_SIZE
+    ) as exporter:
+        async with make_client(args, metrics) as client:
+            stats = await resolve(client, lines, exporter, args.concurrency)
+    if not args.quiet:
+        print(stats.summary(metrics), file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the ``rorclient`` command.
+
+    Args:
+        argv (Optional[Sequence[str]]): The arguments. Defaults to ``sys.argv``.
+
+    Returns:
+        int: The exit status: 0 on success, 1 if any line failed with an error,
+        2 for invalid arguments.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be greater than 0")
+    if args.burst is not None and args.rate is None:
+        parser.error("--burst requires --rate")
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s: %(message)s",
+    )
+
+    try:
+        if args.input == "-":
+            return asyncio.run(_run(args, sys.stdin, sys.stdout))
+        with open(args.input, encoding="utf-8") as fh:
+            return asyncio.run(_run(args, fh, sys.stdout))
+    except ValueError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # The reader went away, e.g. ``rorclient ids.txt | head``. Point stdout
+        # at devnull so flushing it on exit does not fail again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except OSError as e:
+        print(f"rorclient: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,18 +10,34 @@ Description: Synchronous client for interacting with the ROR API.
 """
 
 import logging
-from typing import ClassVar, List, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Dict, Iterator, List, Optional, Tuple
 from urllib.parse import quote_plus
 
-import backoff
 import httpx
-from pydantic import BaseModel, PrivateAttr
 
 from rorclient.base import BaseRORClient
-from rorclient.config import config
+from rorclient.bloom import BloomFilter
+from rorclient.breaker import CircuitBreaker
+from rorclient.cache import InstitutionCache
+from rorclient.hedging import HedgingPolicy
+from rorclient.metrics import ClientMetrics, Hook
 from rorclient.models import Institution
 from rorclient.models.search import SearchResult
-from rorclient.utils import retry_with_backoff
+from rorclient.profiling import (
+    DECODE,
+    TRANSFER,
+    VALIDATE,
+    RequestTrace,
+    profiled,
+    stage,
+)
+from rorclient.ratelimit import RateLimiter
+from rorclient.retry import RetryPolicy, retry_with_policy
+from rorclient.shared_cache import SharedInstitutionCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,15 +48,65 @@ class RORClient(BaseRORClient):
 
     The RORClient provides methods to fetch institutions by their ROR ID, fetch multiple institutions,
     and search for institutions. The client can also prefetch relationships between institutions up to a specified depth.
+
+    A client is thread-safe and is meant to be shared between threads: they use one
+    connection pool, cache and set of policies, and concurrent fetches of the same
+    institution are combined into one request.
     """
 
     def __init__(
-        self, prefetch_relationships: bool = False, max_depth: int = 2
+        self,
+        prefetch_relationships: bool = False,
+        max_depth: int = 2,
+        id_filter: Optional[BloomFilter] = None,
+        cache: Optional[InstitutionCache] = None,
+        shared_cache: Optional[SharedInstitutionCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        http_client: Optional[httpx.Client] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        http2: Optional[bool] = None,
+        hooks: Optional[List[Hook]] = None,
+        metrics: Optional[ClientMetrics] = None,
+        profile: bool = False,
     ) -> None:
         """Initializes the HTTPX client for connection reuse."""
-        super().__init__(prefetch_relationships, max_depth)
-        self._client = httpx.Client()
-        self._initialize_client(self._client)
+        super().__init__(
+            prefetch_relationships,
+            max_depth,
+            id_filter=id_filter,
+            cache=cache,
+            shared_cache=shared_cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            hedging=hedging,
+            hooks=hooks,
+            metrics=metrics,
+            profile=profile,
+        )
+        if http_client is not None:
+            if transport is not None:
+                raise ValueError("Pass either http_client or transport, not both")
+            # A shared client is left configured as it is, apart from a missing
+            # base URL, and is not closed with this client.
+            self._client = http_client
+            self._owns_client = False
+            if not str(http_client.base_url):
+                self._initialize_client(http_client)
+        else:
+            self._client = httpx.Client(
+                **self._client_options(limits, timeout, http2, transport)
+            )
+            self._owns_client = True
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, int], Future] = {}
+        self._in_flight_lock = threading.Lock()
 
     def __enter__(self):
         """Allows the client to be used as a context manager."""
@@ -48,9 +114,9 @@ class RORClient(BaseRORClient):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Ensures the HTTPX client is closed when exiting context."""
-        self._client.close()
+        self.close()
 
-    @retry_with_backoff()
+    @profiled
     def get_institution(self, ror_id: str, depth: int = 0) -> Optional[Institution]:
         """
         Fetches a single institution by its ROR ID.
@@ -67,50 +133,304 @@ class RORClient(BaseRORClient):
         """
         self._validate_ror_id(ror_id)
 
+        if self._is_unknown_ror_id(ror_id):
+            return None
+
+        # While the API is down, expired entries are better than an error
+        circuit_open = self._circuit_open()
+        cached, institution, stale = self._get_cached(ror_id, circuit_open)
+        if cached:
+            if stale and not circuit_open:
+                self._schedule_refresh(ror_id)
+            return institution
+
+        # Shared records are decoded per lookup and not copied into the local
+        # cache, which keeps per-process memory flat.
+        institution_data = self._get_shared(ror_id)
+        if institution_data is not None:
+            institution_data = self._process_institution_data(institution_data, depth)
+            with stage(self.profiler, VALIDATE):
+                return Institution(**institution_data)
+
+        return self._fetch_coalesced(ror_id, depth)
+
+    def _fetch_coalesced(self, ror_id: str, depth: int) -> Optional[Institution]:
+        """Fetches an institution, sharing one request between concurrent callers."""
+        # The depth is part of the key, as prefetched records are truncated at
+        # max_depth. A fetch only waits for fetches deeper than its own, so
+        # prefetch cycles cannot deadlock.
+        key = (ror_id, depth)
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            institution = self._fetch_institution(ror_id, depth)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(institution)
+            return institution
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    @retry_with_policy
+    def _fetch_institution(self, ror_id: str, depth: int = 0) -> Optional[Institution]:
+        """Fetches a single institution from the API and caches the result."""
         logger.debug(f"Fetching institution with ROR ID: {ror_id}")
-        response = self._client.get(f"organizations/{ror_id}")
+        response = self._get(f"organizations/{ror_id}")
 
         if response.status_code == 200:
-            institution_data = response.json()
+            with stage(self.profiler, DECODE):
+                institution_data = response.json()
             institution_data = self._process_institution_data(institution_data, depth)
-            return Institution(**institution_data)
+            with stage(self.profiler, VALIDATE):
+                institution = Institution(**institution_data)
+            self._cache_result(ror_id, institution, depth)
+            return institution
         elif response.status_code == 404:
+            self._cache_result(ror_id, None, depth)
             return None
         else:
+            self.retry_policy.check_response(response)
             raise ValueError(f"Got {response.status_code} from ROR")
 
-    @retry_with_backoff()
-    def get_multiple_institutions(self, ror_ids: List[str]) -> List[Institution]:
+    def _get(self, url: str) -> httpx.Response:
+        """Sends a GET request through the breaker and rate limiter, and reports it."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        start = self._start_request(url)
+        response = None
+        error: Optional[BaseException] = None
+        try:
+            if self.hedging is not None:
+                with stage(self.profiler, TRANSFER):
+                    response = self._hedged_get(url)
+            elif self.profiler is not None:
+                response = self._traced_get(url)
+            else:
+                response = self._client.get(url)
+            return response
+        except BaseException as e:
+            # Includes cancellation, which must end the request as well
+            error = e
+            raise
+        finally:
+            self._finish_request(url, start, response, error)
+
+    def _traced_get(self, url: str) -> httpx.Response:
+        """Sends a GET request, timing connection setup and transfer separately."""
+        trace = RequestTrace()
+        start = time.perf_counter()
+        try:
+            return self._client.get(url, extensions={"trace": trace.sync_callback})
+        finally:
+            self.profiler.add_request(time.perf_counter() - start, trace.connect)
+
+    def _hedged_get(self, url: str) -> httpx.Response:
+        """Sends a GET request, duplicated if slower than the hedging delay."""
+        hedging = self.hedging
+        hedging.start_request()
+        start = time.monotonic()
+        primary = self._send_in_thread(url)
+        try:
+            response = primary.result(timeout=hedging.delay())
+        except FuturesTimeoutError:
+            pass
+        else:
+            hedging.record_latency(time.monotonic() - start)
+            return response
+
+        if not hedging.try_hedge(self.rate_limiter):
+            response = primary.result()
+            hedging.record_latency(time.monotonic() - start)
+            return response
+
+        logger.debug(f"Hedging slow request for {url}")
+        # A request that already started cannot be cancelled; the loser finishes
+        # in the background and its response is discarded.
+        hedge = self._send_in_thread(url)
+        for future in as_completed((primary, hedge)):
+            if future.exception() is None:
+                if future is hedge:
+                    hedging.record_hedge_win()
+                hedging.record_latency(time.monotonic() - start)
+                return future.result()
+        # Both failed, report the original error
+        return primary.result()
+
+    def _send_in_thread(self, url: str) -> Future:
+        """
+        Sends a GET request on a thread of its own.
+
+        A fixed pool would queue requests beyond its size, and the time spent
+        queued would count towards the hedging delay and the observed latency.
+        """
+        future: Future = Future()
+
+        def send() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._client.get(url))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=send, name="rorclient-hedge", daemon=True).start()
+        return future
+
+    def _schedule_refresh(self, ror_id: str) -> None:
+        """Refreshes a stale cache entry on a background worker thread."""
+        if not self.cache.start_refresh(ror_id):
+            return
+
+        with self._refresh_lock:
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="rorclient-refresh"
+                )
+        self._refresh_executor.submit(self._refresh, ror_id)
+
+    def _refresh(self, ror_id: str) -> None:
+        """Refetches a stale cache entry, keeping the stale copy on failure."""
+        success = False
+        try:
+            self._fetch_institution(ror_id)
+            success = True
+        except Exception as e:
+            logger.warning(f"Background refresh of {ror_id} failed: {e}")
+        finally:
+            self.cache.finish_refresh(ror_id, success)
+
+    def get_multiple_institutions(
+        self, ror_ids: List[str], concurrency: int = 1
+    ) -> List[Institution]:
         """
         Fetches multiple institutions by their ROR IDs.
 
         Args:
             ror_ids (List[str]): A list of ROR ID strings.
+            concurrency (int): The number of threads fetching in parallel. With 1,
+                the IDs are fetched one after another.
 
         Returns:
-            List[Institution]: A list of Institution objects.
+            List[Institution]: A list of Institution objects, in the order of the IDs.
 
         Raises:
-            ValueError: If the IDs list is empty.
+            ValueError: If the IDs list is empty or concurrency is below 1.
         """
 
         self._validate_ror_ids(ror_ids)
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
         logger.debug(f"Fetching multiple institutions: {ror_ids}")
-        institutions = []
-        for ror_id in ror_ids:
-            institution = self.get_institution(ror_id)
-            if institution:
-                institutions.append(institution)
 
-        return institutions
+        if concurrency == 1:
+            results = [self.get_institution(ror_id) for ror_id in ror_ids]
+        else:
+            fetched = dict(self._fetch_parallel(ror_ids, concurrency, ordered=True))
+            results = [fetched[ror_id] for ror_id in ror_ids]
+
+        return [institution for institution in results if institution]
 
-    def search(self, search_term: str, advanced_search: bool = False):
+    def iter_institutions(
+        self, ror_ids: List[str], concurrency: int = 8
+    ) -> Iterator[Tuple[str, Optional[Institution]]]:
+        """
+        Fetches institutions in parallel, yielding each as soon as it arrives.
+
+        Args:
+            ror_ids (List[str]): The ROR IDs to fetch. Duplicates are fetched once.
+            concurrency (int): The number of threads fetching in parallel.
+
+        Returns:
+            Iterator[Tuple[str, Optional[Institution]]]: The ROR ID and its
+            institution, or None if it was not found, in order of completion.
+
+        Raises:
+            ValueError: If the IDs list is empty or concurrency is below 1. Raised
+                by this call, before anything is fetched.
+        """
+        self._validate_ror_ids(ror_ids)
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        return self._fetch_parallel(ror_ids, concurrency, ordered=False)
+
+    def _fetch_parallel(
+        self, ror_ids: List[str], concurrency: int, ordered: bool
+    ) -> Iterator[Tuple[str, Optional[Institution]]]:
+        """Fetches distinct IDs on a thread pool, in input or completion order."""
+        ror_ids = list(dict.fromkeys(ror_ids))
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="rorclient-fetch"
+        )
+        try:
+            futures = {
+                executor.submit(self.get_institution, ror_id): ror_id
+                for ror_id in ror_ids
+            }
+            for future in futures if ordered else as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # On an error or when the caller stops iterating, skip the rest
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def warm_cache(self, ror_ids: List[str], concurrency: int = 8) -> int:
+        """
+        Preloads the cache by fetching institutions concurrently.
+
+        IDs that are already cached are not fetched again, and failures are logged
+        rather than raised.
+
+        Args:
+            ror_ids (List[str]): The ROR IDs to preload.
+            concurrency (int): The maximum number of requests in flight.
+
+        Returns:
+            int: The number of institutions now cached.
+
+        Raises:
+            ValueError: If the client has no cache.
+        """
+        self._require_cache()
+        ror_ids = list(dict.fromkeys(ror_ids))
+        logger.debug(f"Warming cache with {len(ror_ids)} institutions")
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="rorclient-warm"
+        ) as executor:
+            return sum(executor.map(self._warm_one, ror_ids))
+
+    def _warm_one(self, ror_id: str) -> bool:
+        """Fetches one institution into the cache, returning whether it was found."""
+        try:
+            return self.get_institution(ror_id) is not None
+        except Exception as e:
+            logger.warning(f"Could not warm cache with {ror_id}: {e}")
+            return False
+
+    @profiled
+    @retry_with_policy
+    def search(
+        self,
+        search_term: str,
+        advanced_search: bool = False,
+        page: Optional[int] = None,
+    ):
         """
         Searches the ROR API with a search_term.
 
         Args:
             search_term (str): A search term
             advanced_search (bool): Toggling the "query.advanced" parameter.
+            page (Optional[int]): The page of results to return, starting at 1.
 
         Returns:
             SearchResult: A search result object
@@ -122,18 +442,25 @@ class RORClient(BaseRORClient):
 
         query_type = "query.advanced" if advanced_search else "query"
 
-        response = self._client.get(
-            f"organizations?{query_type}={quote_plus(search_term)}"
-        )
+        url = f"organizations?{query_type}={quote_plus(search_term)}"
+        if page is not None:
+            url += f"&page={page}"
+        response = self._get(url)
 
         if response.status_code == 200:
-            search_results = response.json()
-            return SearchResult(**search_results)
+            with stage(self.profiler, DECODE):
+                search_results = response.json()
+            with stage(self.profiler, VALIDATE):
+                return SearchResult(**search_results)
         elif response.status_code == 404:
             return None
         else:
+            self.retry_policy.check_response(response)
             raise ValueError(f"Got {response.status_code} from ROR")
 
     def close(self):
-        """Closes the HTTPX client."""
-        self._client.close()
+        """Closes the HTTPX client, unless it was passed in, after background work."""
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=True, cancel_futures=True)
+        if self._owns_client:
+            self._client.close()
@@ -9,7 +9,9 @@ Project: RORClient
 Description: Configuration class for the RORClient package.
 """
 
-from pydantic import BaseModel, Field, HttpUrl, PositiveInt
+from typing import Optional
+
+from pydantic import BaseModel, Field, HttpUrl, NonNegativeFloat, PositiveInt
 
 
 class Config(BaseModel):
@@ -21,6 +23,34 @@ class Config(BaseModel):
         default=60, description="Maximum retry time in seconds"
     )
     max_retries: PositiveInt = Field(default=5, description="Maximum number of retries")
+    validate_checksum: bool = Field(
+        default=False,
+        description="Reject ROR IDs whose trailing checksum does not match",
+    )
+    max_connections: Optional[PositiveInt] = Field(
+        default=100, description="Maximum number of open connections per client"
+    )
+    max_keepalive_connections: Optional[PositiveInt] = Field(
+        default=20, description="Maximum number of idle connections kept alive"
+    )
+    keepalive_expiry: Optional[NonNegativeFloat] = Field(
+        default=5.0, description="Seconds an idle connection is kept alive"
+    )
+    http2: bool = Field(
+        default=False, description="Use HTTP/2, requires the httpx[http2] extra"
+    )
+    connect_timeout: Optional[NonNegativeFloat] = Field(
+        default=5.0, description="Timeout for establishing a connection in seconds"
+    )
+    read_timeout: Optional[NonNegativeFloat] = Field(
+        default=5.0, description="Timeout for receiving a chunk of the response"
+    )
+    write_timeout: Optional[NonNegativeFloat] = Field(
+        default=5.0, description="Timeout for sending a chunk of the request"
+    )
+    pool_timeout: Optional[NonNegativeFloat] = Field(
+        default=5.0, description="Timeout for acquiring a connection from the pool"
+    )
 
 
 config = Config()
@@ -0,0 +1,95 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Readers for ROR data dump files.
+"""
+
+import gzip
+import json
+import logging
+import zipfile
+from pathlib import Path
+from typing import Iterator, Union
+
+from rorclient.models import Institution
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+def _select_zip_member(archive: zipfile.ZipFile) -> str:
+    """Picks the JSON file to read from a ROR dump archive, preferring the v2 schema."""
+    members = [name for name in archive.namelist() if name.endswith(".json")]
+    if not members:
+        raise ValueError(f"No JSON file found in dump archive: {archive.filename}")
+
+    for name in members:
+        if name.endswith("_schema_v2.json"):
+            return name
+    return members[0]
+
+
+def iter_dump_records(path: PathLike) -> Iterator[dict]:
+    """
+    Iterates over the raw organization records in a ROR data dump.
+
+    Supports the official Zenodo ``.zip`` archives, plain ``.json`` files containing
+    a list of records and ``.jsonl`` files with one record per line. Any of these
+    may additionally be gzip compressed (``.gz``).
+
+    Args:
+        path (PathLike): Path to the dump file.
+
+    Returns:
+        Iterator[dict]: The raw records as returned by the ROR API.
+
+    Raises:
+        ValueError: If the file does not contain ROR records.
+    """
+    path = Path(path)
+    logger.debug(f"Reading ROR dump from {path}")
+
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            with archive.open(_select_zip_member(archive)) as fh:
+                records = json.load(fh)
+        if not isinstance(records, list):
+            raise ValueError(f"Expected a list of records in {path}")
+        yield from records
+        return
+
+    opener = gzip.open if path.suffix == ".gz" else open
+    stem_suffix = Path(path.stem).suffix if path.suffix == ".gz" else path.suffix
+
+    with opener(path, "rt", encoding="utf-8") as fh:
+        if stem_suffix == ".jsonl":
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        records = json.load(fh)
+
+    if not isinstance(records, list):
+        raise ValueError(f"Expected a list of records in {path}")
+    yield from records
+
+
+def iter_dump(path: PathLike) -> Iterator[Institution]:
+    """
+    Iterates over the institutions in a ROR data dump.
+
+    Args:
+        path (PathLike): Path to the dump file.
+
+    Returns:
+        Iterator[Institution]: Validated Institution objects.
+    """
+    for record in iter_dump_records(path):
+        yield Institution(**record)
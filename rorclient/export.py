@@ -0,0 +1,491 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Streaming export of institutions to JSON lines, CSV and Parquet.
+"""
+
+import csv
+import gzip
+import logging
+from abc import ABC, abstractmethod
+from datetime import date
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from rorclient.dump import PathLike
+from rorclient.models import Institution
+
+logger = logging.getLogger(__name__)
+
+Target = Union[PathLike, IO]
+
+
+def _names(name_type: str) -> Callable[[Institution], List[str]]:
+    return lambda i: [name.value for name in i.names if name_type in name.types]
+
+
+def _link(link_type: str) -> Callable[[Institution], Optional[str]]:
+    def get(institution: Institution) -> Optional[str]:
+        for link in institution.links:
+            if link.type == link_type:
+                return str(link.value)
+        return None
+
+    return get
+
+
+def _location(attribute: str) -> Callable[[Institution], Any]:
+    def get(institution: Institution) -> Any:
+        if not institution.locations:
+            return None
+        return getattr(institution.locations[0].geonames_details, attribute)
+
+    return get
+
+
+def _external_id(id_type: str) -> Callable[[Institution], Optional[str]]:
+    def get(institution: Institution) -> Optional[str]:
+        for external_id in institution.external_ids:
+            if external_id.type == id_type:
+                if external_id.preferred:
+                    return external_id.preferred
+                return external_id.all[0] if external_id.all else None
+        return None
+
+    return get
+
+
+def _related(relationship_type: str) -> Callable[[Institution], List[str]]:
+    return lambda i: [
+        str(rel.id) for rel in i.relationships if rel.type.lower() == relationship_type
+    ]
+
+
+# Flat columns for CSV and Parquet: name, value type and how to get the value.
+# The first location counts as the location of the institution.
+COLUMNS: Dict[str, Tuple[str, Callable[[Institution], Any]]] = {
+    "id": ("string", lambda i: str(i.id)),
+    "name": ("string", lambda i: i.display_name),
+    "status": ("string", lambda i: i.status),
+    "types": ("list", lambda i: list(i.types)),
+    "established": ("int", lambda i: i.established),
+    "aliases": ("list", _names("alias")),
+    "acronyms": ("list", _names("acronym")),
+    "labels": ("list", _names("label")),
+    "domains": ("list", lambda i: list(i.domains)),
+    "website": ("string", _link("website")),
+    "wikipedia": ("string", _link("wikipedia")),
+    "city": ("string", _location("name")),
+    "country_subdivision": ("string", _location("country_subdivision_name")),
+    "country_code": ("string", _location("country_code")),
+    "country_name": ("string", _location("country_name")),
+    "lat": ("float", _location("lat")),
+    "lng": ("float", _location("lng")),
+    "geonames_id": (
+        "int",
+        lambda i: i.locations[0].geonames_id if i.locations else None,
+    ),
+    "grid": ("string", _external_id("grid")),
+    "isni": ("string", _external_id("isni")),
+    "wikidata": ("string", _external_id("wikidata")),
+    "fundref": ("string", _external_id("fundref")),
+    "parents": ("list", _related("parent")),
+    "children": ("list", _related("child")),
+    "related": ("list", _related("related")),
+    "predecessors": ("list", _related("predecessor")),
+    "successors": ("list", _related("successor")),
+    "created": ("date", lambda i: i.admin.created.date),
+    "last_modified": ("date", lambda i: i.admin.last_modified.date),
+}
+
+
+def flatten(
+    institution: Institution, fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Flattens an institution into the columns of :data:`COLUMNS`.
+
+    Args:
+        institution (Institution): The institution.
+        fields (Optional[Sequence[str]]): The columns to include, in order.
+            Defaults to all columns.
+
+    Returns:
+        Dict[str, Any]: The column values. Multi-valued columns are lists.
+
+    Raises:
+        ValueError: If a field is not a known column.
+    """
+    fields = _check_columns(fields)
+    return {field: COLUMNS[field][1](institution) for field in fields}
+
+
+def _check_columns(fields: Optional[Sequence[str]]) -> List[str]:
+    """Returns the requested flat columns, raising on unknown names."""
+    if fields is None:
+        return list(COLUMNS)
+    unknown = [field for field in fields if field not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return list(fields)
+
+
+class Exporter(ABC):
+    """
+    Writes institutions to a file in chunks, so memory use does not grow with the
+    number of institutions.
+
+    Use an exporter as a context manager, or call :meth:`close` when done, to
+    write the last chunk. ``None`` values, as returned for unknown IDs, are
+    skipped.
+    """
+
+    binary = False
+
+    def __init__(
+        self,
+        target: Target,
+        fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> None:
+        """
+        Initializes the exporter.
+
+        Args:
+            target (Target): A path, or a file opened in the right mode. Paths
+                ending in ``.gz`` are gzip compressed.
+            fields (Optional[Sequence[str]]): The fields to write, see the
+                format for which fields exist. Defaults to all.
+            chunk_size (int): The number of institutions buffered per write.
+
+        Raises:
+            ValueError: If chunk_size is below 1.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.fields = fields
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._buffer: List[Institution] = []
+        self._owns_file = not hasattr(target, "write")
+        self._file = self._open(Path(target)) if self._owns_file else target
+
+    def _open(self, path: Path) -> IO:
+        """Opens a path for writing."""
+        opener = gzip.open if path.suffix == ".gz" else open
+        if self.binary:
+            return opener(path, "wb")
+        return opener(path, "wt", encoding="utf-8", newline="")
+
+    def __enter__(self) -> "Exporter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, institution: Optional[Institution]) -> None:
+        """Adds an institution, writing the buffer once it holds a full chunk."""
+        if institution is None:
+            return
+        self._buffer.append(institution)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def write_all(self, institutions: Iterable[Optional[Institution]]) -> int:
+        """
+        Writes every institution of an iterable.
+
+        Args:
+            institutions (Iterable[Optional[Institution]]): The institutions.
+
+        Returns:
+            int: The number of institutions written so far.
+        """
+        for institution in institutions:
+            self.write(institution)
+        return self.count
+
+    async def write_all_async(
+        self,
+        institutions: Union[
+            AsyncIterable[Optional[Institution]], Iterable[Optional[Institution]]
+        ],
+    ) -> int:
+        """
+        Writes every institution of an async or regular iterable.
+
+        Args:
+            institutions: The institutions.
+
+        Returns:
+            int: The number of institutions written so far.
+        """
+        if not hasattr(institutions, "__aiter__"):
+            return self.write_all(institutions)
+        async for institution in institutions:
+            self.write(institution)
+        return self.count
+
+    def flush(self) -> None:
+        """Writes the buffered institutions."""
+        if self._buffer:
+            self._write_chunk(self._buffer)
+            self.count += len(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        """Writes the remaining institutions and closes a file opened by path."""
+        self.flush()
+        self._finish()
+        logger.debug(f"Exported {self.count} institutions")
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    @abstractmethod
+    def _write_chunk(self, institutions: List[Institution]) -> None:
+        """Writes a chunk of institutions."""
+
+    def _finish(self) -> None:
+        """Completes the file after the last chunk."""
+        # Nothing to do for formats without a footer
+        return
+
+
+class JSONLExporter(Exporter):
+    """
+    Writes one JSON record per line, in the schema of the ROR API.
+
+    ``fields`` selects top-level fields of :class:`Institution`, e.g.
+    ``["id", "names", "locations"]``.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> None:
+        """Initializes the exporter, see :class:`Exporter`."""
+        if fields is not None:
+            unknown = set(fields) - set(Institution.model_fields)
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        super().__init__(target, fields, chunk_size)
+        self._include = None if fields is None else set(fields)
+
+    def _write_chunk(self, institutions: List[Institution]) -> None:
+        self._file.write(
+            "".join(
+                institution.model_dump_json(include=self._include) + "\n"
+                for institution in institutions
+            )
+        )
+
+
+class CSVExporter(Exporter):
+    """
+    Writes the flat columns of :data:`COLUMNS` with a header row.
+
+    ``fields`` selects and orders the columns. Multi-valued columns are joined
+    with ``list_separator``.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+        list_separator: str = "|",
+    ) -> None:
+        """
+        Initializes the exporter, see :class:`Exporter`.
+
+        Args:
+            list_separator (str): Joins the values of multi-valued columns.
+        """
+        self.columns = _check_columns(fields)
+        super().__init__(target, fields, chunk_size)
+        self.list_separator = list_separator
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def _write_chunk(self, institutions: List[Institution]) -> None:
+        self._writer.writerows(
+            [self._cell(COLUMNS[column][1](institution)) for column in self.columns]
+            for institution in institutions
+        )
+
+    def _cell(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return self.list_separator.join(value)
+        if isinstance(value, date):
+            return value.isoformat()
+        return value
+
+
+class ParquetExporter(Exporter):
+    """
+    Writes the flat columns of :data:`COLUMNS` as a Parquet file, one row group
+    per chunk. Multi-valued columns are lists of strings.
+
+    Requires ``pyarrow``, which comes with the ``parquet`` extra.
+    """
+
+    binary = True
+
+    def __init__(
+        self,
+        target: Target,
+        fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 10000,
+        compression: str = "zstd",
+    ) -> None:
+        """
+        Initializes the exporter, see :class:`Exporter`.
+
+        Args:
+            compression (str): The Parquet compression codec.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow, install rorclient[parquet]"
+            ) from e
+
+        self.columns = _check_columns(fields)
+        types = {
+            "string": pyarrow.string(),
+            "int": pyarrow.int64(),
+            "float": pyarrow.float64(),
+            "list": pyarrow.list_(pyarrow.string()),
+            "date": pyarrow.date32(),
+        }
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema(
+            [(column, types[COLUMNS[column][0]]) for column in self.columns]
+        )
+        super().__init__(target, fields, chunk_size)
+        self._writer = pyarrow.parquet.ParquetWriter(
+            self._file, self._schema, compression=compression
+        )
+
+    def _write_chunk(self, institutions: List[Institution]) -> None:
+        arrays = [
+            self._pyarrow.array(
+                [COLUMNS[column][1](institution) for institution in institutions],
+                type=field.type,
+            )
+            for column, field in zip(self.columns, self._schema)
+        ]
+        self._writer.write_table(
+            self._pyarrow.Table.from_arrays(arrays, schema=self._schema)
+        )
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+_EXPORTERS = {
+    "jsonl": JSONLExporter,
+    "csv": CSVExporter,
+    "parquet": ParquetExporter,
+}
+
+
+def _exporter_for(
+    target: Target, format: Optional[str], fields, chunk_size: Optional[int]
+) -> Exporter:
+    """Creates the exporter for a format, guessing it from the path if omitted."""
+    if format is None:
+        if hasattr(target, "write"):
+            raise ValueError("Pass format when exporting to a file object")
+        suffixes = Path(target).suffixes
+        if suffixes and suffixes[-1] == ".gz":
+            suffixes = suffixes[:-1]
+        format = suffixes[-1].lstrip(".") if suffixes else ""
+    exporter = _EXPORTERS.get(format)
+    if exporter is None:
+        raise ValueError(
+            f"Unknown export format {format!r}, expected one of {', '.join(_EXPORTERS)}"
+        )
+    options = {} if chunk_size is None else {"chunk_size": chunk_size}
+    return exporter(target, fields, **options)
+
+
+def export(
+    institutions: Iterable[Optional[Institution]],
+    target: Target,
+    format: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Streams institutions to a JSON lines, CSV or Parquet file.
+
+    Args:
+        institutions (Iterable[Optional[Institution]]): The institutions, e.g. a
+            generator over a dump or the results of a bulk fetch. ``None`` values
+            are skipped.
+        target (Target): A path, or a file opened in the right mode.
+        format (Optional[str]): ``"jsonl"``, ``"csv"`` or ``"parquet"``. Guessed
+            from the file extension if omitted.
+        fields (Optional[Sequence[str]]): The fields to write, see the exporter
+            of the format.
+        chunk_size (Optional[int]): The number of institutions buffered per
+            write. Defaults to that of the exporter.
+
+    Returns:
+        int: The number of institutions written.
+
+    Raises:
+        ValueError: If the format or a field is unknown.
+    """
+    with _exporter_for(target, format, fields, chunk_size) as exporter:
+        exporter.write_all(institutions)
+    return exporter.count
+
+
+async def export_async(
+    institutions: Union[
+        AsyncIterable[Optional[Institution]], Iterable[Optional[Institution]]
+    ],
+    target: Target,
+    format: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Streams institutions from an async or regular iterable to a file.
+
+    See :func:`export` for the arguments.
+
+    Returns:
+        int: The number of institutions written.
+    """
+    with _exporter_for(target, format, fields, chunk_size) as exporter:
+        await exporter.write_all_async(institutions)
+    return exporter.count
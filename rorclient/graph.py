@@ -0,0 +1,363 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: In-memory relationship graph with precomputed hierarchy queries.
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from rorclient.dump import PathLike, iter_dump_records
+from rorclient.models import Institution
+
+RELATIONSHIP_TYPES = ("parent", "child", "related", "predecessor", "successor")
+
+
+def _strip_prefix(ror_id: str) -> str:
+    """Returns the bare ROR ID for a ROR URL."""
+    return str(ror_id).replace("https://ror.org/", "")
+
+
+def _csr(n: int, edges: Iterable[Tuple[int, int]]) -> Tuple[array, array]:
+    """Packs (source, target) edges into compressed offset and target arrays."""
+    buckets: List[List[int]] = [[] for _ in range(n)]
+    for source, target in edges:
+        buckets[source].append(target)
+
+    offsets = array("i", [0])
+    targets = array("i")
+    for bucket in buckets:
+        targets.extend(sorted(set(bucket)))
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+class RelationshipGraph:
+    """
+    A read-only graph of the relationships between ROR institutions.
+
+    ROR IDs are mapped to integer nodes, and the edges of every relationship type
+    are stored as compact offset/target arrays. The parent/child hierarchy is
+    additionally laid out as an Euler tour over each node's first parent, so that
+    subtree membership is a constant-time interval check. Institutions with more
+    than one parent are handled through their remaining parent edges, which are
+    followed explicitly.
+    """
+
+    def __init__(self, relationships: Dict[str, List[Tuple[str, str]]]) -> None:
+        """
+        Builds the graph from relationships grouped by source ROR ID.
+
+        Args:
+            relationships (Dict[str, List[Tuple[str, str]]]): For each ROR ID, its
+                ``(type, related ROR ID)`` pairs as listed in its record.
+        """
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+        for ror_id, related in relationships.items():
+            self._node(ror_id)
+            for _, related_id in related:
+                self._node(related_id)
+
+        n = len(self._ids)
+        typed_edges: Dict[str, List[Tuple[int, int]]] = {
+            rel_type: [] for rel_type in RELATIONSHIP_TYPES
+        }
+        hierarchy: Set[Tuple[int, int]] = set()
+        for ror_id, related in relationships.items():
+            source = self._index[ror_id]
+            for rel_type, related_id in related:
+                target = self._index[related_id]
+                typed_edges.setdefault(rel_type, []).append((source, target))
+                if rel_type == "parent":
+                    hierarchy.add((target, source))
+                elif rel_type == "child":
+                    hierarchy.add((source, target))
+
+        self._adjacency = {
+            rel_type: _csr(n, edges) for rel_type, edges in typed_edges.items()
+        }
+        self._children = _csr(n, hierarchy)
+        self._parents = _csr(n, ((child, parent) for parent, child in hierarchy))
+        self._build_euler_tour(n)
+
+    def _node(self, ror_id: str) -> int:
+        """Returns the integer node for a ROR ID, allocating one if needed."""
+        node = self._index.get(ror_id)
+        if node is None:
+            node = self._index[ror_id] = len(self._ids)
+            self._ids.append(ror_id)
+        return node
+
+    @staticmethod
+    def _slice(csr: Tuple[array, array], node: int) -> array:
+        """Returns the targets of a node in a compressed adjacency."""
+        offsets, targets = csr
+        return targets[offsets[node] : offsets[node + 1]]
+
+    def _build_euler_tour(self, n: int) -> None:
+        """Precomputes entry/exit times, roots and multi-parent reachability."""
+        self._tin = array("i", [-1]) * n
+        self._tout = array("i", [0]) * n
+        self._root = array("i", [0]) * n
+        self._order = array("i")
+
+        primary_children: List[List[int]] = [[] for _ in range(n)]
+        self._extra_children: Dict[int, List[int]] = {}
+        for node in range(n):
+            parents = self._slice(self._parents, node)
+            if parents:
+                primary_children[parents[0]].append(node)
+                for parent in parents[1:]:
+                    self._extra_children.setdefault(parent, []).append(node)
+
+        starts = [node for node in range(n) if not self._slice(self._parents, node)]
+        # Nodes left unvisited afterwards sit on a parent cycle; tour them as roots.
+        for start in starts + list(range(n)):
+            if self._tin[start] != -1:
+                continue
+            stack = [(start, False)]
+            while stack:
+                node, leaving = stack.pop()
+                if leaving:
+                    self._tout[node] = len(self._order)
+                    continue
+                if self._tin[node] != -1:
+                    continue
+                self._tin[node] = len(self._order)
+                self._root[node] = start
+                self._order.append(node)
+                stack.append((node, True))
+                stack.extend(
+                    (child, False)
+                    for child in reversed(primary_children[node])
+                    if self._tin[child] == -1
+                )
+
+        # Nodes below an institution with several parents can be reached through
+        # edges outside the tour, so interval checks alone are not conclusive.
+        self._multi_parent = array("b", [0]) * n
+        queue = deque(
+            node for node in range(n) if len(self._slice(self._parents, node)) > 1
+        )
+        while queue:
+            node = queue.popleft()
+            if self._multi_parent[node]:
+                continue
+            self._multi_parent[node] = 1
+            queue.extend(self._slice(self._children, node))
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "RelationshipGraph":
+        """
+        Builds a graph from raw ROR records without validating them.
+
+        Args:
+            records (Iterable[dict]): Raw organization records.
+
+        Returns:
+            RelationshipGraph: The graph.
+        """
+        return cls(
+            {
+                _strip_prefix(record["id"]): [
+                    (rel["type"].lower(), _strip_prefix(rel["id"]))
+                    for rel in record.get("relationships") or []
+                ]
+                for record in records
+            }
+        )
+
+    @classmethod
+    def from_institutions(
+        cls, institutions: Iterable[Institution]
+    ) -> "RelationshipGraph":
+        """
+        Builds a graph from Institution objects, e.g. cached records.
+
+        Args:
+            institutions (Iterable[Institution]): The institutions to include.
+
+        Returns:
+            RelationshipGraph: The graph.
+        """
+        return cls(
+            {
+                institution.id_without_prefix: [
+                    (rel.type.lower(), rel.id_without_prefix)
+                    for rel in institution.relationships
+                ]
+                for institution in institutions
+            }
+        )
+
+    @classmethod
+    def from_dump(cls, path: PathLike) -> "RelationshipGraph":
+        """
+        Builds a graph from a ROR data dump.
+
+        Args:
+            path (PathLike): Path to the dump file.
+
+        Returns:
+            RelationshipGraph: The graph.
+        """
+        return cls.from_records(iter_dump_records(path))
+
+    def __len__(self) -> int:
+        """Returns the number of nodes in the graph."""
+        return len(self._ids)
+
+    def __contains__(self, ror_id: str) -> bool:
+        """Checks whether a ROR ID is part of the graph."""
+        return _strip_prefix(ror_id) in self._index
+
+    def _lookup(self, ror_id: str) -> int:
+        """Returns the node for a ROR ID or URL."""
+        try:
+            return self._index[_strip_prefix(ror_id)]
+        except KeyError:
+            raise KeyError(f"Unknown ROR ID: {ror_id}") from None
+
+    def _names(self, nodes: Iterable[int]) -> List[str]:
+        """Maps nodes back to ROR IDs."""
+        return [self._ids[node] for node in nodes]
+
+    def related(self, ror_id: str, relationship_type: str) -> List[str]:
+        """
+        Returns the institutions listed under a relationship type in a record.
+
+        Args:
+            ror_id (str): The ROR ID of the institution.
+            relationship_type (str): E.g. parent, child, related, predecessor or
+                successor.
+
+        Returns:
+            List[str]: The related ROR IDs.
+        """
+        csr = self._adjacency.get(relationship_type.lower())
+        if csr is None:
+            return []
+        return self._names(self._slice(csr, self._lookup(ror_id)))
+
+    def parents(self, ror_id: str) -> List[str]:
+        """Returns the direct parents of an institution."""
+        return self._names(self._slice(self._parents, self._lookup(ror_id)))
+
+    def children(self, ror_id: str) -> List[str]:
+        """Returns the direct children of an institution."""
+        return self._names(self._slice(self._children, self._lookup(ror_id)))
+
+    def ancestors(self, ror_id: str) -> List[str]:
+        """
+        Returns all ancestors of an institution, nearest first.
+
+        Args:
+            ror_id (str): The ROR ID of the institution.
+
+        Returns:
+            List[str]: The ROR IDs of every parent, grandparent and so on.
+        """
+        start = self._lookup(ror_id)
+        seen = {start}
+        result = []
+        queue = deque([start])
+        while queue:
+            for parent in self._slice(self._parents, queue.popleft()):
+                if parent not in seen:
+                    seen.add(parent)
+                    result.append(parent)
+                    queue.append(parent)
+        return self._names(result)
+
+    def descendants(self, ror_id: str) -> List[str]:
+        """
+        Returns all descendants of an institution in depth-first order.
+
+        Args:
+            ror_id (str): The ROR ID of the institution.
+
+        Returns:
+            List[str]: The ROR IDs of every child, grandchild and so on.
+        """
+        start = self._lookup(ror_id)
+        seen = {start}
+        result = []
+        pending = [start]
+        while pending:
+            node = pending.pop()
+            for descendant in self._order[self._tin[node] + 1 : self._tout[node]]:
+                if descendant not in seen:
+                    seen.add(descendant)
+                    result.append(descendant)
+            if self._extra_children:
+                for member in [
+                    node,
+                    *self._order[self._tin[node] + 1 : self._tout[node]],
+                ]:
+                    for child in self._extra_children.get(member, ()):
+                        if child not in seen:
+                            seen.add(child)
+                            result.append(child)
+                            pending.append(child)
+        return self._names(result)
+
+    def is_descendant(self, ror_id: str, ancestor_id: str) -> bool:
+        """
+        Checks whether an institution lies below another in the hierarchy.
+
+        Args:
+            ror_id (str): The ROR ID of the candidate descendant.
+            ancestor_id (str): The ROR ID of the candidate ancestor.
+
+        Returns:
+            bool: True if ``ancestor_id`` is a (transitive) parent of ``ror_id``.
+        """
+        node = self._lookup(ror_id)
+        ancestor = self._lookup(ancestor_id)
+        if node == ancestor:
+            return False
+        if self._tin[ancestor] < self._tin[node] < self._tout[ancestor]:
+            return True
+        if not self._multi_parent[node]:
+            return False
+        return self._ids[ancestor] in self.ancestors(ror_id)
+
+    def root(self, ror_id: str) -> str:
+        """
+        Returns the top-level ancestor of an institution.
+
+        Institutions with several parents resolve through their first parent.
+
+        Args:
+            ror_id (str): The ROR ID of the institution.
+
+        Returns:
+            str: The ROR ID of the root, which is the institution itself if it has
+            no parents.
+        """
+        return self._ids[self._root[self._lookup(ror_id)]]
+
+    def siblings(self, ror_id: str) -> List[str]:
+        """
+        Returns the other children of an institution's parents.
+
+        Args:
+            ror_id (str): The ROR ID of the institution.
+
+        Returns:
+            List[str]: The ROR IDs of the siblings.
+        """
+        node = self._lookup(ror_id)
+        siblings: Dict[int, None] = {}
+        for parent in self._slice(self._parents, node):
+            for child in self._slice(self._children, parent):
+                if child != node:
+                    siblings[child] = None
+        return self._names(siblings)
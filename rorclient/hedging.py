@@ -0,0 +1,155 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Adaptive request hedging to cut tail latency.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Deque, Optional
+
+from rorclient.ratelimit import RateLimiter
+from rorclient.retry import RetryBudget
+
+
+@dataclass
+class HedgingStats:
+    """
+    Counters describing the requests hedged by a HedgingPolicy.
+
+    Attributes:
+        requests (int): Requests sent under the policy, not counting hedges.
+        hedged (int): Requests for which a hedge was sent.
+        hedge_wins (int): Hedges that answered before the original request.
+        delay (float): The current hedging delay, in seconds.
+    """
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    delay: float = 0.0
+
+
+class HedgingPolicy:
+    """
+    Decides when a slow request gets a duplicate.
+
+    A request that has not answered after :meth:`delay` seconds, the ``quantile``
+    of recently observed latencies, is sent again, and whichever response arrives
+    first is used. Hedges are paid for from a budget that every request adds
+    ``max_extra_load`` to, so hedging adds at most that fraction of extra requests.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        initial_delay: float = 0.5,
+        min_delay: float = 0.01,
+        max_delay: float = 5.0,
+        max_extra_load: float = 0.1,
+        window: int = 1000,
+        min_samples: int = 20,
+    ) -> None:
+        """
+        Initializes the policy.
+
+        Args:
+            quantile (float): Latency quantile after which a request is hedged.
+            initial_delay (float): The delay used until ``min_samples`` latencies
+                have been observed, in seconds.
+            min_delay (float): Lower bound of the delay, in seconds.
+            max_delay (float): Upper bound of the delay, in seconds.
+            max_extra_load (float): Hedges allowed per request.
+            window (int): Number of recent latencies the delay is computed from.
+            min_samples (int): Latencies needed before the delay adapts.
+
+        Raises:
+            ValueError: If quantile is not between 0 and 1.
+        """
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1")
+
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.budget = RetryBudget(ratio=max_extra_load, reserve=1.0)
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._delay = initial_delay
+        self._samples_since_update = 0
+        self._stats = HedgingStats()
+
+    def delay(self) -> float:
+        """Returns the seconds to wait for a response before hedging."""
+        return self._delay
+
+    def record_latency(self, seconds: float) -> None:
+        """
+        Records the latency of a completed request.
+
+        Args:
+            seconds (float): The time the request took.
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+            self._samples_since_update += 1
+            # Sorting the window is cheap but not free, so the delay is only
+            # recomputed every few samples.
+            if len(self._latencies) >= self.min_samples and (
+                self._samples_since_update >= max(1, self.min_samples // 2)
+            ):
+                ordered = sorted(self._latencies)
+                index = min(len(ordered) - 1, int(self.quantile * len(ordered)))
+                self._delay = min(self.max_delay, max(self.min_delay, ordered[index]))
+                self._samples_since_update = 0
+
+    def start_request(self) -> None:
+        """Records a new request, earning budget for future hedges."""
+        self.budget.record_request()
+        with self._lock:
+            self._stats.requests += 1
+
+    def try_hedge(self, rate_limiter: Optional[RateLimiter] = None) -> bool:
+        """
+        Claims budget for a hedge.
+
+        Args:
+            rate_limiter (Optional[RateLimiter]): The client's rate limiter. The
+                hedge also needs a token from it, and is skipped rather than
+                delayed if none is available right away.
+
+        Returns:
+            bool: False if hedging would exceed ``max_extra_load`` or the rate
+            limit.
+        """
+        if not self.budget.try_spend():
+            return False
+        if rate_limiter is not None and not rate_limiter.try_acquire():
+            self.budget.refund()
+            return False
+        with self._lock:
+            self._stats.hedged += 1
+        return True
+
+    def record_hedge_win(self) -> None:
+        """Records a hedge that answered before the original request."""
+        with self._lock:
+            self._stats.hedge_wins += 1
+
+    def stats(self) -> HedgingStats:
+        """
+        Returns a snapshot of the hedging counters.
+
+        Returns:
+            HedgingStats: The current counters and delay.
+        """
+        with self._lock:
+            return replace(self._stats, delay=self._delay)
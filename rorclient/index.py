@@ -0,0 +1,200 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Domain and URL index for resolving hosts to ROR IDs.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from rorclient.dump import PathLike, iter_dump_records
+from rorclient.models import Institution
+
+
+class DomainIndex:
+    """
+    An index mapping registered domains and website hosts to ROR IDs.
+
+    Hosts are stored by their full name with any leading ``www.`` removed. A lookup
+    probes the host and then each shorter label suffix, so the longest registered
+    suffix wins (``cs.ku.dk`` resolves through ``ku.dk``). Only ``website`` links
+    are indexed, since hosts such as ``en.wikipedia.org`` are shared by everyone,
+    and withdrawn records are skipped.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self._hosts: Dict[str, Tuple[str, ...]] = {}
+        self._hosts_by_id: Dict[str, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of indexed hosts."""
+        return len(self._hosts)
+
+    @classmethod
+    def from_institutions(cls, institutions: Iterable[Institution]) -> "DomainIndex":
+        """
+        Builds an index from Institution objects, e.g. cached records.
+
+        Args:
+            institutions (Iterable[Institution]): The institutions to index.
+
+        Returns:
+            DomainIndex: The populated index.
+        """
+        index = cls()
+        for institution in institutions:
+            index.add(institution)
+        return index
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "DomainIndex":
+        """
+        Builds an index from raw ROR records without validating them.
+
+        Args:
+            records (Iterable[dict]): Raw organization records.
+
+        Returns:
+            DomainIndex: The populated index.
+        """
+        index = cls()
+        for record in records:
+            index.add_record(record)
+        return index
+
+    @classmethod
+    def from_dump(cls, path: PathLike) -> "DomainIndex":
+        """
+        Builds an index from a ROR data dump.
+
+        Args:
+            path (PathLike): Path to the dump file.
+
+        Returns:
+            DomainIndex: The populated index.
+        """
+        return cls.from_records(iter_dump_records(path))
+
+    def add(self, institution: Institution) -> None:
+        """Adds the domains and website hosts of an institution to the index."""
+        if institution.status == "withdrawn":
+            return
+        self._add(
+            institution.id_without_prefix,
+            institution.domains,
+            [str(link.value) for link in institution.links if link.type == "website"],
+        )
+
+    def add_record(self, record: dict) -> None:
+        """Adds the domains and website hosts of a raw ROR record to the index."""
+        if record.get("status") == "withdrawn":
+            return
+        self._add(
+            str(record["id"]).replace("https://ror.org/", ""),
+            record.get("domains") or [],
+            [
+                link["value"]
+                for link in record.get("links") or []
+                if link.get("type") == "website"
+            ],
+        )
+
+    def _add(self, ror_id: str, domains: Iterable[str], urls: Iterable[str]) -> None:
+        """Registers a ROR ID under each of the given domains and URL hosts."""
+        hosts = {self._normalize_host(value) for value in [*domains, *urls]}
+        hosts.discard("")
+        for host in hosts:
+            ror_ids = self._hosts.get(host, ())
+            if ror_id not in ror_ids:
+                self._hosts[host] = ror_ids + (ror_id,)
+        self._hosts_by_id[ror_id] = tuple(
+            hosts.union(self._hosts_by_id.get(ror_id, ()))
+        )
+
+    def remove(self, ror_id: str) -> None:
+        """
+        Removes every host registered for a ROR ID.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+        """
+        ror_id = ror_id.replace("https://ror.org/", "")
+        for host in self._hosts_by_id.pop(ror_id, ()):
+            ror_ids = tuple(i for i in self._hosts.get(host, ()) if i != ror_id)
+            if ror_ids:
+                self._hosts[host] = ror_ids
+            else:
+                self._hosts.pop(host, None)
+
+    @staticmethod
+    def _normalize_host(value: str) -> str:
+        """Reduces an email address, URL or host name to a bare lower-case host."""
+        value = value.strip().lower()
+        if "@" in value and "://" not in value:
+            value = value.rsplit("@", 1)[1]
+        if "://" in value or "/" in value:
+            value = urlsplit(value if "://" in value else f"//{value}").hostname or ""
+        value = value.rstrip(".")
+        if value.startswith("www."):
+            value = value[4:]
+        return value
+
+    def match(self, value: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Finds the longest indexed suffix of the host in an email, URL or domain.
+
+        Args:
+            value (str): An email address, URL or host name.
+
+        Returns:
+            Optional[Tuple[str, List[str]]]: The matched suffix and its ROR IDs, or
+            None if no suffix of the host is indexed.
+        """
+        host = self._normalize_host(value)
+        while host:
+            ror_ids = self._hosts.get(host)
+            if ror_ids is not None:
+                return host, list(ror_ids)
+            _, _, host = host.partition(".")
+        return None
+
+    def lookup(self, value: str) -> List[str]:
+        """
+        Resolves an email address, URL or domain to ROR IDs.
+
+        Args:
+            value (str): An email address, URL or host name.
+
+        Returns:
+            List[str]: The ROR IDs registered for the longest matching suffix, or an
+            empty list if nothing matches.
+        """
+        match = self.match(value)
+        return match[1] if match else []
+
+    def lookup_many(self, values: Iterable[str]) -> List[List[str]]:
+        """
+        Resolves many email addresses, URLs or domains at once.
+
+        Repeated hosts are only resolved once.
+
+        Args:
+            values (Iterable[str]): Email addresses, URLs or host names.
+
+        Returns:
+            List[List[str]]: The ROR IDs for each input, in input order.
+        """
+        resolved: Dict[str, List[str]] = {}
+        results = []
+        for value in values:
+            host = self._normalize_host(value)
+            if host not in resolved:
+                resolved[host] = self.lookup(host)
+            results.append(list(resolved[host]))
+        return results
@@ -0,0 +1,210 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Parallel validation of raw ROR records on a process pool.
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from pydantic import ValidationError
+
+from rorclient.dump import PathLike, iter_dump_records
+from rorclient.models import Institution
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Chunks queued per worker, enough to keep workers busy without reading ahead
+# of a slow consumer
+_CHUNKS_PER_WORKER = 2
+
+
+def to_json(institution: Institution) -> bytes:
+    """
+    Serializes a validated institution as compact JSON.
+
+    This is the default transform of :func:`validate_records`. The bytes can be
+    written out as they are, or turned back into an object with
+    ``Institution.model_validate_json``.
+
+    Args:
+        institution (Institution): The institution.
+
+    Returns:
+        bytes: The institution as UTF-8 encoded JSON.
+    """
+    return institution.model_dump_json().encode()
+
+
+def _validate_chunk(
+    records: List[Union[dict, bytes]], transform: Callable[[Institution], T]
+) -> List[T]:
+    """Validates a chunk of records or JSON lines in a worker and transforms them."""
+    results = []
+    for record in records:
+        try:
+            if isinstance(record, bytes):
+                institution = Institution.model_validate_json(record)
+            else:
+                institution = Institution(**record)
+        except ValidationError as e:
+            if isinstance(record, bytes):
+                record = json.loads(record)
+            # Validation errors do not survive the trip back from the worker
+            raise ValueError(f"Invalid record {record.get('id')}: {e}") from None
+        results.append(transform(institution))
+    return results
+
+
+def _iter_lines(path: Path) -> Iterator[bytes]:
+    """Iterates over the non-empty lines of a, possibly gzip compressed, file."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as fh:
+        for line in fh:
+            if line.strip():
+                yield line
+
+
+def _chunks(
+    records: Iterable[Union[dict, bytes]], chunk_size: int
+) -> Iterator[List[Union[dict, bytes]]]:
+    """Splits records into lists of chunk_size."""
+    iterator = iter(records)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def validate_records(
+    records: Iterable[Union[dict, bytes]],
+    transform: Callable[[Institution], T] = to_json,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    ordered: bool = True,
+) -> Iterator[T]:
+    """
+    Validates raw records as institutions on all CPU cores.
+
+    The records are split into chunks that worker processes validate and pass
+    through ``transform``. Only the transformed results travel back, so the
+    default transform returns compact JSON rather than ``Institution`` objects,
+    which take longer to unpickle than to validate. Extracting the needed fields
+    in ``transform`` is faster still. Records are read as the workers need them,
+    so a generator of records is not loaded into memory at once.
+
+    Args:
+        records (Iterable[Union[dict, bytes]]): Raw organization records, e.g.
+            from :func:`rorclient.dump.iter_dump_records`, or their JSON.
+        transform (Callable[[Institution], T]): Applied to each institution in
+            the worker. Must be picklable, i.e. defined at module level.
+        workers (Optional[int]): The number of worker processes. Defaults to the
+            number of CPUs; with 1, records are validated in this process.
+        chunk_size (int): The number of records sent to a worker at a time.
+        ordered (bool): Yield results in the order of the records. Otherwise
+            chunks are yielded as soon as they are done.
+
+    Yields:
+        T: The transformed institutions.
+
+    Raises:
+        ValueError: If a record is not a valid institution, or if workers or
+            chunk_size is below 1.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    chunks = _chunks(records, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _validate_chunk(chunk, transform)
+        return
+
+    logger.debug(f"Validating records on {workers} worker processes")
+    max_pending = workers * _CHUNKS_PER_WORKER
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        if ordered:
+            queue: Deque[Future] = deque()
+            for chunk in chunks:
+                queue.append(executor.submit(_validate_chunk, chunk, transform))
+                if len(queue) >= max_pending:
+                    yield from queue.popleft().result()
+            while queue:
+                yield from queue.popleft().result()
+        else:
+            pending: Set[Future] = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_validate_chunk, chunk, transform))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in _as_done(pending):
+                yield from future.result()
+    finally:
+        # On an error or when the caller stops iterating, skip the rest
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _as_done(pending: Set[Future]) -> Iterator[Future]:
+    """Yields futures as they complete."""
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        yield from done
+
+
+def ingest_dump(
+    path: PathLike,
+    transform: Callable[[Institution], T] = to_json,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    ordered: bool = True,
+) -> Iterator[T]:
+    """
+    Validates every record of a ROR data dump on all CPU cores.
+
+    The lines of ``.jsonl`` dumps are decoded by the workers, which scales better
+    than reading records in this process. Other formats are decoded here first,
+    so converting a dump to JSON lines once pays off for repeated ingestion.
+    See :func:`validate_records` for the other arguments.
+
+    Args:
+        path (PathLike): Path to the dump file.
+
+    Yields:
+        T: The transformed institutions.
+    """
+    path = Path(path)
+    stem_suffix = Path(path.stem).suffix if path.suffix == ".gz" else path.suffix
+    if stem_suffix == ".jsonl":
+        records = _iter_lines(path)
+    else:
+        records = iter_dump_records(path)
+    return validate_records(records, transform, workers, chunk_size, ordered)
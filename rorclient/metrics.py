@@ -0,0 +1,242 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Client events and metrics with Prometheus text export.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+REQUEST_START = "request_start"
+REQUEST_END = "request_end"
+RETRY = "retry"
+CACHE_HIT = "cache_hit"
+CACHE_MISS = "cache_miss"
+SHARED_CACHE_HIT = "shared_cache_hit"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class ClientEvent:
+    """
+    Something that happened in a client, passed to every hook.
+
+    Attributes:
+        name (str): The event type, e.g. ``"request_end"``.
+        timestamp (float): Seconds since the epoch.
+        attributes (Dict[str, Any]): Details of the event. ``request_end`` has
+            ``url``, ``status`` (None on a transport error), ``error``,
+            ``duration`` and ``bytes``; ``retry`` has ``attempt``, ``delay`` and
+            ``error``; cache events have ``ror_id``, and ``cache_hit`` ``stale``.
+    """
+
+    name: str
+    timestamp: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+# A hook receives every event of the clients it is registered with
+Hook = Callable[[ClientEvent], None]
+
+
+class Histogram:
+    """A cumulative histogram with fixed bucket bounds, as Prometheus uses them."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initializes an empty histogram.
+
+        Args:
+            buckets (Sequence[float]): Upper bounds of the buckets, ascending.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Adds a value to the histogram."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Returns the ``le`` label and cumulative count of every bucket."""
+        result = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class ClientMetrics:
+    """
+    Counters and histograms fed by client events.
+
+    Pass an instance as ``metrics`` to any number of clients, and export the
+    aggregated values with :meth:`to_prometheus`, e.g. from a ``/metrics``
+    endpoint, or read them with :meth:`snapshot`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Initializes all metrics at zero.
+
+        Args:
+            buckets (Sequence[float]): Bucket bounds of the request duration
+                histogram, in seconds.
+        """
+        self._lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_stale_hits = 0
+        self.cache_misses = 0
+        self.shared_cache_hits = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.duration = Histogram(buckets)
+
+    def __call__(self, event: ClientEvent) -> None:
+        """Updates the metrics from an event."""
+        name = event.name
+        attributes = event.attributes
+        with self._lock:
+            if name == REQUEST_START:
+                self.in_flight += 1
+            elif name == REQUEST_END:
+                self.in_flight -= 1
+                if attributes["status"] is None:
+                    self.errors[attributes["error"]] += 1
+                else:
+                    self.requests[attributes["status"]] += 1
+                self.bytes_received += attributes["bytes"]
+                self.duration.observe(attributes["duration"])
+            elif name == RETRY:
+                self.retries += 1
+            elif name == CACHE_HIT:
+                if attributes.get("stale"):
+                    self.cache_stale_hits += 1
+                else:
+                    self.cache_hits += 1
+            elif name == CACHE_MISS:
+                self.cache_misses += 1
+            elif name == SHARED_CACHE_HIT:
+                self.shared_cache_hits += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the current values.
+
+        Returns:
+            Dict[str, Any]: The counters by name, with the request duration as its
+            count and sum.
+        """
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "errors": dict(self.errors),
+                "retries": self.retries,
+                "cache_hits": self.cache_hits,
+                "cache_stale_hits": self.cache_stale_hits,
+                "cache_misses": self.cache_misses,
+                "shared_cache_hits": self.shared_cache_hits,
+                "bytes_received": self.bytes_received,
+                "in_flight": self.in_flight,
+                "request_duration_count": self.duration.count,
+                "request_duration_sum": self.duration.sum,
+            }
+
+    def to_prometheus(self, prefix: str = "rorclient") -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+
+        Returns:
+            str: The metrics, ready to be served from a ``/metrics`` endpoint.
+        """
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                label_text = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{prefix}_{name}{suffix}{label_text} {value}")
+
+        with self._lock:
+            metric(
+                "requests_total",
+                "counter",
+                "Responses received from the ROR API by status code.",
+                [
+                    ("", (("status", status),), count)
+                    for status, count in sorted(self.requests.items())
+                ],
+            )
+            metric(
+                "request_errors_total",
+                "counter",
+                "Requests that failed without a response, by error type.",
+                [
+                    ("", (("error", error),), count)
+                    for error, count in sorted(self.errors.items())
+                ],
+            )
+            metric(
+                "request_duration_seconds",
+                "histogram",
+                "Time from sending a request to receiving the response.",
+                [
+                    *(
+                        ("_bucket", (("le", bound),), count)
+                        for bound, count in self.duration.cumulative()
+                    ),
+                    ("_sum", (), self.duration.sum),
+                    ("_count", (), self.duration.count),
+                ],
+            )
+            metric(
+                "retries_total",
+                "counter",
+                "Requests retried after a failure.",
+                [("", (), self.retries)],
+            )
+            metric(
+                "cache_lookups_total",
+                "counter",
+                "Institution cache lookups by result.",
+                [
+                    ("", (("result", "hit"),), self.cache_hits),
+                    ("", (("result", "stale"),), self.cache_stale_hits),
+                    ("", (("result", "miss"),), self.cache_misses),
+                    ("", (("result", "shared"),), self.shared_cache_hits),
+                ],
+            )
+            metric(
+                "response_bytes_total",
+                "counter",
+                "Bytes of response bodies received.",
+                [("", (), self.bytes_received)],
+            )
+            metric(
+                "requests_in_flight",
+                "gauge",
+                "Requests currently waiting for a response.",
+                [("", (), self.in_flight)],
+            )
+        return "\n".join(lines) + "\n"
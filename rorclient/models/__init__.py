@@ -9,13 +9,31 @@ Project: RORClient
 Description: Initialization file for the RORClient models package.
 """
 
-from .admin import Admin, AdminCreated, AdminLastModified
-from .external_id import ExternalId
-from .institution import Institution
-from .link import Link
-from .location import GeonamesDetails, Location
-from .name import Name
-from .relationship import Relationship
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .admin import Admin, AdminCreated, AdminLastModified
+    from .external_id import ExternalId
+    from .institution import Institution
+    from .link import Link
+    from .location import GeonamesDetails, Location
+    from .name import Name
+    from .relationship import Relationship
+
+# Models are imported on first access
+_LAZY_EXPORTS = {
+    "Admin": ".admin",
+    "AdminCreated": ".admin",
+    "AdminLastModified": ".admin",
+    "ExternalId": ".external_id",
+    "GeonamesDetails": ".location",
+    "Institution": ".institution",
+    "Link": ".link",
+    "Location": ".location",
+    "Name": ".name",
+    "Relationship": ".relationship",
+}
 
 __all__ = [
     "Admin",
@@ -29,3 +47,18 @@ __all__ = [
     "Name",
     "Relationship",
 ]
+
+
+def __getattr__(name: str):
+    """Imports an exported model on first access."""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Lists the exports, including those not imported yet."""
+    return sorted({*globals(), *__all__})
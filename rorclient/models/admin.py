@@ -11,7 +11,7 @@ Description: Pydantic models for administrative information in the ROR API.
 
 from datetime import date
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class AdminCreated(BaseModel):
@@ -23,6 +23,8 @@ class AdminCreated(BaseModel):
         schema_version (str): The schema version used when the record was created.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     date: date
     schema_version: str
 
@@ -36,6 +38,8 @@ class AdminLastModified(BaseModel):
         schema_version (str): The schema version used when the record was last modified.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     date: date
     schema_version: str
 
@@ -49,5 +53,7 @@ class Admin(BaseModel):
         last_modified (AdminLastModified): Metadata about the last modification of the record.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     created: AdminCreated
     last_modified: AdminLastModified
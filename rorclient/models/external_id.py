@@ -11,7 +11,7 @@ Description: Pydantic models for external IDs in the ROR API.
 
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ExternalId(BaseModel):
@@ -24,6 +24,8 @@ class ExternalId(BaseModel):
         type (str): The type of the external ID (e.g., fundref, grid, isni, wikidata).
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     all: List[str]
     preferred: Optional[str]
     type: str
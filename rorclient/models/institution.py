@@ -11,7 +11,7 @@ Description: Pydantic models for institutions in the ROR API.
 
 from typing import List, Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl
 
 from .admin import Admin
 from .external_id import ExternalId
@@ -39,6 +39,8 @@ class Institution(BaseModel):
         types (List[str]): The types of the institution (e.g., education, funder, healthcare, company, archive, nonprofit, government, facility, other).
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     admin: Admin
     domains: List[str]
     established: Optional[int]
@@ -62,3 +64,17 @@ class Institution(BaseModel):
         if self.id is not None:
             return str(self.id).replace("https://ror.org/", "")
         return ""
+
+    @property
+    def display_name(self) -> Optional[str]:
+        """
+        Returns the name ROR displays for the institution.
+
+        Returns:
+            Optional[str]: The ``ror_display`` name, or the first name if none is
+            marked, or None if the institution has no names.
+        """
+        for name in self.names:
+            if "ror_display" in name.types:
+                return name.value
+        return self.names[0].value if self.names else None
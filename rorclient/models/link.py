@@ -9,7 +9,7 @@ Project: RORClient
 Description: Pydantic models for links in the ROR API.
 """
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl
 
 
 class Link(BaseModel):
@@ -21,5 +21,7 @@ class Link(BaseModel):
         value (HttpUrl): The URL of the link.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     type: str
     value: HttpUrl
@@ -9,7 +9,7 @@ Project: RORClient
 Description: Pydantic models for locations in the ROR API.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class GeonamesDetails(BaseModel):
@@ -28,6 +28,8 @@ class GeonamesDetails(BaseModel):
         name (str): The name of the location.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     continent_code: str
     continent_name: str
     country_code: str
@@ -48,5 +50,7 @@ class Location(BaseModel):
         geonames_id (int): The Geonames ID of the location.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     geonames_details: GeonamesDetails
     geonames_id: int
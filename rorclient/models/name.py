@@ -11,7 +11,7 @@ Description: Pydantic models for names in the ROR API.
 
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Name(BaseModel):
@@ -24,6 +24,8 @@ class Name(BaseModel):
         value (str): The name value.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     lang: Optional[str]
     types: List[str]
     value: str
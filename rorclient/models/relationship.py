@@ -9,9 +9,12 @@ Project: RORClient
 Description: Pydantic models for relationships in the ROR API.
 """
 
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl
+
+if TYPE_CHECKING:
+    from .institution import Institution
 
 
 class Relationship(BaseModel):
@@ -24,10 +27,25 @@ class Relationship(BaseModel):
         id (HttpUrl): The ROR ID of the related organization.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     label: str
     type: str
     id: HttpUrl
-    record: Optional["Institution"] = None  # type: ignore
+    record: Optional["Institution"] = None
+
+    @classmethod
+    def model_rebuild(cls, **kwargs: Any) -> Optional[bool]:
+        """
+        Builds the schema, which happens on first use, resolving ``Institution``.
+
+        Institution refers back to Relationship, so it is only imported here,
+        into the module namespace the annotation is resolved in.
+        """
+        from .institution import Institution
+
+        globals()["Institution"] = Institution
+        return super().model_rebuild(**kwargs)
 
     @property
     def id_without_prefix(self) -> str:
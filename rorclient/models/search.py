@@ -11,7 +11,7 @@ Description: Pydantic models for search in the ROR API.
 
 from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from .institution import Institution
 
@@ -26,6 +26,8 @@ class Container(BaseModel):
         count (int): The number of items in this category.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     id: str
     title: str
     count: int
@@ -42,6 +44,8 @@ class Meta(BaseModel):
         statuses (List[Container]): A list of containers representing different statuses.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     types: List[Container]
     countries: List[Container]
     continents: List[Container]
@@ -58,6 +62,8 @@ class SearchResult(BaseModel):
         items (List[Institution]): A list of Institution objects representing the search results.
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     number_of_results: int
     time_taken: int
     items: List[Institution]
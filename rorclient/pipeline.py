@@ -0,0 +1,347 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Resumable resolution of affiliation strings with a sqlite checkpoint.
+"""
+
+import asyncio
+import logging
+import re
+import sqlite3
+import unicodedata
+from dataclasses import dataclass
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from rorclient.dump import PathLike
+
+if TYPE_CHECKING:
+    from rorclient.async_client import AsyncRORClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Keys looked up per query, below the default sqlite limit of bound variables
+_LOOKUP_SIZE = 500
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_affiliation(text: str) -> str:
+    """
+    Normalizes an affiliation string for deduplication.
+
+    Unicode compatibility characters are folded, case is folded, punctuation is
+    replaced by spaces and runs of whitespace are collapsed, so that e.g.
+    ``"Dept. of Physics,  University of Oslo"`` and ``"dept of physics university
+    of oslo"`` are resolved once.
+
+    Args:
+        text (str): The affiliation string.
+
+    Returns:
+        str: The normalized string, empty if nothing but punctuation was given.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """
+    The outcome of resolving an affiliation string.
+
+    Attributes:
+        ror_id (Optional[str]): The matched ROR ID, or None if nothing matched.
+        name (Optional[str]): The display name of the matched institution.
+        error (Optional[str]): Why the string could not be resolved. Failed
+            strings are not checkpointed, so they are retried on the next run.
+    """
+
+    ror_id: Optional[str] = None
+    name: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def matched(self) -> bool:
+        """Whether the string was resolved to an institution."""
+        return self.ror_id is not None
+
+
+Resolver = Callable[["AsyncRORClient", str], Awaitable[Resolution]]
+
+
+async def search_resolver(client: "AsyncRORClient", text: str) -> Resolution:
+    """
+    Resolves an affiliation string to the top search result.
+
+    This is the default resolver of :class:`AffiliationPipeline`.
+
+    Args:
+        client (AsyncRORClient): The client to search with.
+        text (str): The affiliation string.
+
+    Returns:
+        Resolution: The first institution found, or an empty resolution.
+    """
+    result = await client.search(text)
+    if result is None or not result.items:
+        return Resolution()
+    institution = result.items[0]
+    return Resolution(institution.id_without_prefix, institution.display_name)
+
+
+class Checkpoint:
+    """
+    A sqlite store of resolved affiliation strings.
+
+    Each normalized string is stored once with its resolution, so a run that is
+    interrupted and started again only resolves the strings it had not reached,
+    and later runs over overlapping inputs reuse earlier results. The store is
+    written in WAL mode and each :meth:`put_many` is one transaction, so a crash
+    loses at most the batch being resolved.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        """
+        Opens the store, creating it if it does not exist.
+
+        Args:
+            path (PathLike): Path to the sqlite database, or ``":memory:"``.
+        """
+        self.path = path
+        self._connection = sqlite3.connect(str(path))
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS resolutions "
+            "(key TEXT PRIMARY KEY, ror_id TEXT, name TEXT)"
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM resolutions").fetchone()[
+            0
+        ]
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.get_many([key]))
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Resolution]:
+        """
+        Looks up normalized strings.
+
+        Args:
+            keys (Iterable[str]): The normalized strings.
+
+        Returns:
+            Dict[str, Resolution]: The resolutions of the strings that are stored.
+        """
+        found: Dict[str, Resolution] = {}
+        iterator = iter(keys)
+        while batch := list(islice(iterator, _LOOKUP_SIZE)):
+            placeholders = ",".join("?" * len(batch))
+            rows = self._connection.execute(
+                "SELECT key, ror_id, name FROM resolutions "
+                f"WHERE key IN ({placeholders})",
+                batch,
+            )
+            for key, ror_id, name in rows:
+                found[key] = Resolution(ror_id, name)
+        return found
+
+    def put_many(self, resolutions: Dict[str, Resolution]) -> None:
+        """
+        Stores resolutions in one transaction, skipping failed ones.
+
+        Args:
+            resolutions (Dict[str, Resolution]): Resolutions by normalized string.
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO resolutions VALUES (?, ?, ?)",
+                (
+                    (key, resolution.ror_id, resolution.name)
+                    for key, resolution in resolutions.items()
+                    if resolution.error is None
+                ),
+            )
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._connection.close()
+
+
+@dataclass
+class PipelineStats:
+    """
+    Counts of a pipeline run.
+
+    Attributes:
+        rows (int): Rows yielded.
+        unique (int): Distinct normalized strings seen per batch, summed.
+        resumed (int): Strings answered from the checkpoint.
+        resolved (int): Strings resolved with the API in this run.
+        failed (int): Strings whose resolution raised an error.
+    """
+
+    rows: int = 0
+    unique: int = 0
+    resumed: int = 0
+    resolved: int = 0
+    failed: int = 0
+
+
+class AffiliationPipeline(Generic[T]):
+    """
+    Resolves affiliation strings in bulk, once per normalized string.
+
+    Rows are read in batches. The affiliation strings of a batch are normalized
+    and deduplicated, strings already in the checkpoint are looked up there, and
+    only the remaining unique strings are resolved, concurrently. Their results
+    are committed to the checkpoint before the rows of the batch are yielded, in
+    input order, with their resolution. Memory use is bounded by the batch size,
+    however many rows are streamed through.
+
+    Example:
+        async with AsyncRORClient() as client:
+            with Checkpoint("affiliations.db") as checkpoint:
+                pipeline = AffiliationPipeline(client, checkpoint)
+                async for row, resolution in pipeline.run(rows):
+                    ...
+    """
+
+    def __init__(
+        self,
+        client: "AsyncRORClient",
+        checkpoint: Union[Checkpoint, PathLike],
+        text: Optional[Callable[[T], str]] = None,
+        resolver: Resolver = search_resolver,
+        concurrency: int = 16,
+        batch_size: int = 10000,
+    ) -> None:
+        """
+        Initializes the pipeline.
+
+        Args:
+            client (AsyncRORClient): The client to resolve with.
+            checkpoint (Union[Checkpoint, PathLike]): The checkpoint store, or a
+                path to open one at, which :meth:`close` closes again.
+            text (Optional[Callable[[T], str]]): Gets the affiliation string of
+                a row. Defaults to the row itself.
+            resolver (Resolver): Resolves a string with the client. Defaults to
+                the top search result.
+            concurrency (int): The maximum number of resolutions in flight.
+            batch_size (int): The number of rows read per batch. Larger batches
+                deduplicate more and keep requests in flight for longer.
+
+        Raises:
+            ValueError: If concurrency or batch_size is below 1.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.client = client
+        self._owns_checkpoint = not isinstance(checkpoint, Checkpoint)
+        if self._owns_checkpoint:
+            checkpoint = Checkpoint(checkpoint)
+        self.checkpoint = checkpoint
+        self.text = text
+        self.resolver = resolver
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.stats = PipelineStats()
+
+    async def run(self, rows: Iterable[T]) -> AsyncIterator[Tuple[T, Resolution]]:
+        """
+        Resolves the affiliation string of each row.
+
+        Rows with an empty normalized string get an empty resolution without a
+        request.
+
+        Args:
+            rows (Iterable[T]): The rows, e.g. lines of a file.
+
+        Yields:
+            Tuple[T, Resolution]: Each row with its resolution, in input order.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        iterator = iter(rows)
+        while batch := list(islice(iterator, self.batch_size)):
+            keys = [normalize_affiliation(self._text(row)) for row in batch]
+            resolutions = await self._resolve_batch(batch, keys, semaphore)
+            for row, key in zip(batch, keys):
+                self.stats.rows += 1
+                yield row, resolutions.get(key, Resolution())
+
+    def close(self) -> None:
+        """Closes the checkpoint store, unless it was passed in."""
+        if self._owns_checkpoint:
+            self.checkpoint.close()
+
+    def _text(self, row: T) -> str:
+        return self.text(row) if self.text is not None else row  # type: ignore[return-value]
+
+    async def _resolve_batch(
+        self, batch: List[T], keys: List[str], semaphore: asyncio.Semaphore
+    ) -> Dict[str, Resolution]:
+        """Resolves the unique strings of a batch that are not checkpointed."""
+        # The first original spelling of each key is what gets searched for
+        unique: Dict[str, str] = {}
+        for row, key in zip(batch, keys):
+            if key and key not in unique:
+                unique[key] = self._text(row)
+        self.stats.unique += len(unique)
+
+        resolutions = self.checkpoint.get_many(unique)
+        self.stats.resumed += len(resolutions)
+        pending = [key for key in unique if key not in resolutions]
+        if not pending:
+            return resolutions
+
+        logger.debug(f"Resolving {len(pending)} affiliation strings")
+
+        async def resolve_one(key: str) -> Resolution:
+            async with semaphore:
+                try:
+                    return await self.resolver(self.client, unique[key])
+                except Exception as e:
+                    logger.warning(f"Could not resolve {unique[key]!r}: {e}")
+                    return Resolution(error=str(e) or type(e).__name__)
+
+        results = await asyncio.gather(*(resolve_one(key) for key in pending))
+        resolved = dict(zip(pending, results))
+        self.checkpoint.put_many(resolved)
+        failed = sum(1 for result in results if result.error is not None)
+        self.stats.failed += failed
+        self.stats.resolved += len(results) - failed
+        resolutions.update(resolved)
+        return resolutions
@@ -0,0 +1,316 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Opt-in timing of the stages of fetching institutions.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, ContextManager, Deque, Dict, Iterator, List, Optional
+
+CONNECT = "connect"
+TRANSFER = "transfer"
+DECODE = "decode"
+VALIDATE = "validate"
+PREFETCH = "prefetch"
+
+STAGES = (CONNECT, TRANSFER, DECODE, VALIDATE)
+
+_STAGE_ADVICE = {
+    CONNECT: "share one client or HTTP client so connections are reused",
+    TRANSFER: "fetch concurrently, cache results or use a local mirror",
+    DECODE: "use a shared cache or mirror to skip decoding repeated records",
+    VALIDATE: "cache institutions so records are not validated again",
+}
+
+# Trace events of httpcore that make up establishing a connection
+_CONNECT_EVENTS = {
+    "connection.connect_tcp",
+    "connection.connect_unix_socket",
+    "connection.start_tls",
+}
+
+_current_call: ContextVar[Optional["CallProfile"]] = ContextVar(
+    "rorclient_current_call", default=None
+)
+
+
+@dataclass
+class CallProfile:
+    """
+    The time one public client call spent in each stage.
+
+    Attributes:
+        label (str): The ROR ID or search term of the call.
+        stages (Dict[str, float]): Seconds per stage, including the stages of
+            related institutions fetched while prefetching. ``prefetch`` is the
+            wall-clock time spent prefetching and overlaps the other stages.
+        total (float): Wall-clock duration of the call in seconds.
+    """
+
+    label: str
+    stages: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+
+
+@dataclass
+class StageStats:
+    """
+    Accumulated time of one stage.
+
+    Attributes:
+        seconds (float): Total seconds spent in the stage.
+        count (int): The number of times the stage ran.
+    """
+
+    seconds: float = 0.0
+    count: int = 0
+
+    @property
+    def mean(self) -> float:
+        """Average seconds per run of the stage."""
+        return self.seconds / self.count if self.count else 0.0
+
+
+@dataclass
+class ProfileReport:
+    """
+    A summary of where a client spent its time.
+
+    Attributes:
+        calls (int): The number of profiled calls.
+        total (float): Wall-clock seconds of all profiled calls.
+        stages (Dict[str, StageStats]): Time per stage.
+        slowest (List[CallProfile]): The slowest recent calls.
+    """
+
+    calls: int
+    total: float
+    stages: Dict[str, StageStats]
+    slowest: List[CallProfile]
+
+    @property
+    def bottleneck(self) -> Optional[str]:
+        """The stage that took the most time, excluding prefetch."""
+        timed = [stage for stage in STAGES if self.stages[stage].seconds > 0]
+        if not timed:
+            return None
+        return max(timed, key=lambda stage: self.stages[stage].seconds)
+
+    def __str__(self) -> str:
+        """Renders the report as a table."""
+        staged = sum(self.stages[stage].seconds for stage in STAGES)
+        lines = [
+            f"{self.calls} calls, {self.total:.3f}s total",
+            f"{'stage':<10} {'total s':>10} {'count':>8} {'mean ms':>10} {'share':>7}",
+        ]
+        for stage in (*STAGES, PREFETCH):
+            stats = self.stages[stage]
+            share = (
+                f"{stats.seconds / staged:>7.1%}"
+                if stage != PREFETCH and staged
+                else f"{'':>7}"
+            )
+            lines.append(
+                f"{stage:<10} {stats.seconds:>10.3f} {stats.count:>8} "
+                f"{stats.mean * 1000:>10.2f} {share}"
+            )
+        bottleneck = self.bottleneck
+        if bottleneck is not None:
+            lines.append(
+                f"Most time is spent in {bottleneck}: {_STAGE_ADVICE[bottleneck]}."
+            )
+        return "\n".join(lines)
+
+
+class Profiler:
+    """
+    Accumulates stage timings for one client.
+
+    Stages are recorded per client and for the public call they belong to, so a
+    slow bulk job can be broken down into network, decoding and validation time.
+    """
+
+    def __init__(self, keep_calls: int = 1000) -> None:
+        """
+        Initializes an empty profile.
+
+        Args:
+            keep_calls (int): The number of recent call profiles to keep.
+        """
+        self._lock = threading.Lock()
+        self._stages = {stage: StageStats() for stage in (*STAGES, PREFETCH)}
+        self._calls: Deque[CallProfile] = deque(maxlen=keep_calls)
+        self._call_count = 0
+        self._total = 0.0
+
+    def add(self, stage: str, seconds: float) -> None:
+        """
+        Records time spent in a stage.
+
+        Args:
+            stage (str): The stage name.
+            seconds (float): The duration.
+        """
+        with self._lock:
+            stats = self._stages[stage]
+            stats.seconds += seconds
+            stats.count += 1
+        call = _current_call.get()
+        if call is not None:
+            call.stages[stage] = call.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Times the enclosed block as a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add_request(self, seconds: float, connect: float) -> None:
+        """
+        Records a request, splitting off the time spent opening a connection.
+
+        Args:
+            seconds (float): The duration of the whole request.
+            connect (float): The part of it spent on DNS, TCP and TLS setup.
+        """
+        if connect > 0:
+            self.add(CONNECT, connect)
+        self.add(TRANSFER, seconds - connect)
+
+    @contextmanager
+    def call(self, label: str) -> Iterator[CallProfile]:
+        """
+        Collects the stages of the enclosed block into a new call profile.
+
+        Calls made inside another profiled call, such as relationship prefetches,
+        are added to the outer call instead.
+        """
+        current = _current_call.get()
+        if current is not None:
+            yield current
+            return
+        profile = CallProfile(label)
+        token = _current_call.set(profile)
+        start = time.perf_counter()
+        try:
+            yield profile
+        finally:
+            profile.total = time.perf_counter() - start
+            _current_call.reset(token)
+            with self._lock:
+                self._calls.append(profile)
+                self._call_count += 1
+                self._total += profile.total
+
+    @property
+    def calls(self) -> List[CallProfile]:
+        """The most recent call profiles, oldest first."""
+        with self._lock:
+            return list(self._calls)
+
+    def report(self, slowest: int = 5) -> ProfileReport:
+        """
+        Summarizes the recorded timings.
+
+        Args:
+            slowest (int): The number of slowest recent calls to include.
+
+        Returns:
+            ProfileReport: The summary.
+        """
+        with self._lock:
+            stages = {
+                name: StageStats(stats.seconds, stats.count)
+                for name, stats in self._stages.items()
+            }
+            calls = sorted(self._calls, key=lambda call: call.total, reverse=True)
+            return ProfileReport(self._call_count, self._total, stages, calls[:slowest])
+
+    def reset(self) -> None:
+        """Discards all recorded timings."""
+        with self._lock:
+            self._stages = {stage: StageStats() for stage in (*STAGES, PREFETCH)}
+            self._calls.clear()
+            self._call_count = 0
+            self._total = 0.0
+
+
+class RequestTrace:
+    """
+    Collects connection setup time from the httpx ``trace`` extension.
+
+    Pass :meth:`sync_callback` or :meth:`async_callback` as
+    ``extensions={"trace": ...}`` depending on the client.
+    """
+
+    def __init__(self) -> None:
+        self.connect = 0.0
+        self._started: Dict[str, float] = {}
+
+    def sync_callback(self, name: str, info: dict) -> None:
+        """Records a trace event from a sync client."""
+        event, _, phase = name.rpartition(".")
+        if event not in _CONNECT_EVENTS:
+            return
+        if phase == "started":
+            self._started[event] = time.perf_counter()
+        elif event in self._started:
+            self.connect += time.perf_counter() - self._started.pop(event)
+
+    async def async_callback(self, name: str, info: dict) -> None:
+        """Records a trace event from an async client."""
+        self.sync_callback(name, info)
+
+
+def stage(profiler: Optional[Profiler], name: str) -> ContextManager:
+    """Times a block as a stage if profiling is enabled, otherwise does nothing."""
+    return nullcontext() if profiler is None else profiler.stage(name)
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Decorator for client methods that profiles each call separately.
+
+    The first argument after ``self``, passed by position or by name, labels
+    the call, and the client's ``profiler`` attribute decides whether the call
+    is profiled.
+    """
+    label_name = list(inspect.signature(func).parameters)[1]
+
+    def label(args: tuple, kwargs: dict) -> str:
+        return str(args[0] if args else kwargs.get(label_name))
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return await func(self, *args, **kwargs)
+            with self.profiler.call(label(args, kwargs)):
+                return await func(self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return func(self, *args, **kwargs)
+        with self.profiler.call(label(args, kwargs)):
+            return func(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,258 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Token-bucket rate limiter that paces requests to the ROR API.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Optional
+
+from rorclient.dump import PathLike
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_MAGIC = b"RORRATE1"
+# Magic, available tokens, time of the last update
+_STATE = struct.Struct("<8sdd")
+
+
+@dataclass
+class RateLimiterStats:
+    """
+    Counters describing the waits imposed by a RateLimiter.
+
+    Attributes:
+        requests (int): Requests that passed the limiter.
+        delayed (int): Requests that had to wait for a token.
+        total_wait (float): Seconds spent waiting, summed over all requests.
+        max_wait (float): The longest single wait, in seconds.
+    """
+
+    requests: int = 0
+    delayed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        """The average wait per request, in seconds."""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class RateLimiter:
+    """
+    A token bucket pacing requests before they are sent.
+
+    The bucket holds up to ``burst`` tokens and refills at ``rate`` tokens per
+    second. Each request takes one token; when none is left the request waits
+    until one is due. Tokens are reserved in arrival order, so waiting requests
+    are served first come, first served. One limiter can be shared by any number
+    of sync and async clients, which then draw from the same budget.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float): Requests per second.
+            burst (Optional[int]): The number of requests that can be sent at once
+                after a quiet period. Defaults to one second worth of requests.
+            clock (Callable[[], float]): Time source, in seconds.
+
+        Raises:
+            ValueError: If rate or burst is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        burst = max(1, int(rate)) if burst is None else burst
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._stats = RateLimiterStats()
+
+    def _take(self, now: float, blocking: bool = True) -> Optional[float]:
+        """
+        Takes a token, returning the seconds until it may be used.
+
+        The token count may go negative; the debt is what later callers wait for.
+        With ``blocking`` False no debt is taken on: if no token is available now,
+        none is taken and None is returned. Must be called with the lock held.
+        """
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if not blocking and self._tokens < 1:
+            return None
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+    def reserve(self) -> float:
+        """
+        Takes a token without waiting for it.
+
+        Returns:
+            float: The seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            wait = self._take(self._clock())
+            self._stats.requests += 1
+            if wait > 0:
+                self._stats.delayed += 1
+                self._stats.total_wait += wait
+                self._stats.max_wait = max(self._stats.max_wait, wait)
+        return wait
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a token only if one is available right away.
+
+        Meant for optional requests, such as hedges, that are better skipped than
+        delayed.
+
+        Returns:
+            bool: Whether a token was taken.
+        """
+        with self._lock:
+            taken = self._take(self._clock(), blocking=False) is not None
+            if taken:
+                self._stats.requests += 1
+        return taken
+
+    def acquire(self) -> float:
+        """
+        Blocks until a request may be sent.
+
+        Returns:
+            float: The seconds waited.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Waits without blocking the event loop until a request may be sent.
+
+        Returns:
+            float: The seconds waited.
+        """
+        # Imported here so the sync client does not load asyncio
+        import asyncio
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> RateLimiterStats:
+        """
+        Returns a snapshot of the wait counters.
+
+        Returns:
+            RateLimiterStats: The current counters.
+        """
+        with self._lock:
+            return replace(self._stats)
+
+
+class HostRateLimiter(RateLimiter):
+    """
+    A token bucket shared by every process on a host.
+
+    The bucket state lives in a small memory-mapped file and is updated under an
+    exclusive file lock, so all clients in all processes that open the same path
+    draw from one budget, e.g. the rate limit of a shared egress IP. Processes
+    should use the same ``rate`` and ``burst``. Wait statistics are kept per
+    process. Requires ``fcntl``, i.e. a Unix-like system.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        rate: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Opens the shared bucket, creating it full if the file does not exist.
+
+        Args:
+            path (PathLike): Path to the bucket file, e.g. in ``/dev/shm`` or a
+                temporary directory.
+            rate (float): Requests per second for the whole host.
+            burst (Optional[int]): The number of requests that can be sent at once
+                after a quiet period. Defaults to one second worth of requests.
+            clock (Callable[[], float]): Time source shared by all processes, in
+                seconds.
+
+        Raises:
+            ValueError: If rate or burst is not positive, or the file is not a
+                rate limiter file.
+            RuntimeError: If file locking is not available on this platform.
+        """
+        if fcntl is None:
+            raise RuntimeError("HostRateLimiter requires fcntl file locking")
+        super().__init__(rate, burst, clock)
+        self.path = path
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size < _STATE.size:
+                    os.ftruncate(self._fd, _STATE.size)
+                    os.pwrite(
+                        self._fd, _STATE.pack(_MAGIC, float(self.burst), clock()), 0
+                    )
+                self._mapped = mmap.mmap(self._fd, _STATE.size)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+        if _STATE.unpack_from(self._mapped, 0)[0] != _MAGIC:
+            self.close()
+            raise ValueError(f"Not a rate limiter file: {path}")
+
+    def _take(self, now: float, blocking: bool = True) -> Optional[float]:
+        """Takes a token from the shared bucket under the file lock."""
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            _, self._tokens, self._updated = _STATE.unpack_from(self._mapped, 0)
+            # Clocks of different processes may disagree slightly
+            wait = super()._take(max(now, self._updated), blocking)
+            _STATE.pack_into(self._mapped, 0, _MAGIC, self._tokens, self._updated)
+            return wait
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Unmaps and closes the bucket file."""
+        self._mapped.close()
+        os.close(self._fd)
@@ -0,0 +1,357 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Retry policy with Retry-After support, full jitter and a retry budget.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Iterable, Optional
+
+import httpx
+
+from rorclient.config import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+# Called with the exception, the number of attempts so far and the delay
+OnRetry = Callable[[Exception, int, float], None]
+
+
+class RetryableStatusError(ValueError):
+    """Raised for a response whose status code the retry policy retries."""
+
+    def __init__(self, response: httpx.Response) -> None:
+        """Initializes the error from the response that caused it."""
+        super().__init__(f"Got {response.status_code} from ROR")
+        self.response = response
+
+
+class RetryBudget:
+    """
+    A token bucket limiting retries to a fraction of all requests.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so that
+    during an outage retries add at most ``ratio`` extra load on top of a small
+    ``reserve`` that lets occasional failures be retried at low traffic.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0) -> None:
+        """
+        Initializes a full budget.
+
+        Args:
+            ratio (float): Retries allowed per request.
+            reserve (float): The maximum number of tokens that can be saved up.
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = reserve
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Deposits the tokens earned by one request."""
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Withdraws the token for one retry.
+
+        Returns:
+            bool: False if the budget is exhausted and the retry must not be made.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def refund(self) -> None:
+        """Returns the token of a retry that was not made after all."""
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + 1)
+
+    @property
+    def tokens(self) -> float:
+        """The number of retries currently available."""
+        return self._tokens
+
+
+class RetryPolicy:
+    """
+    Decides whether and when failed requests are retried.
+
+    Transport errors and responses with one of ``retry_statuses`` are retried with
+    exponential backoff and full jitter. A ``Retry-After`` header sets the minimum
+    delay. Retries stop after ``max_retries`` attempts or ``max_retry_time``
+    seconds (both default to the values in ``config``), or when the retry budget
+    is exhausted. A single policy, and so a single budget, can be shared by any
+    number of clients.
+    """
+
+    def __init__(
+        self,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        max_retries: Optional[int] = None,
+        max_retry_time: Optional[float] = None,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        """
+        Initializes the policy.
+
+        Args:
+            retry_statuses (Iterable[int]): Status codes that are retried.
+            max_retries (Optional[int]): Maximum number of attempts, including the
+                first, so 0 or 1 disables retries. Defaults to
+                ``config.max_retries``.
+            max_retry_time (Optional[float]): Maximum seconds to keep retrying.
+                Defaults to ``config.max_retry_time``.
+            base_delay (float): The backoff ceiling for the first retry, in seconds.
+            max_delay (float): The largest backoff ceiling, in seconds.
+            budget (Optional[RetryBudget]): The retry budget. A new one is created
+                if omitted.
+        """
+        self.retry_statuses = frozenset(retry_statuses)
+        self._max_retries = max_retries
+        self._max_retry_time = max_retry_time
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget if budget is not None else RetryBudget()
+
+    @property
+    def max_retries(self) -> int:
+        """The maximum number of attempts."""
+        if self._max_retries is None:
+            return config.max_retries
+        return self._max_retries
+
+    @property
+    def max_retry_time(self) -> float:
+        """The maximum number of seconds to keep retrying."""
+        if self._max_retry_time is None:
+            return config.max_retry_time
+        return self._max_retry_time
+
+    def check_response(self, response: httpx.Response) -> None:
+        """
+        Raises for responses that should be retried.
+
+        Args:
+            response (httpx.Response): The response to check.
+
+        Raises:
+            RetryableStatusError: If the status code is one of ``retry_statuses``.
+        """
+        if response.status_code in self.retry_statuses:
+            raise RetryableStatusError(response)
+
+    @staticmethod
+    def _retry_after(exc: Exception) -> Optional[float]:
+        """Returns the delay requested by a Retry-After header, if any."""
+        if not isinstance(exc, RetryableStatusError):
+            return None
+
+        value = exc.response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _is_retryable(self, exc: Exception) -> bool:
+        """Checks whether an exception is worth retrying."""
+        return isinstance(
+            exc, (RetryableStatusError, httpx.RequestError, httpx.HTTPStatusError)
+        )
+
+    def next_delay(
+        self, exc: Exception, attempt: int, elapsed: float
+    ) -> Optional[float]:
+        """
+        Computes the delay before the next attempt.
+
+        Args:
+            exc (Exception): The exception raised by the last attempt.
+            attempt (int): The number of attempts made so far.
+            elapsed (float): Seconds since the first attempt.
+
+        Returns:
+            Optional[float]: The delay in seconds, or None to give up.
+        """
+        if not self._is_retryable(exc) or attempt >= self.max_retries:
+            return None
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        retry_after = self._retry_after(exc)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if elapsed + delay > self.max_retry_time:
+            return None
+        if not self.budget.try_spend():
+            logger.warning("Retry budget exhausted, not retrying")
+            return None
+        return delay
+
+    def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Calls a function, retrying it according to the policy.
+
+        Args:
+            func (Callable): The function to call.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        return self.run(func, args, kwargs)
+
+    async def call_async(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Awaits a coroutine function, retrying it according to the policy.
+
+        Args:
+            func (Callable): The coroutine function to call.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        return await self.run_async(func, args, kwargs)
+
+    def run(
+        self,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        on_retry: Optional[OnRetry] = None,
+    ) -> Any:
+        """
+        Calls a function, retrying it and reporting each retry to ``on_retry``.
+
+        Args:
+            func (Callable): The function to call.
+            args (tuple): Positional arguments for the function.
+            kwargs (dict): Keyword arguments for the function.
+            on_retry (Optional[OnRetry]): Called with the exception, the number of
+                attempts so far and the delay before every retry.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        self.budget.record_request()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self.next_delay(e, attempt, time.monotonic() - start)
+                if delay is None:
+                    raise
+                logger.warning(f"Backing off {delay:.2f} seconds after {attempt} tries")
+                if on_retry is not None:
+                    on_retry(e, attempt, delay)
+                time.sleep(delay)
+
+    async def run_async(
+        self,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        on_retry: Optional[OnRetry] = None,
+    ) -> Any:
+        """
+        Awaits a coroutine function, retrying it and reporting each retry.
+
+        Args:
+            func (Callable): The coroutine function to call.
+            args (tuple): Positional arguments for the function.
+            kwargs (dict): Keyword arguments for the function.
+            on_retry (Optional[OnRetry]): Called with the exception, the number of
+                attempts so far and the delay before every retry.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        self.budget.record_request()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                delay = self.next_delay(e, attempt, time.monotonic() - start)
+                if delay is None:
+                    raise
+                logger.warning(f"Backing off {delay:.2f} seconds after {attempt} tries")
+                if on_retry is not None:
+                    on_retry(e, attempt, delay)
+                await _sleep_async(delay)
+
+
+async def _sleep_async(seconds: float) -> None:
+    """Sleeps without blocking the event loop."""
+    # Imported here so the sync client does not load asyncio
+    import asyncio
+
+    await asyncio.sleep(seconds)
+
+
+default_retry_policy = RetryPolicy()
+
+
+def retry_with_policy(func: Callable) -> Callable:
+    """
+    Decorates a client method to retry it with the client's ``retry_policy``.
+
+    Retries are reported to the client's ``_on_retry``.
+
+    Args:
+        func (Callable): A sync or async client method.
+
+    Returns:
+        Callable: The wrapped method.
+    """
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            return await self.retry_policy.run_async(
+                func, (self, *args), kwargs, self._on_retry
+            )
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        return self.retry_policy.run(func, (self, *args), kwargs, self._on_retry)
+
+    return wrapper
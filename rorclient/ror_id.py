@@ -0,0 +1,162 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: ROR ID normalisation and checksum validation.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# ROR IDs are a leading zero, six Crockford base32 characters and a two digit
+# ISO 7064 MOD 97-10 checksum of the base32 part.
+CROCKFORD_ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+
+_ror_id_pattern = re.compile(
+    r"(?:(?:https?://)?(?:www\.)?ror\.org/)?(0[0-9a-hjkmnp-tv-z]{6})([0-9]{2})"
+)
+# Maps Crockford digits onto the digits int(..., 32) understands.
+_to_base32 = str.maketrans(CROCKFORD_ALPHABET, "0123456789abcdefghijklmnopqrstuv")
+
+
+def ror_id_checksum(body: str) -> str:
+    """
+    Computes the checksum of the first seven characters of a ROR ID.
+
+    Args:
+        body (str): The ROR ID without its trailing checksum, e.g. ``"03yrm5c"``.
+
+    Returns:
+        str: The two digit checksum, e.g. ``"26"``.
+    """
+    value = int(body.translate(_to_base32), 32)
+    return f"{98 - (value * 100) % 97:02d}"
+
+
+def _normalize(value: str) -> Tuple[Optional[str], Optional[str]]:
+    """Normalizes a single value, returning the ROR ID or the reason it is invalid."""
+    if not isinstance(value, str) or not value:
+        return None, "empty"
+
+    match = _ror_id_pattern.fullmatch(value.strip().lower())
+    if not match:
+        return None, "malformed"
+
+    body, checksum = match.groups()
+    if ror_id_checksum(body) != checksum:
+        return None, "checksum mismatch"
+    return body + checksum, None
+
+
+def normalize_ror_id(value: str) -> Optional[str]:
+    """
+    Normalizes a ROR URL or ID to its bare lower-case form.
+
+    Args:
+        value (str): A ROR ID or URL in any case.
+
+    Returns:
+        Optional[str]: The bare ROR ID, or None if the value is malformed or its
+        checksum does not match.
+    """
+    return _normalize(value)[0]
+
+
+@dataclass
+class InvalidRORId:
+    """
+    An input that could not be normalized to a ROR ID.
+
+    Attributes:
+        position (int): The index of the value in the input.
+        value (str): The value as given.
+        reason (str): Why the value was rejected: empty, malformed or checksum
+            mismatch.
+    """
+
+    position: int
+    value: str
+    reason: str
+
+
+@dataclass
+class NormalizedRORIds:
+    """
+    The result of normalizing a batch of ROR IDs.
+
+    Attributes:
+        ids (List[str]): The distinct valid ROR IDs, in order of first appearance.
+        positions (List[int]): For each input, the index of its ROR ID in ``ids``,
+            or -1 if the input was invalid.
+        invalid (List[InvalidRORId]): The rejected inputs.
+    """
+
+    ids: List[str] = field(default_factory=list)
+    positions: List[int] = field(default_factory=list)
+    invalid: List[InvalidRORId] = field(default_factory=list)
+
+    def expand(self, results: List) -> List:
+        """
+        Fans results for ``ids`` back out to the original input positions.
+
+        Args:
+            results (List): One result per entry in ``ids``.
+
+        Returns:
+            List: One result per input, with None for invalid inputs.
+        """
+        return [results[slot] if slot >= 0 else None for slot in self.positions]
+
+
+def normalize_ror_ids(values: Iterable[str]) -> NormalizedRORIds:
+    """
+    Normalizes, validates and deduplicates a batch of ROR IDs without raising.
+
+    Accepts bare IDs and ``ror.org`` URLs in any case. Each distinct input string is
+    only parsed once, and each distinct ROR ID only has its checksum computed once.
+
+    Args:
+        values (Iterable[str]): ROR IDs or URLs.
+
+    Returns:
+        NormalizedRORIds: The distinct IDs, the mapping back to input positions and
+        the invalid entries.
+    """
+    result = NormalizedRORIds()
+    ids, positions, invalid = result.ids, result.positions, result.invalid
+    fullmatch = _ror_id_pattern.fullmatch
+    # Both map to a slot in ids, or to the reason the value is invalid
+    by_ror_id: Dict[str, Union[int, str]] = {}
+    by_value: Dict[str, Union[int, str]] = {}
+
+    for position, value in enumerate(values):
+        slot = by_value.get(value)
+        if slot is None:
+            match = fullmatch(value.strip().lower()) if isinstance(value, str) else None
+            if match is None:
+                slot = "malformed" if value else "empty"
+            else:
+                body, checksum = match.groups()
+                ror_id = body + checksum
+                slot = by_ror_id.get(ror_id)
+                if slot is None:
+                    if ror_id_checksum(body) == checksum:
+                        slot = len(ids)
+                        ids.append(ror_id)
+                    else:
+                        slot = "checksum mismatch"
+                    by_ror_id[ror_id] = slot
+            by_value[value] = slot
+
+        if slot.__class__ is int:
+            positions.append(slot)
+        else:
+            positions.append(-1)
+            invalid.append(InvalidRORId(position, value, slot))
+
+    return result
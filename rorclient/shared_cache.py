@@ -0,0 +1,247 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Read-only institution cache shared between processes through mmap.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from rorclient.dump import PathLike
+from rorclient.models import Institution
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"RORSHC01"
+# Magic, number of records, offset of the record data
+_HEADER = struct.Struct("<8sIQ")
+# ROR ID, offset and length of the record relative to the data section
+_ENTRY = struct.Struct("<16sQI")
+_KEY_SIZE = 16
+
+
+def encode_record(record: Union[dict, Institution]) -> Tuple[bytes, bytes]:
+    """
+    Encodes a record as it is stored in a shared cache file.
+
+    Args:
+        record (Union[dict, Institution]): A raw record or an Institution.
+
+    Returns:
+        Tuple[bytes, bytes]: The index key, the ROR ID padded with null bytes,
+        and the record as compact JSON.
+    """
+    if isinstance(record, Institution):
+        record = record.model_dump(mode="json")
+    ror_id = str(record["id"]).replace("https://ror.org/", "").lower()
+    data = json.dumps(
+        record, separators=(",", ":"), ensure_ascii=False, sort_keys=True
+    ).encode("utf-8")
+    return ror_id.encode("ascii")[:_KEY_SIZE].ljust(_KEY_SIZE, b"\0"), data
+
+
+class SharedInstitutionCache:
+    """
+    A read-only cache of institution records in a memory-mapped file.
+
+    One process writes the file with :meth:`build`, and every worker process opens
+    it with ``SharedInstitutionCache(path)``. The operating system shares the
+    mapped pages between processes, so memory use per host does not grow with the
+    number of workers. The file holds a sorted fixed-width index followed by the
+    records as compact JSON; lookups binary-search the index and only decode the
+    requested record.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        """
+        Opens a shared cache file.
+
+        Args:
+            path (PathLike): Path to a file written with :meth:`build`.
+
+        Raises:
+            ValueError: If the file is not a shared cache file.
+        """
+        self.path = Path(path)
+        self._state = self._open()
+
+    def _open(self) -> Tuple[mmap.mmap, int, int, Tuple[int, int]]:
+        """Maps the file and validates its header."""
+        with open(self.path, "rb") as fh:
+            signature = os.fstat(fh.fileno())
+            if signature.st_size < _HEADER.size:
+                raise ValueError(f"Not a shared cache file: {self.path}")
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, data_offset = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or data_offset > len(mapped):
+            mapped.close()
+            raise ValueError(f"Not a shared cache file: {self.path}")
+        return mapped, count, data_offset, (signature.st_ino, signature.st_mtime_ns)
+
+    @classmethod
+    def build(
+        cls, path: PathLike, records: Iterable[Union[dict, Institution]]
+    ) -> "SharedInstitutionCache":
+        """
+        Writes a shared cache file and opens it.
+
+        The file is replaced atomically, so processes that still have the previous
+        version mapped keep reading it until they call :meth:`reload`.
+
+        Args:
+            path (PathLike): Destination path.
+            records (Iterable[Union[dict, Institution]]): Raw records, e.g. from a
+                dump, or Institution objects.
+
+        Returns:
+            SharedInstitutionCache: The opened cache.
+        """
+        return cls.write(path, dict(encode_record(record) for record in records))
+
+    @classmethod
+    def write(
+        cls, path: PathLike, encoded: Dict[bytes, bytes]
+    ) -> "SharedInstitutionCache":
+        """
+        Writes records that are already encoded and opens the file.
+
+        Like :meth:`build`, but records read from another file with
+        :meth:`iter_raw` are written without decoding them again.
+
+        Args:
+            path (PathLike): Destination path.
+            encoded (Dict[bytes, bytes]): Records by index key, as returned by
+                :func:`encode_record`.
+
+        Returns:
+            SharedInstitutionCache: The opened cache.
+        """
+        keys = sorted(encoded)
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as fh:
+            data_offset = _HEADER.size + _ENTRY.size * len(keys)
+            fh.write(_HEADER.pack(_MAGIC, len(keys), data_offset))
+            offset = 0
+            for key in keys:
+                fh.write(_ENTRY.pack(key, offset, len(encoded[key])))
+                offset += len(encoded[key])
+            for key in keys:
+                fh.write(encoded[key])
+        os.replace(tmp_path, path)
+
+        logger.debug(f"Wrote {len(keys)} records to shared cache {path}")
+        return cls(path)
+
+    def reload(self) -> bool:
+        """
+        Maps the file again if it was replaced since it was opened.
+
+        Returns:
+            bool: True if a new version of the file was loaded.
+        """
+        stat = os.stat(self.path)
+        if (stat.st_ino, stat.st_mtime_ns) == self._state[3]:
+            return False
+        # The previous mapping is left to the garbage collector, since other
+        # threads may still be reading from it.
+        self._state = self._open()
+        return True
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._state[0].close()
+
+    def __len__(self) -> int:
+        """Returns the number of records in the cache."""
+        return self._state[1]
+
+    def __contains__(self, ror_id: str) -> bool:
+        """Checks whether the cache holds a ROR ID."""
+        return self.get_raw(ror_id) is not None
+
+    def get_raw(self, ror_id: str) -> Optional[bytes]:
+        """
+        Returns the JSON encoded record for a ROR ID.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+
+        Returns:
+            Optional[bytes]: The record as compact JSON, or None if not cached.
+        """
+        mapped, count, data_offset, _ = self._state
+        key = (
+            ror_id.replace("https://ror.org/", "")
+            .lower()
+            .encode("ascii", "ignore")[:_KEY_SIZE]
+            .ljust(_KEY_SIZE, b"\0")
+        )
+
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            position = _HEADER.size + middle * _ENTRY.size
+            candidate = mapped[position : position + _KEY_SIZE]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                _, offset, length = _ENTRY.unpack_from(mapped, position)
+                start = data_offset + offset
+                return mapped[start : start + length]
+        return None
+
+    def get_record(self, ror_id: str) -> Optional[dict]:
+        """
+        Returns the raw record for a ROR ID.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+
+        Returns:
+            Optional[dict]: The record as returned by the ROR API, or None.
+        """
+        data = self.get_raw(ror_id)
+        return None if data is None else json.loads(data)
+
+    def get(self, ror_id: str) -> Optional[Institution]:
+        """
+        Returns the institution for a ROR ID.
+
+        Args:
+            ror_id (str): The ROR ID or URL.
+
+        Returns:
+            Optional[Institution]: The institution, or None if not cached.
+        """
+        data = self.get_raw(ror_id)
+        return None if data is None else Institution.model_validate_json(data)
+
+    def iter_raw(self) -> Iterator[Tuple[bytes, bytes]]:
+        """Iterates over the padded index keys and JSON encoded records in key order."""
+        mapped, count, data_offset, _ = self._state
+        for i in range(count):
+            key, offset, length = _ENTRY.unpack_from(
+                mapped, _HEADER.size + i * _ENTRY.size
+            )
+            start = data_offset + offset
+            yield key, mapped[start : start + length]
+
+    def records(self) -> Iterator[dict]:
+        """Iterates over all raw records, e.g. to build an index from them."""
+        for _, data in self.iter_raw():
+            yield json.loads(data)
@@ -0,0 +1,173 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Incremental synchronisation of a local ROR mirror.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from rorclient.dump import PathLike
+from rorclient.index import DomainIndex
+from rorclient.models import Institution
+from rorclient.shared_cache import SharedInstitutionCache, encode_record
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncResult:
+    """
+    The changes applied by a mirror sync.
+
+    Attributes:
+        inserted (List[str]): ROR IDs that were not in the mirror before.
+        updated (List[str]): ROR IDs whose record changed.
+        withdrawn (List[str]): ROR IDs whose status changed to withdrawn.
+        deleted (List[str]): ROR IDs missing from a full dump, removed from the mirror.
+        unchanged (int): The number of records that were left as they were.
+        relationships_changed (bool): Whether any relationships changed, in which
+            case a RelationshipGraph built from the mirror should be rebuilt.
+    """
+
+    inserted: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    withdrawn: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    relationships_changed: bool = False
+
+    @property
+    def changed_ids(self) -> List[str]:
+        """All ROR IDs affected by the sync."""
+        return [*self.inserted, *self.updated, *self.withdrawn, *self.deleted]
+
+
+def _last_modified(record: dict) -> str:
+    """Returns the ISO last modified date of a raw record, or an empty string."""
+    return str(((record.get("admin") or {}).get("last_modified") or {}).get("date", ""))
+
+
+def _same_record(old: dict, new: dict) -> bool:
+    """Checks whether two encodings describe the same record after validation."""
+    try:
+        return Institution(**old) == Institution(**new)
+    except ValueError:
+        return False
+
+
+def sync_mirror(
+    path: PathLike,
+    records: Iterable[Union[dict, Institution]],
+    change_feed: Optional[PathLike] = None,
+    domain_index: Optional[DomainIndex] = None,
+    partial: bool = False,
+) -> SyncResult:
+    """
+    Brings a mirror (a SharedInstitutionCache file) up to date with new data.
+
+    Records are compared with the mirror by their encoded bytes first, and by
+    ``admin.last_modified.date`` when the bytes differ; only changed records are
+    decoded. Input older than the mirror is ignored. The mirror file is only
+    rewritten when something changed.
+
+    Args:
+        path (PathLike): Path to the mirror file. It is created if missing.
+        records (Iterable[Union[dict, Institution]]): Records from a new dump, or
+            institutions fetched from the API.
+        change_feed (Optional[PathLike]): JSON lines file to append one entry per
+            affected ROR ID to, e.g. for downstream cache invalidation.
+        domain_index (Optional[DomainIndex]): An index to update in place.
+        partial (bool): Whether the records are only a subset of the registry, e.g.
+            API data. Otherwise records missing from the input are deleted.
+
+    Returns:
+        SyncResult: The applied changes.
+    """
+    path = Path(path)
+    mirror = SharedInstitutionCache(path) if path.exists() else None
+    new_records: Dict[bytes, bytes] = (
+        dict(mirror.iter_raw()) if mirror is not None and partial else {}
+    )
+    result = SyncResult()
+    changes = []
+
+    for record in records:
+        key, data = encode_record(record)
+        ror_id = key.rstrip(b"\0").decode("ascii")
+        old_data = mirror.get_raw(ror_id) if mirror is not None else None
+
+        if old_data == data:
+            new_records[key] = data
+            result.unchanged += 1
+            continue
+
+        new = json.loads(data)
+        if old_data is None:
+            change = "insert"
+            result.inserted.append(ror_id)
+            result.relationships_changed |= bool(new.get("relationships"))
+        else:
+            old = json.loads(old_data)
+            if _last_modified(new) < _last_modified(old) or (
+                _last_modified(new) == _last_modified(old) and _same_record(old, new)
+            ):
+                # Older input, or the same record encoded differently
+                new_records[key] = old_data
+                result.unchanged += 1
+                continue
+            if new.get("status") == "withdrawn" and old.get("status") != "withdrawn":
+                change = "withdraw"
+                result.withdrawn.append(ror_id)
+            else:
+                change = "update"
+                result.updated.append(ror_id)
+            result.relationships_changed |= old.get("relationships") != new.get(
+                "relationships"
+            )
+
+        new_records[key] = data
+        changes.append(
+            {"id": ror_id, "change": change, "last_modified": _last_modified(new)}
+        )
+        if domain_index is not None:
+            domain_index.remove(ror_id)
+            domain_index.add_record(new)
+
+    if mirror is not None and not partial:
+        for key, _ in mirror.iter_raw():
+            if key in new_records:
+                continue
+            ror_id = key.rstrip(b"\0").decode("ascii")
+            result.deleted.append(ror_id)
+            result.relationships_changed = True
+            changes.append({"id": ror_id, "change": "delete", "last_modified": None})
+            if domain_index is not None:
+                domain_index.remove(ror_id)
+
+    if mirror is not None:
+        mirror.close()
+    if changes or mirror is None:
+        SharedInstitutionCache.write(path, new_records).close()
+
+    if change_feed is not None and changes:
+        synced_at = datetime.now(timezone.utc).isoformat()
+        with open(change_feed, "a", encoding="utf-8") as fh:
+            for change in changes:
+                fh.write(json.dumps({**change, "synced_at": synced_at}) + "\n")
+
+    logger.info(
+        f"Synced mirror {path}: {len(result.inserted)} inserted, "
+        f"{len(result.updated)} updated, {len(result.withdrawn)} withdrawn, "
+        f"{len(result.deleted)} deleted, {result.unchanged} unchanged"
+    )
+    return result
@@ -0,0 +1,400 @@
+"""
+Copyright (c) 2025 ADernild
+
+Licensed under the MIT License. See LICENSE file in the project root for full license information.
+
+Author: ADernild
+Email: alex@dernild.dk
+Project: RORClient
+Description: Fake ROR API with latency, rate limits and faults for offline testing.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import httpx
+
+from rorclient.dump import PathLike, iter_dump_records
+from rorclient.ror_id import ror_id_checksum
+
+PAGE_SIZE = 20
+
+# The API also accepts full ROR URLs in place of the ID
+_ORGANIZATION_PATH = re.compile(r"(?:^|/)organizations/(?:https?:/+ror\.org/)?([^/]+)$")
+_SEARCH_PATH = re.compile(r"(?:^|/)organizations$")
+
+# A latency distribution draws a delay in seconds from a random generator
+Latency = Callable[[random.Random], float]
+
+
+def constant_latency(seconds: float) -> Latency:
+    """Returns a latency distribution that always waits ``seconds``."""
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> Latency:
+    """Returns a latency distribution uniform between ``low`` and ``high`` seconds."""
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> Latency:
+    """
+    Returns a long-tailed latency distribution, like that of a real API.
+
+    Args:
+        median (float): The median delay in seconds.
+        sigma (float): The spread; 0.5 puts the 99th percentile at about 3.2 times
+            the median.
+    """
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+
+def generate_records(count: int, fan_out: int = 2) -> List[dict]:
+    """
+    Generates valid organization records for tests and benchmarks.
+
+    Args:
+        count (int): The number of records.
+        fan_out (int): The number of following records each record is related to,
+            which gives prefetching a graph of any depth to walk.
+
+    Returns:
+        List[dict]: Records in the format of the ROR API, with valid ROR IDs.
+    """
+    ror_ids = []
+    for i in range(count):
+        body = f"0{i:06d}"
+        ror_ids.append(body + ror_id_checksum(body))
+
+    return [
+        {
+            "admin": {
+                "created": {"date": "2018-11-14", "schema_version": "1.0"},
+                "last_modified": {"date": "2024-12-11", "schema_version": "2.1"},
+            },
+            "domains": [f"{ror_id}.example.org"],
+            "established": 1998,
+            "external_ids": [
+                {"type": "grid", "preferred": None, "all": [f"grid.{ror_id}.1"]},
+                {"type": "wikidata", "preferred": None, "all": ["Q1234567"]},
+            ],
+            "id": f"https://ror.org/{ror_id}",
+            "links": [{"type": "website", "value": f"https://{ror_id}.example.org"}],
+            "locations": [
+                {
+                    "geonames_id": 2615876,
+                    "geonames_details": {
+                        "continent_code": "EU",
+                        "continent_name": "Europe",
+                        "country_code": "DK",
+                        "country_name": "Denmark",
+                        "country_subdivision_code": "83",
+                        "country_subdivision_name": "South Denmark",
+                        "lat": 55.39594,
+                        "lng": 10.38831,
+                        "name": "Odense",
+                    },
+                }
+            ],
+            "names": [
+                {
+                    "lang": "en",
+                    "types": ["ror_display", "label"],
+                    "value": f"Organization {i}",
+                },
+                {"lang": None, "types": ["acronym"], "value": f"ORG{i}"},
+            ],
+            "relationships": [
+                {
+                    "label": f"Organization {(i + j) % count}",
+                    "type": "related",
+                    "id": f"https://ror.org/{ror_ids[(i + j) % count]}",
+                }
+                for j in range(1, fan_out + 1)
+                if count > 1
+            ],
+            "status": "active",
+            "types": ["education"],
+        }
+        for i, ror_id in enumerate(ror_ids)
+    ]
+
+
+class FakeRORServer:
+    """
+    An in-memory stand-in for the ROR API.
+
+    It answers ``organizations/{id}`` and ``organizations?query=`` (also
+    ``query.advanced`` and ``page``) from the given records, and can inject the
+    failures of a struggling API: latency drawn from a distribution, a per-client
+    rate limit answered with 429 and ``Retry-After``, random 5xx errors and
+    timeouts. Clients are told apart by an ``X-Client-ID`` header, falling back
+    to a single shared client.
+
+    The server can be used through :meth:`transport` or :meth:`async_transport`
+    without any networking, or served as an ASGI application, e.g. with uvicorn.
+    """
+
+    def __init__(
+        self,
+        records: Optional[Iterable[dict]] = None,
+        latency: Optional[Latency] = None,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (500, 502, 503),
+        timeout_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initializes the server.
+
+        Args:
+            records (Optional[Iterable[dict]]): Organization records to serve.
+                Defaults to 100 generated records.
+            latency (Optional[Latency]): Distribution of the delay before each
+                response, e.g. :func:`lognormal_latency`.
+            rate_limit (Optional[float]): Requests per second allowed per client.
+            burst (Optional[int]): Requests a client can make at once. Defaults to
+                one second worth of requests.
+            error_rate (float): Fraction of requests answered with one of
+                ``error_statuses``.
+            error_statuses (Tuple[int, ...]): Status codes for injected errors.
+            timeout_rate (float): Fraction of requests that raise a read timeout
+                in the transports, after the latency has passed.
+            seed (Optional[int]): Seed for the random generator, for reproducible
+                fault sequences.
+        """
+        if records is None:
+            records = generate_records(100)
+        self.records: Dict[str, dict] = {
+            str(record["id"]).replace("https://ror.org/", "").lower(): record
+            for record in records
+        }
+        self._encoded = {
+            ror_id: json.dumps(record).encode("utf-8")
+            for ror_id, record in self.records.items()
+        }
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else max(1, int(rate_limit or 1))
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.timeout_rate = timeout_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self.status_counts: Counter = Counter()
+
+    @classmethod
+    def from_dump(cls, path: PathLike, **kwargs) -> "FakeRORServer":
+        """
+        Creates a server answering with the records of a ROR data dump.
+
+        Args:
+            path (PathLike): Path to the dump file.
+            **kwargs: Further arguments for the server.
+
+        Returns:
+            FakeRORServer: The server.
+        """
+        return cls(iter_dump_records(path), **kwargs)
+
+    @property
+    def requests(self) -> int:
+        """The number of requests handled."""
+        return sum(self.status_counts.values())
+
+    def _allow(self, client_id: str) -> Optional[float]:
+        """Takes a token for a client, or returns the seconds to wait for one."""
+        if self.rate_limit is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(client_id, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate_limit)
+            if tokens < 1:
+                self._buckets[client_id] = (tokens, now)
+                return (1 - tokens) / self.rate_limit
+            self._buckets[client_id] = (tokens - 1, now)
+            return None
+
+    def handle(
+        self, path: str, query: str, client_id: str = ""
+    ) -> Tuple[float, bool, int, Dict[str, str], bytes]:
+        """
+        Computes the response to a GET request.
+
+        Args:
+            path (str): The request path.
+            query (str): The query string.
+            client_id (str): The client the rate limit applies to.
+
+        Returns:
+            Tuple[float, bool, int, Dict[str, str], bytes]: The delay before
+            answering, whether the request times out, and the status, headers and
+            body of the response.
+        """
+        with self._lock:
+            delay = self.latency(self._rng) if self.latency is not None else 0.0
+            roll = self._rng.random()
+            timeout = self._rng.random() < self.timeout_rate
+            error_status = self._rng.choice(self.error_statuses)
+
+        headers = {"Content-Type": "application/json"}
+        retry_after = self._allow(client_id)
+        if retry_after is not None:
+            status = 429
+            headers["Retry-After"] = str(math.ceil(retry_after))
+            body = b'{"errors": ["Rate limit exceeded"]}'
+        elif roll < self.error_rate:
+            status = error_status
+            body = b'{"errors": ["Injected error"]}'
+        else:
+            status, body = self._route(path, query)
+
+        with self._lock:
+            self.status_counts[status] += 1
+        return delay, timeout, status, headers, body
+
+    def _route(self, path: str, query: str) -> Tuple[int, bytes]:
+        """Answers a request from the records."""
+        path = path.rstrip("/")
+        match = _ORGANIZATION_PATH.search(path)
+        if match:
+            body = self._encoded.get(match.group(1).lower())
+            if body is None:
+                return 404, b'{"errors": ["ROR ID does not exist"]}'
+            return 200, body
+
+        if _SEARCH_PATH.search(path):
+            params = parse_qs(query)
+            term = (params.get("query") or params.get("query.advanced") or [""])[0]
+            try:
+                page = int(params.get("page", ["1"])[0])
+            except ValueError:
+                return 400, b'{"errors": ["Invalid page"]}'
+            matches = [
+                record
+                for record in self.records.values()
+                if any(
+                    term.lower() in name["value"].lower()
+                    for name in record.get("names", [])
+                )
+            ]
+            start = (page - 1) * PAGE_SIZE
+            result = {
+                "number_of_results": len(matches),
+                "time_taken": 1,
+                "items": matches[start : start + PAGE_SIZE],
+                "meta": {
+                    "types": [],
+                    "countries": [],
+                    "continents": [],
+                    "statuses": [],
+                },
+            }
+            return 200, json.dumps(result).encode("utf-8")
+
+        return 404, b'{"errors": ["Not found"]}'
+
+    def _handle_request(
+        self, request: httpx.Request
+    ) -> Tuple[float, bool, httpx.Response]:
+        """Computes the delay, timeout and response for an httpx request."""
+        delay, timeout, status, headers, body = self.handle(
+            request.url.path,
+            request.url.query.decode("ascii"),
+            request.headers.get("X-Client-ID", ""),
+        )
+        return delay, timeout, httpx.Response(status, headers=headers, content=body)
+
+    def transport(self) -> httpx.BaseTransport:
+        """
+        Returns a transport for ``RORClient(transport=...)``.
+
+        Returns:
+            httpx.BaseTransport: A transport answering from this server.
+        """
+        return _FakeTransport(self)
+
+    def async_transport(self) -> httpx.AsyncBaseTransport:
+        """
+        Returns a transport for ``AsyncRORClient(transport=...)``.
+
+        Returns:
+            httpx.AsyncBaseTransport: A transport answering from this server.
+        """
+        return _AsyncFakeTransport(self)
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Serves the fake API as an ASGI application."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        headers = dict(scope.get("headers") or [])
+        client_id = headers.get(b"x-client-id", b"").decode("latin-1")
+        if not client_id and scope.get("client"):
+            client_id = scope["client"][0]
+        delay, _, status, response_headers, body = self.handle(
+            scope["path"], scope.get("query_string", b"").decode("latin-1"), client_id
+        )
+        if delay:
+            await asyncio.sleep(delay)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in response_headers.items()
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class _FakeTransport(httpx.BaseTransport):
+    """Sync httpx transport answering from a FakeRORServer."""
+
+    def __init__(self, server: FakeRORServer) -> None:
+        self.server = server
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay, timeout, response = self.server._handle_request(request)
+        if delay:
+            time.sleep(delay)
+        if timeout:
+            raise httpx.ReadTimeout("Injected timeout", request=request)
+        return response
+
+
+class _AsyncFakeTransport(httpx.AsyncBaseTransport):
+    """Async httpx transport answering from a FakeRORServer."""
+
+    def __init__(self, server: FakeRORServer) -> None:
+        self.server = server
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay, timeout, response = self.server._handle_request(request)
+        if delay:
+            await asyncio.sleep(delay)
+        if timeout:
+            raise httpx.ReadTimeout("Injected timeout", request=request)
+        return response
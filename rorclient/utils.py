@@ -9,40 +9,36 @@ Project: RORClient
 Description: Utility functions for the RORClient package.
 """
 
-import logging
 from functools import wraps
+from inspect import iscoroutinefunction
 
-import backoff
-import httpx
-
-from rorclient.config import config
-
-logger = logging.getLogger(__name__)
+from rorclient.retry import default_retry_policy
 
 
 def retry_with_backoff():
     """
-    A custom decorator that wraps backoff.on_exception with logging.
+    A decorator that retries the wrapped function with the default retry policy.
 
-    Args:
-        max_time (int): The maximum amount of time to retry in seconds.
+    Clients retry through their own ``retry_policy``; this decorator is kept for
+    functions outside the clients.
 
     Returns:
-        A decorator that can be applied to functions to add retry logic with backoff.
+        A decorator that can be applied to sync or async functions to add retry
+        logic with backoff.
     """
 
     def decorator(func):
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await default_retry_policy.call_async(func, *args, **kwargs)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            return backoff.on_exception(
-                backoff.expo,
-                (httpx.RequestError, httpx.HTTPStatusError),
-                max_tries=config.max_retries,
-                max_time=config.max_retry_time,
-                on_backoff=lambda details: logger.warning(
-                    f"Backing off {details.get('wait', 'unknown')} seconds after {details.get('tries', 'unknown')} tries"
-                ),
-            )(func)(*args, **kwargs)
+            return default_retry_policy.call(func, *args, **kwargs)
 
         return wrapper
 
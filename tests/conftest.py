@@ -15,6 +15,39 @@ from rorclient.models import (
     Name,
     Relationship,
 )
+from rorclient.ror_id import ror_id_checksum
+from rorclient.testing import generate_records
+
+
+class FakeClock:
+    """A clock that only moves when ``now`` is set."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def records():
+    return generate_records(50)
+
+
+@pytest.fixture
+def ror_ids(records):
+    return [record["id"].replace("https://ror.org/", "") for record in records]
+
+
+@pytest.fixture
+def unknown_ror_id():
+    """A valid ROR ID that is not among the generated records."""
+    return "0999999" + ror_id_checksum("0999999")
 
 
 @pytest.fixture
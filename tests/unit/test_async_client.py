@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
@@ -20,7 +20,7 @@ async def test_get_institution_success(
     valid_institution_data,
 ):
     mock_response = httpx.Response(200)
-    mock_response.json = AsyncMock(return_value=valid_institution_data_dict)
+    mock_response.json = MagicMock(return_value=valid_institution_data_dict)
 
     with patch("httpx.AsyncClient.get", return_value=mock_response) as mock_get:
         institution = await async_ror_client.get_institution("01cwqze88")
@@ -51,7 +51,7 @@ async def test_get_multiple_institutions_success(
     valid_institution_data_dict,
 ):
     mock_response = httpx.Response(200)
-    mock_response.json = AsyncMock(return_value=valid_institution_data_dict)
+    mock_response.json = MagicMock(return_value=valid_institution_data_dict)
 
     with patch("httpx.AsyncClient.get", return_value=mock_response) as mock_get:
         institutions = await async_ror_client.get_multiple_institutions(
@@ -68,3 +68,61 @@ async def test_get_multiple_institutions_error(async_ror_client):
     with patch("httpx.AsyncClient.get", return_value=mock_response) as mock_get:
         with pytest.raises(ValueError):
             await async_ror_client.get_multiple_institutions(["invalid_id"])
+
+
+@pytest.mark.asyncio
+async def test_transport_injection(valid_institution_data_dict):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json=valid_institution_data_dict)
+    )
+
+    async with AsyncRORClient(transport=transport) as client:
+        institution = await client.get_institution("00ee0ee00")
+
+    assert institution.id_without_prefix == "00ee0ee00"
+
+
+@pytest.mark.asyncio
+async def test_prefetch_awaits_related_institutions(valid_institution_data_dict):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json=valid_institution_data_dict)
+    )
+
+    async with AsyncRORClient(
+        prefetch_relationships=True, max_depth=1, transport=transport
+    ) as client:
+        institution = await client.get_institution("00ee0ee00")
+
+    assert [rel.record.id_without_prefix for rel in institution.relationships] == [
+        "00ee0ee00",
+        "00ee0ee00",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_with_page(valid_institution_data_dict):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "number_of_results": 1,
+                "time_taken": 1,
+                "items": [valid_institution_data_dict],
+                "meta": {
+                    "types": [],
+                    "countries": [],
+                    "continents": [],
+                    "statuses": [],
+                },
+            },
+        )
+
+    async with AsyncRORClient(transport=httpx.MockTransport(handler)) as client:
+        result = await client.search("example university", page=2)
+
+    assert result.number_of_results == 1
+    assert requests[0].url.params["query"] == "example university"
+    assert requests[0].url.params["page"] == "2"
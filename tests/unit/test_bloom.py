@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+
+from rorclient.bloom import BloomFilter
+from rorclient.client import RORClient
+
+
+@pytest.fixture
+def known_ids():
+    return [f"0{i:06d}{i % 100:02d}" for i in range(2000)]
+
+
+def test_membership(known_ids):
+    bloom = BloomFilter.from_ids(known_ids, false_positive_rate=0.01)
+
+    assert all(ror_id in bloom for ror_id in known_ids)
+    assert known_ids[0].upper() in bloom
+    false_positives = sum(f"1{i:06d}00" in bloom for i in range(10000))
+    assert false_positives < 300
+    assert len(bloom) == len(known_ids)
+
+
+def test_save_load_and_reload(tmp_path, known_ids):
+    path = tmp_path / "ror-ids.bloom"
+    BloomFilter.from_ids(known_ids).save(path)
+
+    bloom = BloomFilter.load(path)
+    assert all(ror_id in bloom for ror_id in known_ids)
+
+    BloomFilter.from_ids(["03yrm5c26"]).save(path)
+    bloom.reload(path)
+    assert "03yrm5c26" in bloom
+    assert len(bloom) == 1
+
+    (tmp_path / "garbage").write_bytes(b"not a filter")
+    with pytest.raises(ValueError):
+        BloomFilter.load(tmp_path / "garbage")
+
+
+def test_client_skips_unknown_ids():
+    with patch("rorclient.client.httpx.Client") as MockClient:
+        client = RORClient(id_filter=BloomFilter.from_ids(["03yrm5c26"]))
+
+        assert client.get_institution("https://ror.org/01cwqze88") is None
+        MockClient.return_value.get.assert_not_called()
@@ -0,0 +1,116 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.breaker import CircuitBreaker, CircuitOpenError
+from rorclient.cache import InstitutionCache
+from rorclient.client import RORClient
+from rorclient.retry import RetryPolicy
+
+
+def test_opens_after_threshold_and_probes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_status(503)
+    assert breaker.state == "closed"
+    breaker.record_status(None)
+    assert breaker.state == "open"
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now = 10
+    assert not breaker.is_open
+    assert breaker.allow_request()
+    assert breaker.state == "half_open"
+    # Only one probe at a time
+    assert not breaker.allow_request()
+
+    breaker.record_status(503)
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_status(404)
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+
+    breaker.record_status(500)
+    breaker.record_status(200)
+    breaker.record_status(500)
+
+    assert breaker.state == "closed"
+
+
+def test_invalid_threshold():
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+
+
+@patch("rorclient.client.httpx.Client")
+def test_client_fails_fast_and_serves_expired_cache(
+    mock_client, clock, valid_institution_data, valid_institution_data_dict
+):
+    mock_client.return_value.get.side_effect = httpx.ConnectError("refused")
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    cache = InstitutionCache(ttl=10, clock=clock)
+    cache.set("00ee0ee00", valid_institution_data)
+    client = RORClient(
+        cache=cache,
+        circuit_breaker=breaker,
+        retry_policy=RetryPolicy(max_retries=1),
+    )
+
+    clock.now = 20
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            client.get_institution("00ee0ee00")
+    assert breaker.state == "open"
+
+    # The lookups above found the entry expired but kept it for the fallback
+    clock.now = 40
+    assert client.get_institution("00ee0ee00") == valid_institution_data
+    with pytest.raises(CircuitOpenError):
+        client.get_institution("01ff0ff00")
+    assert mock_client.return_value.get.call_count == 2
+
+    # After the cool-down a successful probe closes the circuit
+    mock_client.return_value.get.side_effect = None
+    mock_client.return_value.get.return_value = MagicMock(
+        status_code=200, json=MagicMock(return_value=valid_institution_data_dict)
+    )
+    clock.now = 60
+    assert client.get_institution("01ff0ff00") is not None
+    assert breaker.state == "closed"
+
+
+@patch("rorclient.client.httpx.Client")
+def test_open_circuit_stops_retries(mock_client, clock):
+    mock_client.return_value.get.return_value = MagicMock(status_code=503, headers={})
+    breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+    client = RORClient(
+        circuit_breaker=breaker, retry_policy=RetryPolicy(max_retries=10, base_delay=0)
+    )
+
+    with pytest.raises(CircuitOpenError):
+        client.get_institution("00ee0ee00")
+    assert mock_client.return_value.get.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("rorclient.async_client.httpx.AsyncClient")
+async def test_async_client_records_failures(mock_client, clock):
+    mock_client.return_value.get = AsyncMock(return_value=MagicMock(status_code=500))
+    breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+    client = AsyncRORClient(circuit_breaker=breaker)
+
+    with pytest.raises(ValueError, match="500"):
+        await client.get_institution("00ee0ee00")
+    with pytest.raises(CircuitOpenError):
+        await client.get_institution("00ee0ee00")
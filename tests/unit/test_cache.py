@@ -0,0 +1,199 @@
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.cache import InstitutionCache
+from rorclient.client import RORClient
+
+
+def test_cache_hit_and_expiry(clock, valid_institution_data):
+    cache = InstitutionCache(ttl=10, negative_ttl=1, clock=clock)
+    cache.set("https://ror.org/00EE0EE00", valid_institution_data)
+    cache.set_missing("02abcde99")
+
+    assert cache.get("00ee0ee00") == (True, valid_institution_data)
+    assert cache.get("02abcde99") == (True, None)
+
+    clock.now = 5
+    assert cache.get("02abcde99") == (False, None)
+    assert cache.get("00ee0ee00") == (True, valid_institution_data)
+
+    clock.now = 11
+    assert cache.get("00ee0ee00") == (False, None)
+
+    stats = cache.stats()
+    assert (stats.hits, stats.negative_hits, stats.misses) == (2, 1, 2)
+    assert stats.expirations == 2
+    # Expired entries are kept until evicted
+    assert (stats.size, stats.negative_size) == (1, 1)
+    assert cache.lookup("00ee0ee00", allow_expired=True) == (
+        True,
+        valid_institution_data,
+        True,
+    )
+
+
+def test_negative_entries_have_own_size_limit(valid_institution_data):
+    cache = InstitutionCache(maxsize=10, negative_maxsize=2)
+    cache.set("00ee0ee00", valid_institution_data)
+    for ror_id in ["01aaaaa00", "01bbbbb00", "01ccccc00"]:
+        cache.set_missing(ror_id)
+
+    assert cache.get("01aaaaa00") == (False, None)
+    assert cache.get("01ccccc00") == (True, None)
+    stats = cache.stats()
+    assert (stats.size, stats.negative_size, stats.evictions) == (1, 2, 1)
+    assert list(cache.values()) == [valid_institution_data]
+
+
+def test_sync_client_caches_404():
+    cache = InstitutionCache()
+    with patch("rorclient.client.httpx.Client") as MockClient:
+        MockClient.return_value.get.return_value = MagicMock(status_code=404)
+        client = RORClient(cache=cache)
+
+        assert client.get_institution("02abcde99") is None
+        assert client.get_institution("02abcde99") is None
+
+        MockClient.return_value.get.assert_called_once()
+        assert cache.stats().negative_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_caches_404():
+    cache = InstitutionCache()
+    client = AsyncRORClient(cache=cache)
+
+    with patch("httpx.AsyncClient.get", return_value=httpx.Response(404)) as mock_get:
+        assert await client.get_institution("02abcde99") is None
+        assert await client.get_institution("02abcde99") is None
+
+        mock_get.assert_called_once()
+        assert cache.stats().negative_size == 1
+
+
+def test_stale_entries_served_until_hard_ttl(clock, valid_institution_data):
+    cache = InstitutionCache(ttl=10, hard_ttl=60, clock=clock)
+    cache.set("00ee0ee00", valid_institution_data)
+
+    clock.now = 30
+    assert cache.lookup("00ee0ee00") == (True, valid_institution_data, True)
+    assert cache.start_refresh("00ee0ee00")
+    assert not cache.start_refresh("00ee0ee00")
+    cache.finish_refresh("00ee0ee00", success=True)
+
+    clock.now = 61
+    assert cache.lookup("00ee0ee00") == (False, None, False)
+    stats = cache.stats()
+    assert (stats.stale_hits, stats.refreshes, stats.expirations) == (1, 1, 1)
+
+    with pytest.raises(ValueError):
+        InstitutionCache(ttl=10, hard_ttl=5)
+
+
+def test_sync_client_refreshes_stale_entry_in_background(
+    clock, valid_institution_data_dict, valid_institution_data
+):
+    cache = InstitutionCache(ttl=10, hard_ttl=60, clock=clock)
+    cache.set("00ee0ee00", valid_institution_data)
+    clock.now = 30
+
+    with patch("rorclient.client.httpx.Client") as MockClient:
+        MockClient.return_value.get.return_value = MagicMock(
+            status_code=200, json=lambda: valid_institution_data_dict
+        )
+        with RORClient(cache=cache) as client:
+            assert client.get_institution("00ee0ee00") == valid_institution_data
+
+        MockClient.return_value.get.assert_called_once_with("organizations/00ee0ee00")
+
+    assert cache.stats().refreshes == 1
+    assert cache.lookup("00ee0ee00")[2] is False
+
+
+@pytest.mark.asyncio
+async def test_async_client_refreshes_stale_entry_in_background(
+    clock, valid_institution_data_dict, valid_institution_data
+):
+    cache = InstitutionCache(ttl=10, hard_ttl=60, clock=clock)
+    cache.set("00ee0ee00", valid_institution_data)
+    clock.now = 30
+    client = AsyncRORClient(cache=cache)
+
+    mock_response = httpx.Response(200)
+    mock_response.json = MagicMock(return_value=valid_institution_data_dict)
+    with patch("httpx.AsyncClient.get", return_value=mock_response) as mock_get:
+        assert await client.get_institution("00ee0ee00") == valid_institution_data
+        await asyncio.gather(*client._refresh_tasks)
+
+        mock_get.assert_called_once()
+
+    assert cache.stats().refreshes == 1
+    await client.close()
+
+
+def test_snapshot_round_trip(tmp_path, clock, valid_institution_nested_data):
+    cache = InstitutionCache(ttl=100, clock=clock)
+    cache.set("00ee0ee00", valid_institution_nested_data)
+    cache.set_missing("02abcde99")
+    clock.now = 40
+    assert cache.save_snapshot(tmp_path / "cache.gz") == 2
+
+    clock.now = 0
+    restored = InstitutionCache(ttl=100, clock=clock)
+    assert restored.load_snapshot(tmp_path / "cache.gz") == 2
+    assert restored.get("00ee0ee00") == (True, valid_institution_nested_data)
+    assert restored.get("02abcde99") == (True, None)
+
+    # The entry keeps its age, so it expires 60 seconds after the restore
+    clock.now = 61
+    assert restored.get("00ee0ee00") == (False, None)
+
+    (tmp_path / "other.gz").write_bytes(b"")
+    with pytest.raises(ValueError):
+        restored.load_snapshot(tmp_path / "other.gz")
+
+
+def test_load_dump(tmp_path, valid_institution_data_dict, valid_institution_data):
+    dump_path = tmp_path / "dump.json"
+    dump_path.write_text(json.dumps([valid_institution_data_dict]))
+
+    cache = InstitutionCache()
+    assert cache.load_dump(dump_path, ror_ids=["01cwqze88"]) == 0
+    assert cache.load_dump(dump_path) == 1
+    assert cache.get("00ee0ee00") == (True, valid_institution_data)
+
+
+def test_sync_client_warm_cache(valid_institution_data_dict):
+    cache = InstitutionCache()
+    with patch("rorclient.client.httpx.Client") as MockClient:
+        MockClient.return_value.get.side_effect = lambda url: (
+            MagicMock(status_code=200, json=lambda: valid_institution_data_dict)
+            if url.endswith("00ee0ee00")
+            else MagicMock(status_code=404)
+        )
+        client = RORClient(cache=cache)
+
+        assert client.warm_cache(["00ee0ee00", "02abcde99", "00ee0ee00"]) == 1
+        assert MockClient.return_value.get.call_count == 2
+        assert cache.stats().size == 1
+
+    with pytest.raises(ValueError):
+        RORClient().warm_cache(["00ee0ee00"])
+
+
+@pytest.mark.asyncio
+async def test_async_client_warm_cache(valid_institution_data_dict):
+    cache = InstitutionCache()
+    client = AsyncRORClient(cache=cache)
+
+    mock_response = httpx.Response(200)
+    mock_response.json = MagicMock(return_value=valid_institution_data_dict)
+    with patch("httpx.AsyncClient.get", return_value=mock_response):
+        assert await client.warm_cache(["00ee0ee00"], concurrency=2) == 1
+
+    assert cache.stats().size == 1
@@ -0,0 +1,186 @@
+import asyncio
+import csv
+import io
+import json
+import time
+from functools import partial
+
+import pytest
+
+from rorclient import cli
+from rorclient.async_client import AsyncRORClient
+from rorclient.export import JSONLExporter
+from rorclient.retry import RetryPolicy
+from rorclient.testing import FakeRORServer, constant_latency, generate_records
+
+
+@pytest.fixture
+def server():
+    return FakeRORServer(generate_records(5))
+
+
+@pytest.fixture
+def ror_ids(server):
+    return list(server.records)
+
+
+@pytest.fixture
+def fake_api(server, monkeypatch):
+    monkeypatch.setattr(
+        cli,
+        "AsyncRORClient",
+        partial(AsyncRORClient, transport=server.async_transport()),
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolve_keeps_input_order(server, ror_ids, unknown_ror_id):
+    lines = [
+        f"https://ror.org/{ror_ids[3]}\n",
+        "\n",
+        "Organization 2\n",
+        f"{unknown_ror_id}\n",
+        "Nowhere\n",
+        ror_ids[0].upper(),
+    ]
+    output = io.StringIO()
+
+    async with AsyncRORClient(transport=server.async_transport()) as client:
+        with JSONLExporter(output) as exporter:
+            stats = await cli.resolve(client, lines, exporter, concurrency=2)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record["id"] for record in records] == [
+        f"https://ror.org/{ror_ids[3]}",
+        f"https://ror.org/{ror_ids[2]}",
+        f"https://ror.org/{ror_ids[0]}",
+    ]
+    assert (stats.lines, stats.found, stats.not_found) == (5, 3, 2)
+    assert not stats.errors
+
+
+@pytest.mark.asyncio
+async def test_resolve_counts_errors():
+    server = FakeRORServer(generate_records(5), error_rate=1.0)
+    output = io.StringIO()
+
+    async with AsyncRORClient(
+        transport=server.async_transport(), retry_policy=RetryPolicy(max_retries=1)
+    ) as client:
+        with JSONLExporter(output) as exporter:
+            stats = await cli.resolve(client, ["Organization 1"] * 3, exporter)
+
+    assert stats.found == 0
+    assert sum(stats.errors.values()) == 3
+    assert output.getvalue() == ""
+    assert "errors: 3" in stats.summary()
+
+
+def test_mistyped_id_is_an_error(
+    fake_api, server, ror_ids, monkeypatch, capsys, caplog
+):
+    mistyped = ror_ids[1][:-2] + f"{(int(ror_ids[1][-2:]) + 1) % 100:02d}"
+    monkeypatch.setattr("sys.stdin", io.StringIO(f"{mistyped}\n"))
+
+    status = cli.main([])
+
+    out, err = capsys.readouterr()
+    assert status == 1
+    assert out == ""
+    assert "ValueError: 1" in err
+    assert f"Invalid ROR ID checksum: {mistyped}" in caplog.text
+    assert server.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_resolve_writes_while_waiting_for_input(server, ror_ids):
+    output = io.StringIO()
+    written_early = []
+
+    def slow_input():
+        yield ror_ids[0]
+        deadline = time.monotonic() + 2
+        while ror_ids[0] not in output.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        written_early.append(ror_ids[0] in output.getvalue())
+        yield ror_ids[1]
+
+    async with AsyncRORClient(transport=server.async_transport()) as client:
+        with JSONLExporter(output) as exporter:
+            stats = await cli.resolve(client, slow_input(), exporter)
+
+    assert written_early == [True]
+    assert stats.found == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_cancels_lookups_on_input_error(ror_ids):
+    server = FakeRORServer(generate_records(5), latency=constant_latency(0.5))
+
+    def broken_input():
+        yield ror_ids[0]
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    async with AsyncRORClient(transport=server.async_transport()) as client:
+        with pytest.raises(UnicodeDecodeError):
+            await cli.resolve(client, broken_input(), JSONLExporter(io.StringIO()))
+
+        # The pending lookup was cancelled and awaited
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+def test_max_retries_zero_is_kept():
+    args = cli.build_parser().parse_args(["--max-retries", "0"])
+
+    assert cli.make_client(args).retry_policy.max_retries == 0
+
+
+def test_main_writes_csv(fake_api, ror_ids, tmp_path, capsys):
+    path = tmp_path / "ids.txt"
+    path.write_text("\n".join([*ror_ids[:3], ror_ids[0], "Nowhere"]))
+
+    status = cli.main([str(path), "--format", "csv", "--fields", "id,name"])
+
+    assert status == 0
+    out, err = capsys.readouterr()
+    rows = list(csv.DictReader(io.StringIO(out)))
+    assert [row["name"] for row in rows] == [
+        "Organization 0",
+        "Organization 1",
+        "Organization 2",
+        "Organization 0",
+    ]
+    assert "Resolved 4 of 5 lines" in err
+    assert "Not found: 1, errors: 0" in err
+    # The repeated ID is answered from the cache
+    assert "cache hits: 1" in err
+
+
+def test_main_reads_stdin(fake_api, ror_ids, monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO(f"{ror_ids[1]}\n"))
+
+    status = cli.main(["--quiet", "--fields", "id", "--cache-size", "0"])
+
+    out, err = capsys.readouterr()
+    assert status == 0
+    assert json.loads(out) == {"id": f"https://ror.org/{ror_ids[1]}"}
+    assert err == ""
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--concurrency", "0"],
+        ["--rate", "0"],
+        ["--rate", "-1"],
+        ["--burst", "5"],
+        ["--fields", "nonexistent"],
+    ],
+)
+def test_main_rejects_invalid_arguments(fake_api, argv, monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO(""))
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(argv)
+
+    assert exc_info.value.code == 2
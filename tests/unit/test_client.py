@@ -1,9 +1,13 @@
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from rorclient.client import RORClient
 from rorclient.models import Institution
+from rorclient.testing import FakeRORServer, constant_latency, generate_records
 
 
 @pytest.fixture
@@ -103,3 +107,125 @@ def test_get_multiple_institutions_error(ror_client, mock_httpx_client):
 
     with pytest.raises(ValueError):
         ror_client.get_multiple_institutions(["invalid_id"])
+
+
+def test_transport_injection(valid_institution_data_dict):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=valid_institution_data_dict)
+
+    with RORClient(transport=httpx.MockTransport(handler)) as client:
+        institution = client.get_institution("00ee0ee00")
+
+    assert institution.id_without_prefix == "00ee0ee00"
+    assert str(requests[0].url) == "https://api.ror.org/v2/organizations/00ee0ee00"
+    assert requests[0].headers["Accept"] == "application/json"
+
+
+def test_shared_http_client_is_not_closed():
+    http_client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: httpx.Response(404))
+    )
+
+    for _ in range(2):
+        with RORClient(http_client=http_client) as client:
+            assert client.get_institution("00ee0ee00") is None
+
+    assert not http_client.is_closed
+    assert str(http_client.base_url) == "https://api.ror.org/v2/"
+    http_client.close()
+
+
+def test_client_options_from_config_and_arguments():
+    transport = httpx.MockTransport(lambda request: httpx.Response(404))
+    client = RORClient(transport=transport, timeout=httpx.Timeout(1.0, connect=0.5))
+
+    assert client._client.timeout.connect == 0.5
+    assert client._client.timeout.read == 1.0
+    options = client._client_options(None, None, None, None)
+    assert options["limits"].max_connections == 100
+    assert options["http2"] is False
+
+    with pytest.raises(ValueError):
+        RORClient(http_client=httpx.Client(), transport=transport)
+
+
+def test_search_with_page():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(404)
+
+    with RORClient(transport=httpx.MockTransport(handler)) as client:
+        assert client.search("example", advanced_search=True, page=3) is None
+
+    assert requests[0].url.params["query.advanced"] == "example"
+    assert requests[0].url.params["page"] == "3"
+
+
+def test_get_multiple_institutions_in_parallel_keeps_order():
+    records = generate_records(20)
+    ror_ids = [record["id"].replace("https://ror.org/", "") for record in records]
+    server = FakeRORServer(records, latency=constant_latency(0.05))
+    client = RORClient(transport=server.transport())
+
+    start = time.perf_counter()
+    institutions = client.get_multiple_institutions(ror_ids + ror_ids[:2], 10)
+    elapsed = time.perf_counter() - start
+
+    assert [str(i.id) for i in institutions] == [
+        record["id"] for record in records + records[:2]
+    ]
+    # Duplicates are fetched once
+    assert server.requests == 20
+    assert elapsed < 0.5
+
+    with pytest.raises(ValueError):
+        client.get_multiple_institutions(ror_ids, 0)
+
+
+def test_iter_institutions_yields_as_completed():
+    records = generate_records(10)
+    ror_ids = [record["id"].replace("https://ror.org/", "") for record in records]
+    client = RORClient(transport=FakeRORServer(records).transport())
+
+    results = dict(client.iter_institutions(ror_ids + ["000000000"], concurrency=4))
+
+    assert set(results) == set(ror_ids) | {"000000000"}
+    assert results["000000000"] is None
+    assert str(results[ror_ids[3]].id) == records[3]["id"]
+
+
+def test_iter_institutions_validates_when_called():
+    client = RORClient(transport=FakeRORServer(generate_records(1)).transport())
+
+    # Raised by the call itself, without iterating
+    with pytest.raises(ValueError):
+        client.iter_institutions([])
+    with pytest.raises(ValueError):
+        client.iter_institutions(["000000098"], concurrency=0)
+
+
+def test_concurrent_fetches_of_one_institution_share_a_request():
+    records = generate_records(3)
+    ror_id = records[0]["id"].replace("https://ror.org/", "")
+    server = FakeRORServer(records, latency=constant_latency(0.1))
+    client = RORClient(transport=server.transport())
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(client.get_institution(ror_id)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.requests == 1
+    assert len(results) == 5
+    assert all(result == results[0] for result in results)
+    assert client._in_flight == {}
@@ -0,0 +1,128 @@
+import csv
+import gzip
+import io
+import json
+import sys
+
+import pytest
+
+from rorclient.export import (
+    COLUMNS,
+    CSVExporter,
+    JSONLExporter,
+    ParquetExporter,
+    export,
+    export_async,
+    flatten,
+)
+from rorclient.models import Institution
+from rorclient.testing import generate_records
+
+
+@pytest.fixture
+def institutions():
+    return [Institution(**record) for record in generate_records(25)]
+
+
+def test_flatten(institutions):
+    row = flatten(institutions[0])
+
+    assert list(row) == list(COLUMNS)
+    assert row["id"] == "https://ror.org/000000098"
+    assert row["name"] == "Organization 0"
+    assert row["acronyms"] == ["ORG0"]
+    assert row["country_code"] == "DK"
+    assert row["grid"] == "grid.000000098.1"
+    assert row["related"] == [str(rel.id) for rel in institutions[0].relationships]
+    assert flatten(institutions[0], ["name", "id"]) == {
+        "name": "Organization 0",
+        "id": "https://ror.org/000000098",
+    }
+    with pytest.raises(ValueError):
+        flatten(institutions[0], ["nope"])
+
+
+def test_jsonl_export_in_chunks(institutions):
+    out = io.StringIO()
+    with JSONLExporter(out, fields=["id", "status"], chunk_size=10) as exporter:
+        for institution in institutions[:15]:
+            exporter.write(institution)
+        # Only full chunks are written before closing
+        assert out.getvalue().count("\n") == 10
+        exporter.write(None)
+
+    lines = out.getvalue().splitlines()
+    assert exporter.count == 15
+    assert json.loads(lines[0]) == {
+        "id": "https://ror.org/000000098",
+        "status": "active",
+    }
+
+    with pytest.raises(ValueError):
+        JSONLExporter(io.StringIO(), fields=["nope"])
+
+
+def test_csv_export_to_gzip_path(institutions, tmp_path):
+    path = tmp_path / "institutions.csv.gz"
+
+    assert export(iter(institutions), path, fields=["id", "name", "types"]) == 25
+
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as fh:
+        rows = list(csv.reader(fh))
+    assert rows[0] == ["id", "name", "types"]
+    assert rows[1] == ["https://ror.org/000000098", "Organization 0", "education"]
+    assert len(rows) == 26
+
+
+def test_csv_joins_lists(institutions):
+    out = io.StringIO()
+    with CSVExporter(out, fields=["related"], list_separator=";") as exporter:
+        exporter.write(institutions[0])
+
+    assert out.getvalue().splitlines()[1] == ";".join(
+        str(rel.id) for rel in institutions[0].relationships
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_async_iterable(institutions, tmp_path):
+    async def fetched():
+        for institution in institutions:
+            yield institution
+
+    path = tmp_path / "institutions.jsonl"
+
+    assert await export_async(fetched(), path) == 25
+    assert (
+        Institution.model_validate_json(path.read_text().splitlines()[3])
+        == (institutions[3])
+    )
+
+
+def test_unknown_format(institutions, tmp_path):
+    with pytest.raises(ValueError):
+        export(institutions, tmp_path / "institutions.xml")
+    with pytest.raises(ValueError):
+        export(institutions, io.StringIO())
+
+
+def test_parquet_export(institutions, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "institutions.parquet"
+
+    assert export(institutions, path, fields=["id", "lat", "types", "created"]) == 25
+
+    table = parquet.read_table(path)
+    assert table.column_names == ["id", "lat", "types", "created"]
+    assert table.num_rows == 25
+    assert table.column("types").to_pylist()[0] == ["education"]
+
+
+def test_parquet_requires_pyarrow(tmp_path, monkeypatch):
+    # pyarrow is a dev dependency, so its absence is simulated
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+
+    with pytest.raises(ImportError, match="rorclient\\[parquet\\]"):
+        ParquetExporter(tmp_path / "institutions.parquet")
+    assert not (tmp_path / "institutions.parquet").exists()
@@ -0,0 +1,70 @@
+import pytest
+
+from rorclient.graph import RelationshipGraph
+
+
+def _record(ror_id, *relationships):
+    return {
+        "id": f"https://ror.org/{ror_id}",
+        "relationships": [
+            {"type": rel_type, "id": f"https://ror.org/{related}", "label": related}
+            for rel_type, related in relationships
+        ],
+    }
+
+
+@pytest.fixture
+def graph():
+    # uni -> faculty -> (dept_a, dept_b); hospital has parents uni and region
+    return RelationshipGraph.from_records(
+        [
+            _record("uni", ("child", "faculty"), ("related", "partner")),
+            _record("faculty", ("parent", "uni"), ("child", "dept_a")),
+            _record("dept_a", ("parent", "faculty")),
+            _record("dept_b", ("parent", "faculty")),
+            _record("hospital", ("parent", "region"), ("parent", "uni")),
+            _record("clinic", ("parent", "hospital")),
+            _record("region"),
+        ]
+    )
+
+
+def test_hierarchy_queries(graph):
+    assert graph.parents("dept_b") == ["faculty"]
+    assert sorted(graph.children("faculty")) == ["dept_a", "dept_b"]
+    assert graph.ancestors("dept_a") == ["faculty", "uni"]
+    assert graph.root("https://ror.org/dept_a") == "uni"
+    assert graph.siblings("dept_a") == ["dept_b"]
+    assert graph.related("uni", "related") == ["partner"]
+    assert "partner" in graph
+    assert graph.root("partner") == "partner"
+
+
+def test_descendants_include_multi_parent_children(graph):
+    assert sorted(graph.descendants("uni")) == [
+        "clinic",
+        "dept_a",
+        "dept_b",
+        "faculty",
+        "hospital",
+    ]
+    assert sorted(graph.descendants("region")) == ["clinic", "hospital"]
+    assert graph.descendants("dept_a") == []
+
+
+def test_is_descendant(graph):
+    assert graph.is_descendant("dept_a", "uni")
+    assert graph.is_descendant("clinic", "uni")
+    assert graph.is_descendant("clinic", "region")
+    assert not graph.is_descendant("uni", "dept_a")
+    assert not graph.is_descendant("uni", "uni")
+    assert not graph.is_descendant("partner", "uni")
+
+
+def test_from_institutions(valid_institution_data):
+    graph = RelationshipGraph.from_institutions([valid_institution_data])
+
+    assert graph.children("00ee0ee00") == ["00bb0bb00"]
+    assert graph.root("00bb0bb00") == "00ee0ee00"
+    with pytest.raises(KeyError):
+        graph.parents("unknown")
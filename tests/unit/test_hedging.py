@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.client import RORClient
+from rorclient.hedging import HedgingPolicy
+from rorclient.ratelimit import RateLimiter
+from rorclient.testing import FakeRORServer, constant_latency
+
+
+def test_delay_adapts_to_observed_latency():
+    hedging = HedgingPolicy(quantile=0.9, initial_delay=1.0, min_samples=10)
+    assert hedging.delay() == 1.0
+
+    for i in range(100):
+        hedging.record_latency(i / 1000)
+
+    assert hedging.delay() == pytest.approx(0.09)
+
+
+def test_delay_is_clamped():
+    hedging = HedgingPolicy(min_delay=0.05, max_delay=0.2, min_samples=2)
+    for _ in range(10):
+        hedging.record_latency(0.001)
+    assert hedging.delay() == 0.05
+
+    for _ in range(1000):
+        hedging.record_latency(10)
+    assert hedging.delay() == 0.2
+
+
+def test_extra_load_is_capped():
+    hedging = HedgingPolicy(max_extra_load=0.1)
+    hedged = 0
+    for _ in range(100):
+        hedging.start_request()
+        hedged += hedging.try_hedge()
+
+    # One hedge from the initial reserve plus one per ten requests
+    assert hedged <= 11
+    assert hedging.stats().hedged == hedged
+
+
+def test_invalid_quantile():
+    with pytest.raises(ValueError):
+        HedgingPolicy(quantile=1)
+
+
+@patch("rorclient.client.httpx.Client")
+def test_sync_hedge_wins_over_slow_request(mock_client):
+    calls = []
+    release = threading.Event()
+
+    def get(url):
+        calls.append(url)
+        if len(calls) == 1:
+            release.wait(5)
+            return MagicMock(status_code=500)
+        return MagicMock(status_code=404)
+
+    mock_client.return_value.get.side_effect = get
+    hedging = HedgingPolicy(initial_delay=0.01)
+    client = RORClient(hedging=hedging)
+
+    start = time.monotonic()
+    assert client.get_institution("00ee0ee00") is None
+    assert time.monotonic() - start < 1
+    assert len(calls) == 2
+    assert hedging.stats().hedge_wins == 1
+
+    release.set()
+    client.close()
+
+
+@patch("rorclient.client.httpx.Client")
+def test_sync_hedge_needs_rate_limiter_token(mock_client):
+    calls = []
+
+    def get(url):
+        calls.append(url)
+        time.sleep(0.05)
+        return MagicMock(status_code=404)
+
+    mock_client.return_value.get.side_effect = get
+    hedging = HedgingPolicy(initial_delay=0.01)
+    limiter = RateLimiter(rate=1, burst=1)
+    client = RORClient(hedging=hedging, rate_limiter=limiter)
+
+    assert client.get_institution("00ee0ee00") is None
+    assert len(calls) == 1
+    assert hedging.stats().hedged == 0
+    assert limiter.stats().requests == 1
+    # The budget spent on the skipped hedge was refunded
+    assert hedging.try_hedge()
+    client.close()
+
+
+@patch("rorclient.client.httpx.Client")
+def test_sync_close_does_not_wait_for_losing_request(mock_client):
+    release = threading.Event()
+    calls = []
+
+    def get(url):
+        calls.append(url)
+        if len(calls) == 1:
+            release.wait(5)
+        return MagicMock(status_code=404)
+
+    mock_client.return_value.get.side_effect = get
+    client = RORClient(hedging=HedgingPolicy(initial_delay=0.01))
+    assert client.get_institution("00ee0ee00") is None
+
+    start = time.monotonic()
+    client.close()
+    assert time.monotonic() - start < 1
+    release.set()
+
+
+@patch("rorclient.client.httpx.Client")
+def test_sync_fast_request_is_not_hedged(mock_client):
+    mock_client.return_value.get.return_value = MagicMock(status_code=404)
+    hedging = HedgingPolicy(initial_delay=1)
+    client = RORClient(hedging=hedging)
+
+    assert client.get_institution("00ee0ee00") is None
+    assert mock_client.return_value.get.call_count == 1
+    assert hedging.stats().hedged == 0
+    client.close()
+
+
+def test_sync_hedged_requests_do_not_queue(records, ror_ids):
+    server = FakeRORServer(records, latency=constant_latency(0.2))
+    hedging = HedgingPolicy(initial_delay=1.0, min_samples=10)
+    client = RORClient(transport=server.transport(), hedging=hedging)
+
+    start = time.monotonic()
+    client.get_multiple_institutions(ror_ids, concurrency=len(ror_ids))
+
+    # All requests are sent at once, and only their own latency is observed
+    assert time.monotonic() - start < 0.35
+    assert hedging.delay() < 0.3
+    assert hedging.stats().hedged == 0
+    client.close()
+
+
+@pytest.mark.asyncio
+@patch("rorclient.async_client.httpx.AsyncClient")
+async def test_async_hedge_cancels_slow_request(mock_client):
+    slow_cancelled = asyncio.Event()
+    calls = 0
+
+    async def get(url):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                slow_cancelled.set()
+                raise
+        return MagicMock(status_code=404)
+
+    mock_client.return_value.get = get
+    hedging = HedgingPolicy(initial_delay=0.01)
+    client = AsyncRORClient(hedging=hedging)
+
+    assert await client.get_institution("00ee0ee00") is None
+    await asyncio.wait_for(slow_cancelled.wait(), 1)
+    assert hedging.stats().hedge_wins == 1
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import pytest
+
+import rorclient
+import rorclient.models
+
+
+def loaded_modules(statement: str) -> set:
+    """Runs a statement in a new interpreter and returns the modules it loaded."""
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split())
+
+
+def test_package_import_is_lazy():
+    modules = loaded_modules("import rorclient")
+
+    assert "httpx" not in modules
+    assert "pydantic" not in modules
+    assert "rorclient.client" not in modules
+
+
+def test_sync_client_does_not_load_async_code():
+    modules = loaded_modules("from rorclient import RORClient")
+
+    assert "rorclient.client" in modules
+    assert "rorclient.async_client" not in modules
+    assert "asyncio" not in modules
+
+
+def test_model_schemas_are_built_on_first_use():
+    modules = loaded_modules(
+        "from rorclient.models import Institution; "
+        "assert not Institution.__pydantic_complete__"
+    )
+
+    assert "rorclient.models.search" not in modules
+
+
+def test_relationship_resolves_institution():
+    loaded_modules(
+        "from rorclient.models import Relationship; "
+        "Relationship(label='a', type='parent', id='https://ror.org/00x0x0x00')"
+    )
+
+
+def test_lazy_exports():
+    assert rorclient.RORClient.__name__ == "RORClient"
+    assert "AsyncRORClient" in dir(rorclient)
+    assert "Institution" in dir(rorclient.models)
+
+    with pytest.raises(AttributeError):
+        _ = rorclient.NotAClient
+    with pytest.raises(AttributeError):
+        _ = rorclient.models.NotAModel
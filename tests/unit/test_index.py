@@ -0,0 +1,72 @@
+import json
+import zipfile
+
+from rorclient.dump import iter_dump, iter_dump_records
+from rorclient.index import DomainIndex
+
+
+def _record(valid_institution_data_dict, ror_id, domains, website=None):
+    record = {
+        **valid_institution_data_dict,
+        "id": f"https://ror.org/{ror_id}",
+        "domains": domains,
+        "links": [],
+    }
+    if website:
+        record["links"] = [{"type": "website", "value": website}]
+    return record
+
+
+def test_lookup_longest_suffix(valid_institution_data_dict):
+    index = DomainIndex.from_records(
+        [
+            _record(valid_institution_data_dict, "035b05819", ["ku.dk"]),
+            _record(valid_institution_data_dict, "04n0g0b29", ["di.ku.dk"]),
+        ]
+    )
+
+    assert index.lookup("cs.ku.dk") == ["035b05819"]
+    assert index.lookup("alice@di.ku.dk") == ["04n0g0b29"]
+    assert index.lookup("https://www.ku.dk/about") == ["035b05819"]
+    assert index.match("cs.ku.dk") == ("ku.dk", ["035b05819"])
+    assert index.lookup("example.com") == []
+
+
+def test_lookup_indexes_website_hosts_only(valid_institution_data):
+    index = DomainIndex.from_institutions([valid_institution_data])
+
+    assert index.lookup("WWW.EXAMPLE.COM") == ["00ee0ee00"]
+    assert index.lookup("mail.example.org") == ["00ee0ee00"]
+    assert index.lookup("en.wikipedia.org") == []
+
+
+def test_lookup_many(valid_institution_data_dict):
+    index = DomainIndex.from_records(
+        [_record(valid_institution_data_dict, "035b05819", ["ku.dk"])]
+    )
+
+    assert index.lookup_many(["a@ku.dk", "unknown.org", "b@ku.dk"]) == [
+        ["035b05819"],
+        [],
+        ["035b05819"],
+    ]
+
+
+def test_from_dump(tmp_path, valid_institution_data_dict):
+    archive_path = tmp_path / "v1.58-2024-12-11-ror-data.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr(
+            "v1.58-2024-12-11-ror-data_schema_v2.json",
+            json.dumps([valid_institution_data_dict]),
+        )
+
+    assert len(list(iter_dump_records(archive_path))) == 1
+    assert next(iter_dump(archive_path)).id_without_prefix == "00ee0ee00"
+    assert DomainIndex.from_dump(archive_path).lookup("example.org") == ["00ee0ee00"]
+
+
+def test_from_jsonl_dump(tmp_path, valid_institution_data_dict):
+    dump_path = tmp_path / "records.jsonl"
+    dump_path.write_text(json.dumps(valid_institution_data_dict) + "\n")
+
+    assert DomainIndex.from_dump(dump_path).lookup("example.com") == ["00ee0ee00"]
@@ -0,0 +1,74 @@
+import gzip
+import json
+
+import pytest
+
+from rorclient.ingest import ingest_dump, to_json, validate_records
+from rorclient.models import Institution
+
+
+def ror_id(institution: Institution) -> str:
+    return institution.id_without_prefix
+
+
+def test_validate_records_in_this_process(records):
+    results = list(validate_records(records, workers=1))
+
+    assert len(results) == 50
+    assert Institution.model_validate_json(results[0]) == Institution(**records[0])
+
+
+def test_parallel_results_keep_input_order(records):
+    results = list(validate_records(records, ror_id, workers=2, chunk_size=7))
+
+    assert results == [
+        record["id"].replace("https://ror.org/", "") for record in records
+    ]
+
+
+def test_parallel_results_unordered(records):
+    results = validate_records(records, ror_id, workers=2, chunk_size=7, ordered=False)
+
+    assert sorted(results) == sorted(
+        record["id"].replace("https://ror.org/", "") for record in records
+    )
+
+
+def test_invalid_record_raises(records):
+    del records[20]["names"]
+
+    with pytest.raises(ValueError, match=records[20]["id"]):
+        list(validate_records(records, workers=2, chunk_size=7))
+
+
+def test_invalid_arguments(records):
+    with pytest.raises(ValueError):
+        list(validate_records(records, workers=0))
+    with pytest.raises(ValueError):
+        list(validate_records(records, chunk_size=0))
+
+
+def test_ingest_dump(records, tmp_path):
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(records))
+
+    results = list(ingest_dump(path, workers=2, chunk_size=10))
+
+    assert results == [to_json(Institution(**record)) for record in records]
+
+
+def test_ingest_jsonl_dump_in_workers(records, tmp_path):
+    path = tmp_path / "dump.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        fh.write("\n".join(json.dumps(record) for record in records) + "\n\n")
+
+    results = list(ingest_dump(path, ror_id, workers=2, chunk_size=10))
+
+    assert results == [
+        record["id"].replace("https://ror.org/", "") for record in records
+    ]
+
+    del records[5]["status"]
+    path.write_bytes(gzip.compress(b"\n".join(json.dumps(r).encode() for r in records)))
+    with pytest.raises(ValueError, match=records[5]["id"]):
+        list(ingest_dump(path, workers=2))
@@ -0,0 +1,111 @@
+import asyncio
+
+import httpx
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.cache import InstitutionCache
+from rorclient.client import RORClient
+from rorclient.metrics import ClientEvent, ClientMetrics, Histogram
+from rorclient.retry import RetryPolicy
+from rorclient.testing import FakeRORServer, constant_latency
+
+
+def test_histogram_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+
+    assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.sum == pytest.approx(3.65)
+
+
+def test_client_events_and_metrics(records, ror_ids):
+    server = FakeRORServer(records, error_rate=0.5, error_statuses=(503,), seed=7)
+    metrics = ClientMetrics()
+    events = []
+    client = RORClient(
+        transport=server.transport(),
+        cache=InstitutionCache(),
+        retry_policy=RetryPolicy(max_retries=10, base_delay=0),
+        metrics=metrics,
+        hooks=[events.append],
+    )
+
+    client.get_institution(ror_ids[0])
+    client.get_institution(ror_ids[0])
+
+    names = [event.name for event in events]
+    assert names[0] == "cache_miss"
+    assert names[-1] == "cache_hit"
+    # The seed makes the first two attempts fail
+    assert server.status_counts == {503: 2, 200: 1}
+    assert names.count("retry") == 2
+    assert names.count("request_start") == server.requests
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests"] == {200: 1, 503: 2}
+    assert snapshot["retries"] == 2
+    assert snapshot["cache_hits"] == 1
+    assert snapshot["cache_misses"] == 1
+    assert snapshot["in_flight"] == 0
+    assert snapshot["bytes_received"] > 0
+    assert snapshot["request_duration_count"] == server.requests
+
+
+def test_failing_hook_does_not_break_requests(records, ror_ids):
+    def broken(event: ClientEvent) -> None:
+        raise RuntimeError("broken hook")
+
+    client = RORClient(transport=FakeRORServer(records).transport(), hooks=[broken])
+
+    assert client.get_institution(ror_ids[1]) is not None
+
+
+def test_transport_errors_are_counted(records, ror_ids):
+    metrics = ClientMetrics()
+    client = RORClient(
+        transport=FakeRORServer(records, timeout_rate=1).transport(),
+        retry_policy=RetryPolicy(max_retries=1),
+        metrics=metrics,
+    )
+
+    with pytest.raises(httpx.ReadTimeout):
+        client.get_institution(ror_ids[0])
+
+    assert metrics.snapshot()["errors"] == {"ReadTimeout": 1}
+    assert metrics.snapshot()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_ends(records, ror_ids):
+    metrics = ClientMetrics()
+    server = FakeRORServer(records, latency=constant_latency(0.5))
+    async with AsyncRORClient(
+        transport=server.async_transport(), metrics=metrics
+    ) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get_institution(ror_ids[0]), 0.05)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["errors"] == {"CancelledError": 1}
+
+
+@pytest.mark.asyncio
+async def test_prometheus_export(records, ror_ids, unknown_ror_id):
+    metrics = ClientMetrics()
+    async with AsyncRORClient(
+        transport=FakeRORServer(records).async_transport(), metrics=metrics
+    ) as client:
+        await client.get_multiple_institutions(ror_ids[:3])
+        await client.get_institution(unknown_ror_id)
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE rorclient_requests_total counter" in text
+    assert 'rorclient_requests_total{status="200"} 3' in text
+    assert 'rorclient_requests_total{status="404"} 1' in text
+    assert 'rorclient_request_duration_seconds_bucket{le="+Inf"} 4' in text
+    assert "rorclient_request_duration_seconds_count 4" in text
+    assert "rorclient_requests_in_flight 0" in text
@@ -68,6 +68,16 @@ def test_institution_id_without_prefix(valid_institution_data):
     assert valid_institution_data.id_without_prefix == "00ee0ee00"
 
 
+def test_institution_display_name(valid_institution_data):
+    assert valid_institution_data.display_name == "Example"
+
+    unmarked = valid_institution_data.model_copy(
+        update={"names": valid_institution_data.names[:1]}
+    )
+    assert unmarked.display_name == valid_institution_data.names[0].value
+    assert valid_institution_data.model_copy(update={"names": []}).display_name is None
+
+
 def test_institution_missing_required_field():
     data = {
         "admin": {
@@ -0,0 +1,128 @@
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.pipeline import (
+    AffiliationPipeline,
+    Checkpoint,
+    Resolution,
+    normalize_affiliation,
+)
+from rorclient.testing import FakeRORServer, generate_records
+
+
+@pytest.fixture
+def server():
+    return FakeRORServer(generate_records(5))
+
+
+def test_normalize_affiliation():
+    assert normalize_affiliation("Dept. of Physics,  University of OSLO ") == (
+        "dept of physics university of oslo"
+    )
+    assert normalize_affiliation("Ｕｎｉｖｅｒｓｉｔé") == "université"
+    assert normalize_affiliation(" -- ") == ""
+
+
+def test_checkpoint_skips_failures(tmp_path):
+    with Checkpoint(tmp_path / "checkpoint.db") as checkpoint:
+        checkpoint.put_many(
+            {
+                "a": Resolution("000000098", "Organization 0"),
+                "b": Resolution(),
+                "c": Resolution(error="timeout"),
+            }
+        )
+
+        assert len(checkpoint) == 2
+        assert "c" not in checkpoint
+        assert checkpoint.get_many(["a", "b", "c"]) == {
+            "a": Resolution("000000098", "Organization 0"),
+            "b": Resolution(),
+        }
+
+
+@pytest.mark.asyncio
+async def test_resolves_each_normalized_string_once(server):
+    rows = [
+        "Organization 1",
+        "organization 1.",
+        "Nowhere",
+        "",
+        "ORGANIZATION  1",
+        "Organization 3",
+    ]
+    async with AsyncRORClient(transport=server.async_transport()) as client:
+        pipeline = AffiliationPipeline(client, ":memory:")
+        results = [result async for result in pipeline.run(rows)]
+        pipeline.close()
+
+    assert [row for row, _ in results] == rows
+    assert [resolution.name for _, resolution in results] == [
+        "Organization 1",
+        "Organization 1",
+        None,
+        None,
+        "Organization 1",
+        "Organization 3",
+    ]
+    assert results[0][1].matched
+    assert not results[2][1].matched
+    assert server.requests == 3
+    assert pipeline.stats.rows == 6
+    assert pipeline.stats.resolved == 3
+
+
+@pytest.mark.asyncio
+async def test_resumes_from_checkpoint(server, tmp_path):
+    path = tmp_path / "checkpoint.db"
+    rows = [f"Organization {i}" for i in range(5)]
+
+    async with AsyncRORClient(transport=server.async_transport()) as client:
+        pipeline = AffiliationPipeline(client, path, batch_size=2)
+        async for _ in pipeline.run(rows):
+            break
+        pipeline.close()
+        assert server.requests == 2
+
+        pipeline = AffiliationPipeline(client, path, batch_size=2)
+        results = [resolution async for _, resolution in pipeline.run(rows)]
+        pipeline.close()
+
+    assert [resolution.ror_id for resolution in results] == [
+        record["id"].replace("https://ror.org/", "")
+        for record in server.records.values()
+    ]
+    assert server.requests == 5
+    assert pipeline.stats.resumed == 2
+    assert pipeline.stats.resolved == 3
+
+
+@pytest.mark.asyncio
+async def test_failures_are_retried_on_the_next_run(server):
+    async def flaky(client, text):
+        if text == "b":
+            raise TimeoutError("timed out")
+        return Resolution(text)
+
+    rows = [{"affiliation": text} for text in ["a", "b", "a"]]
+    async with AsyncRORClient(transport=server.async_transport()) as client:
+        with Checkpoint(":memory:") as checkpoint:
+            pipeline = AffiliationPipeline(
+                client, checkpoint, text=lambda row: row["affiliation"], resolver=flaky
+            )
+            results = [resolution async for _, resolution in pipeline.run(rows)]
+
+            assert "a" in checkpoint
+            assert "b" not in checkpoint
+
+    assert results == [Resolution("a"), Resolution(error="timed out"), Resolution("a")]
+    assert pipeline.stats.failed == 1
+
+
+def test_rejects_invalid_settings(server):
+    client = AsyncRORClient(transport=server.async_transport())
+
+    with pytest.raises(ValueError):
+        AffiliationPipeline(client, ":memory:", concurrency=0)
+    with pytest.raises(ValueError):
+        AffiliationPipeline(client, ":memory:", batch_size=0)
@@ -0,0 +1,128 @@
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.client import RORClient
+from rorclient.profiling import Profiler, RequestTrace
+from rorclient.testing import FakeRORServer, constant_latency
+
+
+def test_profile_report_requires_profiling(records):
+    client = RORClient(transport=FakeRORServer(records).transport())
+
+    with pytest.raises(ValueError):
+        client.profile_report()
+
+
+def test_sync_stages_per_call(records, ror_ids):
+    server = FakeRORServer(records, latency=constant_latency(0.01))
+    client = RORClient(
+        transport=server.transport(),
+        prefetch_relationships=True,
+        max_depth=1,
+        profile=True,
+    )
+
+    client.get_institution(ror_ids[0])
+    client.get_institution(ror_ids[1])
+
+    report = client.profile_report()
+    # Prefetched institutions belong to the call that needed them
+    assert report.calls == 2
+    assert report.stages["transfer"].count == server.requests == 6
+    assert report.stages["decode"].count == 6
+    assert report.stages["validate"].count == 6
+    assert report.stages["prefetch"].count == 2
+    assert report.bottleneck == "transfer"
+    assert "Most time is spent in transfer" in str(report)
+
+    call = client.profiler.calls[0]
+    assert call.label == ror_ids[0]
+    assert call.stages["transfer"] >= 0.03
+    assert call.stages["prefetch"] >= 0.02
+    assert call.total >= call.stages["prefetch"]
+
+
+def test_search_is_profiled(records):
+    client = RORClient(transport=FakeRORServer(records).transport(), profile=True)
+
+    client.search("Institution")
+
+    call = client.profiler.calls[0]
+    assert call.label == "Institution"
+    assert set(call.stages) == {"transfer", "decode", "validate"}
+
+
+@pytest.mark.asyncio
+async def test_async_stages_per_call(records, ror_ids):
+    server = FakeRORServer(records)
+    async with AsyncRORClient(
+        transport=server.async_transport(),
+        prefetch_relationships=True,
+        max_depth=1,
+        profile=True,
+    ) as client:
+        await client.get_multiple_institutions(ror_ids[:3])
+
+    report = client.profile_report()
+    assert report.calls == 3
+    assert report.stages["transfer"].count == server.requests == 9
+    assert {call.label for call in client.profiler.calls} == set(ror_ids[:3])
+
+
+@pytest.mark.parametrize("profile", [False, True])
+def test_keyword_arguments(records, ror_ids, profile):
+    client = RORClient(transport=FakeRORServer(records).transport(), profile=profile)
+
+    institution = client.get_institution(ror_id=ror_ids[0], depth=0)
+    result = client.search(search_term="Organization", page=1)
+
+    assert institution.id_without_prefix == ror_ids[0]
+    assert result.items
+    if profile:
+        labels = [call.label for call in client.profiler.calls]
+        assert labels == [ror_ids[0], "Organization"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("profile", [False, True])
+async def test_async_keyword_arguments(records, ror_ids, profile):
+    async with AsyncRORClient(
+        transport=FakeRORServer(records).async_transport(), profile=profile
+    ) as client:
+        institution = await client.get_institution(ror_id=ror_ids[0])
+        result = await client.search(search_term="Organization")
+
+    assert institution.id_without_prefix == ror_ids[0]
+    assert result.items
+    if profile:
+        labels = [call.label for call in client.profiler.calls]
+        assert labels == [ror_ids[0], "Organization"]
+
+
+def test_request_trace_measures_connection_setup():
+    trace = RequestTrace()
+
+    trace.sync_callback("connection.connect_tcp.started", {})
+    trace.sync_callback("connection.connect_tcp.complete", {})
+    trace.sync_callback("http11.send_request_headers.started", {})
+
+    assert trace.connect > 0
+
+    profiler = Profiler()
+    profiler.add_request(1.0, 0.25)
+    report = profiler.report()
+    assert report.stages["connect"].seconds == 0.25
+    assert report.stages["transfer"].seconds == 0.75
+
+
+def test_reset():
+    profiler = Profiler()
+    with profiler.call("a"):
+        profiler.add("decode", 0.5)
+
+    profiler.reset()
+
+    report = profiler.report()
+    assert report.calls == 0
+    assert report.stages["decode"].seconds == 0
+    assert report.bottleneck is None
@@ -0,0 +1,140 @@
+import asyncio
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.client import RORClient
+from rorclient.ratelimit import HostRateLimiter, RateLimiter
+
+
+def test_burst_then_paced(clock):
+    limiter = RateLimiter(rate=2, burst=3, clock=clock)
+
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+    clock.now = 10
+    assert limiter.reserve() == 0
+
+
+def test_stats_record_waits(clock):
+    limiter = RateLimiter(rate=4, burst=1, clock=clock)
+    for _ in range(3):
+        limiter.reserve()
+
+    stats = limiter.stats()
+    assert stats.requests == 3
+    assert stats.delayed == 2
+    assert stats.total_wait == pytest.approx(0.75)
+    assert stats.max_wait == pytest.approx(0.5)
+    assert stats.mean_wait == pytest.approx(0.25)
+
+
+def test_try_acquire_never_waits(clock):
+    limiter = RateLimiter(rate=2, burst=1, clock=clock)
+
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    # A refused attempt takes on no debt
+    clock.now = 0.5
+    assert limiter.reserve() == 0
+    assert limiter.stats().requests == 2
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1, burst=0)
+
+
+@patch("rorclient.client.httpx.Client")
+def test_clients_share_limiter(mock_client):
+    mock_client.return_value.get.return_value = MagicMock(status_code=404)
+    limiter = RateLimiter(rate=1000, burst=1000)
+    clients = [RORClient(rate_limiter=limiter) for _ in range(2)]
+
+    for client in clients:
+        client.get_institution("00ee0ee00")
+
+    assert limiter.stats().requests == 2
+
+
+@pytest.mark.asyncio
+async def test_async_acquire_paces_concurrent_requests():
+    limiter = RateLimiter(rate=100, burst=1)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+
+    assert loop.time() - start >= 0.035
+    assert limiter.stats().delayed == 4
+
+
+@pytest.mark.asyncio
+@patch("rorclient.async_client.httpx.AsyncClient")
+async def test_async_client_uses_limiter(mock_client):
+    mock_client.return_value.get = AsyncMock(return_value=MagicMock(status_code=404))
+    limiter = RateLimiter(rate=1000)
+    client = AsyncRORClient(rate_limiter=limiter)
+
+    await client.get_institution("00ee0ee00")
+
+    assert limiter.stats().requests == 1
+
+
+def test_host_limiter_shares_bucket_between_instances(tmp_path, clock):
+    path = tmp_path / "bucket"
+    first = HostRateLimiter(path, rate=2, burst=2, clock=clock)
+    second = HostRateLimiter(path, rate=2, burst=2, clock=clock)
+
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert first.reserve() == pytest.approx(0.5)
+    assert second.reserve() == pytest.approx(1.0)
+
+    first.close()
+    second.close()
+
+
+def test_host_limiter_rejects_other_files(tmp_path):
+    path = tmp_path / "bucket"
+    path.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError):
+        HostRateLimiter(path, rate=1)
+
+
+def test_host_limiter_across_processes(tmp_path):
+    path = tmp_path / "bucket"
+    script = (
+        "import sys; from rorclient.ratelimit import HostRateLimiter; "
+        "limiter = HostRateLimiter(sys.argv[1], rate=1, burst=5); "
+        "print(' '.join(str(limiter.reserve()) for _ in range(5)))"
+    )
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", script, str(path)], stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(4)
+    ]
+    waits = sorted(
+        float(wait)
+        for process in processes
+        for wait in process.communicate()[0].split()
+    )
+
+    # 20 requests against a burst of 5 at one per second: every request after the
+    # burst gets its own slot, the last about 15 seconds out, minus whatever
+    # refilled while the processes started.
+    assert len(waits) == 20
+    assert waits[:5] == [0.0] * 5
+    positive = [wait for wait in waits if wait > 0]
+    assert len(positive) >= 14
+    assert len(set(positive)) == len(positive)
+    assert waits[-1] > 10
@@ -0,0 +1,110 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.client import RORClient
+from rorclient.retry import RetryableStatusError, RetryBudget, RetryPolicy
+
+
+def make_response(status_code, headers=None, json_data=None):
+    request = httpx.Request("GET", "https://api.ror.org/v2/organizations/00ee0ee00")
+    return httpx.Response(status_code, headers=headers, json=json_data, request=request)
+
+
+@pytest.fixture
+def no_sleep():
+    with patch("rorclient.retry.time.sleep") as sleep:
+        yield sleep
+
+
+def test_retry_after_sets_minimum_delay():
+    policy = RetryPolicy(base_delay=0.001)
+    exc = RetryableStatusError(make_response(429, headers={"Retry-After": "3"}))
+
+    assert policy.next_delay(exc, attempt=1, elapsed=0) == 3
+
+
+def test_retry_after_beyond_max_retry_time_gives_up():
+    policy = RetryPolicy(max_retry_time=2)
+    exc = RetryableStatusError(make_response(503, headers={"Retry-After": "5"}))
+
+    assert policy.next_delay(exc, attempt=1, elapsed=0) is None
+
+
+def test_explicit_zero_limits_are_kept():
+    policy = RetryPolicy(max_retries=0, max_retry_time=0)
+    exc = httpx.ConnectError("refused")
+
+    assert (policy.max_retries, policy.max_retry_time) == (0, 0)
+    assert policy.next_delay(exc, attempt=1, elapsed=0) is None
+
+
+def test_full_jitter_stays_below_ceiling():
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+    exc = httpx.ConnectError("refused")
+
+    delays = [policy.next_delay(exc, attempt=4, elapsed=0) for _ in range(5)]
+    assert all(0 <= delay <= 4 for delay in delays)
+
+
+def test_non_retryable_errors_are_raised():
+    policy = RetryPolicy()
+
+    assert policy.next_delay(ValueError("Got 500 from ROR"), 1, 0) is None
+
+
+def test_budget_limits_retries(no_sleep):
+    policy = RetryPolicy(budget=RetryBudget(ratio=0.5, reserve=1), max_retries=10)
+    func = MagicMock(side_effect=httpx.ConnectError("refused"))
+
+    with pytest.raises(httpx.ConnectError):
+        policy.call(func)
+    # The reserve pays for one retry; the 0.5 deposited by the next request is
+    # not enough for another.
+    assert func.call_count == 2
+
+    with pytest.raises(httpx.ConnectError):
+        policy.call(func)
+    assert func.call_count == 3
+
+
+@patch("rorclient.client.httpx.Client")
+def test_client_retries_unavailable(mock_client, no_sleep, valid_institution_data_dict):
+    mock_client.return_value.get.side_effect = [
+        make_response(503, headers={"Retry-After": "1"}),
+        make_response(200, json_data=valid_institution_data_dict),
+    ]
+    client = RORClient(retry_policy=RetryPolicy(base_delay=0.001))
+
+    institution = client.get_institution("00ee0ee00")
+
+    assert str(institution.id) == valid_institution_data_dict["id"]
+    no_sleep.assert_called_once_with(1.0)
+
+
+@patch("rorclient.client.httpx.Client")
+def test_client_gives_up_after_max_retries(mock_client, no_sleep):
+    mock_client.return_value.get.return_value = make_response(429)
+    client = RORClient(retry_policy=RetryPolicy(max_retries=3, base_delay=0.001))
+
+    with pytest.raises(RetryableStatusError, match="Got 429 from ROR"):
+        client.get_institution("00ee0ee00")
+    assert mock_client.return_value.get.call_count == 3
+
+
+@pytest.mark.asyncio
+@patch("rorclient.async_client.httpx.AsyncClient")
+async def test_async_client_retries_rate_limited(mock_client):
+    mock_client.return_value.get = AsyncMock(
+        side_effect=[
+            make_response(429, headers={"Retry-After": "0"}),
+            make_response(404),
+        ]
+    )
+    client = AsyncRORClient(retry_policy=RetryPolicy(base_delay=0.001))
+
+    with patch("rorclient.retry._sleep_async") as sleep:
+        assert await client.get_institution("00ee0ee00") is None
+    sleep.assert_awaited_once()
@@ -0,0 +1,57 @@
+import pytest
+
+from rorclient.base import BaseRORClient
+from rorclient.config import config
+from rorclient.ror_id import normalize_ror_id, normalize_ror_ids, ror_id_checksum
+
+
+def test_ror_id_checksum():
+    assert ror_id_checksum("03yrm5c") == "26"
+    assert ror_id_checksum("01cwqze") == "88"
+
+
+def test_normalize_ror_id():
+    assert normalize_ror_id("https://ror.org/03yrm5c26") == "03yrm5c26"
+    assert normalize_ror_id(" HTTPS://ROR.ORG/03YRM5C26 ") == "03yrm5c26"
+    assert normalize_ror_id("ror.org/03yrm5c26") == "03yrm5c26"
+    assert normalize_ror_id("03yrm5c27") is None
+    assert normalize_ror_id("03yrm5i26") is None
+    assert normalize_ror_id("") is None
+
+
+def test_normalize_ror_ids():
+    result = normalize_ror_ids(
+        [
+            "03yrm5c26",
+            "https://ror.org/01cwqze88",
+            "03YRM5C26",
+            "03yrm5c27",
+            "not-an-id",
+            "03yrm5c26",
+        ]
+    )
+
+    assert result.ids == ["03yrm5c26", "01cwqze88"]
+    assert result.positions == [0, 1, 0, -1, -1, 0]
+    assert [(entry.position, entry.reason) for entry in result.invalid] == [
+        (3, "checksum mismatch"),
+        (4, "malformed"),
+    ]
+    assert result.expand(["stanford", "other"]) == [
+        "stanford",
+        "other",
+        "stanford",
+        None,
+        None,
+        "stanford",
+    ]
+
+
+def test_validate_ror_id_checksum(monkeypatch):
+    client = BaseRORClient()
+    client._validate_ror_id("03yrm5c27")  # Checksums are not checked by default
+
+    monkeypatch.setattr(config, "validate_checksum", True)
+    client._validate_ror_id("https://ror.org/03yrm5c26")
+    with pytest.raises(ValueError):
+        client._validate_ror_id("03yrm5c27")
@@ -0,0 +1,85 @@
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from rorclient.client import RORClient
+from rorclient.shared_cache import SharedInstitutionCache, encode_record
+
+
+def test_build_and_get(tmp_path, records, ror_ids, unknown_ror_id):
+    cache = SharedInstitutionCache.build(tmp_path / "shared.bin", records)
+
+    assert len(cache) == 50
+    assert f"https://ror.org/{ror_ids[42]}" in cache
+    assert unknown_ror_id not in cache
+    assert cache.get_record(ror_ids[7])["domains"] == [f"{ror_ids[7]}.example.org"]
+    institution = cache.get(ror_ids[49])
+    assert institution.id_without_prefix == ror_ids[49]
+    assert [record["id"] for record in cache.records()][:2] == [
+        f"https://ror.org/{ror_ids[0]}",
+        f"https://ror.org/{ror_ids[1]}",
+    ]
+    cache.close()
+
+
+def test_write_encoded_records(tmp_path, records):
+    source = SharedInstitutionCache.build(tmp_path / "source.bin", records)
+    encoded = dict(source.iter_raw())
+    encoded.update([encode_record(records[0] | {"established": 2001})])
+
+    cache = SharedInstitutionCache.write(tmp_path / "copy.bin", encoded)
+
+    assert len(cache) == len(records)
+    assert cache.get_record(records[0]["id"])["established"] == 2001
+    assert cache.get_raw(records[1]["id"]) == source.get_raw(records[1]["id"])
+    source.close()
+    cache.close()
+
+
+def test_reload_picks_up_new_file(tmp_path, records):
+    path = tmp_path / "shared.bin"
+    cache = SharedInstitutionCache.build(path, records[:1])
+    assert not cache.reload()
+
+    SharedInstitutionCache.build(path, records)
+    assert cache.reload()
+    assert len(cache) == 50
+
+
+def test_invalid_file(tmp_path):
+    (tmp_path / "garbage").write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        SharedInstitutionCache(tmp_path / "garbage")
+
+
+def test_readable_from_other_process(tmp_path, records, ror_ids):
+    path = tmp_path / "shared.bin"
+    SharedInstitutionCache.build(path, records)
+
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from rorclient.shared_cache import SharedInstitutionCache; "
+            "print(SharedInstitutionCache(sys.argv[1]).get(sys.argv[2]).id)",
+            str(path),
+            ror_ids[20],
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert output.stdout.strip() == f"https://ror.org/{ror_ids[20]}"
+
+
+def test_client_reads_shared_cache(tmp_path, records, ror_ids):
+    shared_cache = SharedInstitutionCache.build(tmp_path / "shared.bin", records)
+
+    with patch("rorclient.client.httpx.Client") as MockClient:
+        client = RORClient(shared_cache=shared_cache)
+
+        institution = client.get_institution(ror_ids[10])
+        assert institution.id_without_prefix == ror_ids[10]
+        MockClient.return_value.get.assert_not_called()
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from rorclient.index import DomainIndex
+from rorclient.shared_cache import SharedInstitutionCache
+from rorclient.sync import sync_mirror
+
+
+@pytest.fixture
+def make_record(valid_institution_data_dict):
+    def make(ror_id, last_modified="2024-12-11", **changes):
+        record = json.loads(json.dumps(valid_institution_data_dict))
+        record["id"] = f"https://ror.org/{ror_id}"
+        record["domains"] = [f"{ror_id}.org"]
+        record["admin"]["last_modified"]["date"] = last_modified
+        record.update(changes)
+        return record
+
+    return make
+
+
+def test_initial_sync_inserts_everything(tmp_path, make_record):
+    result = sync_mirror(
+        tmp_path / "mirror.bin", [make_record("01"), make_record("02")]
+    )
+
+    assert result.inserted == ["01", "02"]
+    assert len(SharedInstitutionCache(tmp_path / "mirror.bin")) == 2
+
+
+def test_incremental_sync(tmp_path, make_record):
+    path = tmp_path / "mirror.bin"
+    feed = tmp_path / "changes.jsonl"
+    sync_mirror(path, [make_record(i) for i in ["01", "02", "03", "04"]])
+    index = DomainIndex.from_records(SharedInstitutionCache(path).records())
+    mtime = path.stat().st_mtime_ns
+
+    result = sync_mirror(
+        path,
+        [
+            make_record("01"),
+            make_record("02", "2025-01-01", domains=["new.org"]),
+            make_record("03", "2025-01-01", status="withdrawn"),
+            make_record("05"),
+        ],
+        change_feed=feed,
+        domain_index=index,
+    )
+
+    assert result.unchanged == 1
+    assert result.updated == ["02"]
+    assert result.withdrawn == ["03"]
+    assert result.inserted == ["05"]
+    assert result.deleted == ["04"]
+    assert path.stat().st_mtime_ns != mtime
+
+    mirror = SharedInstitutionCache(path)
+    assert sorted(record["id"][-2:] for record in mirror.records()) == [
+        "01",
+        "02",
+        "03",
+        "05",
+    ]
+    assert mirror.get_record("02")["domains"] == ["new.org"]
+
+    assert index.lookup("new.org") == ["02"]
+    assert index.lookup("02.org") == []
+    assert index.lookup("03.org") == []
+    assert index.lookup("05.org") == ["05"]
+
+    feed_entries = [json.loads(line) for line in feed.read_text().splitlines()]
+    assert {(entry["id"], entry["change"]) for entry in feed_entries} == {
+        ("02", "update"),
+        ("03", "withdraw"),
+        ("05", "insert"),
+        ("04", "delete"),
+    }
+
+
+def test_partial_sync_ignores_older_and_reencoded_records(
+    tmp_path, make_record, valid_institution_data_dict
+):
+    path = tmp_path / "mirror.bin"
+    sync_mirror(path, [make_record("01", "2025-01-01"), make_record("02")])
+    mtime = path.stat().st_mtime_ns
+
+    stale = make_record("01", "2024-01-01", domains=["old.org"])
+    reencoded = SharedInstitutionCache(path).get("02")
+    result = sync_mirror(path, [stale, reencoded], partial=True)
+
+    assert result.changed_ids == []
+    assert result.unchanged == 2
+    assert path.stat().st_mtime_ns == mtime
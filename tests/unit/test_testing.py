@@ -0,0 +1,117 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from rorclient.async_client import AsyncRORClient
+from rorclient.client import RORClient
+from rorclient.retry import RetryBudget, RetryPolicy
+from rorclient.testing import (
+    FakeRORServer,
+    constant_latency,
+    lognormal_latency,
+)
+
+
+def test_serves_records_and_search(records, unknown_ror_id):
+    server = FakeRORServer(records)
+    ror_id = records[7]["id"].replace("https://ror.org/", "")
+
+    with RORClient(transport=server.transport()) as client:
+        assert client.get_institution(ror_id).id_without_prefix == ror_id
+        assert client.get_institution(unknown_ror_id) is None
+
+        first = client.search("organization")
+        third = client.search("organization", page=3)
+
+    assert first.number_of_results == 50
+    assert len(first.items) == 20
+    assert len(third.items) == 10
+    assert server.status_counts == {200: 3, 404: 1}
+
+
+def test_from_dump(tmp_path, records):
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps(records[:3]))
+
+    server = FakeRORServer.from_dump(path)
+
+    assert len(server.records) == 3
+
+
+def test_per_client_rate_limit(records):
+    server = FakeRORServer(records, rate_limit=1, burst=2)
+    ror_id = records[0]["id"]
+
+    statuses = [
+        server.handle(f"/v2/organizations/{ror_id}", "", "a")[2] for _ in range(3)
+    ]
+    other = server.handle(f"/v2/organizations/{ror_id}", "", "b")
+
+    assert statuses == [200, 200, 429]
+    assert other[2] == 200
+    assert server.handle("/v2/organizations/x", "", "a")[3]["Retry-After"] == "1"
+
+
+def test_client_retries_injected_errors(records):
+    server = FakeRORServer(records, error_rate=0.5, error_statuses=(503,), seed=1)
+    policy = RetryPolicy(
+        max_retries=20, base_delay=0, budget=RetryBudget(ratio=1, reserve=100)
+    )
+
+    with RORClient(transport=server.transport(), retry_policy=policy) as client:
+        institutions = client.get_multiple_institutions(
+            [record["id"] for record in records[:20]]
+        )
+
+    assert len(institutions) == 20
+    assert server.status_counts[503] > 0
+
+
+def test_injected_timeouts(records):
+    server = FakeRORServer(records, timeout_rate=1.0)
+    policy = RetryPolicy(max_retries=1)
+
+    with RORClient(transport=server.transport(), retry_policy=policy) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            client.get_institution(records[0]["id"])
+
+
+def test_latency_distributions():
+    server = FakeRORServer(latency=lognormal_latency(0.1), seed=3)
+    delays = sorted(server.handle("/v2/organizations/x", "")[0] for _ in range(1000))
+
+    assert delays[500] == pytest.approx(0.1, rel=0.1)
+    assert delays[990] > 0.2
+
+
+@pytest.mark.asyncio
+async def test_async_transport_applies_latency(records):
+    server = FakeRORServer(records, latency=constant_latency(0.05))
+    ror_ids = [record["id"] for record in records[:10]]
+
+    async with AsyncRORClient(transport=server.async_transport()) as client:
+        start = time.monotonic()
+        institutions = await client.get_multiple_institutions(ror_ids)
+        elapsed = time.monotonic() - start
+
+    assert len(institutions) == 10
+    # The requests wait concurrently
+    assert 0.05 <= elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_asgi_app(records):
+    server = FakeRORServer(records)
+    transport = httpx.ASGITransport(app=server)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver/v2/"
+    ) as client:
+        response = await client.get(f"organizations/{records[1]['id'][-9:]}")
+        search = await client.get("organizations", params={"query": "organization 4"})
+
+    assert response.status_code == 200
+    assert response.json()["id"] == records[1]["id"]
+    assert search.json()["number_of_results"] == 11